@@ -0,0 +1,363 @@
+"""파싱/엔리치/저장/스코어링 단계 벤치마크.
+
+합성 데이터(고정 seed)와, 있으면 녹화된 fixture(replay)를 사용하므로 네트워크가 필요 없습니다.
+각 벤치마크의 처리량(items/s)과 지연 백분위(p50/p90/p99)를 출력하고 JSON으로 저장합니다.
+
+    python bench/run_bench.py                          # bench/results/<날짜-시각>.json 저장
+    python bench/run_bench.py --label before --quick
+    python bench/run_bench.py --label after --compare bench/results/before.json
+    python bench/run_bench.py --only utils.              # 이름 접두사로 선택
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import runpy
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, 'src')
+sys.path.insert(0, SRC)
+
+import db  # noqa: E402
+import replay  # noqa: E402
+import http_cache  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'bench', 'results')
+SEED = 20250101
+
+NAMES = ['알파', '베타', '감마', '델타', '오메가', '루나', '노바', '테라', '핀', '메디']
+SUFFIXES = ['랩스', '컴퍼니', '테크', '(주)', '주식회사', ' Inc.', '', '바이오', '에이아이']
+INDUSTRIES = ['핀테크', '헬스케어', 'AI', '커머스', '모빌리티', '에듀테크', '콘텐츠']
+STAGES = ['Seed', 'Pre-A', 'Series A', 'Series B', 'Series C', 'M&A']
+INVESTORS = ['KB인베스트먼트', '본엔젤스', '알토스벤처스', 'DSC인베스트먼트', '카카오벤처스']
+JOB_TITLES = ['B2B 세일즈 매니저', '퍼포먼스 마케터', '백엔드 개발자', '프로덕트 디자이너', 'HR 매니저',
+              'Data Engineer', 'BD 리드', '서비스 기획자', 'CRM 마케팅 담당', 'Frontend Developer']
+NEWS_TITLES = ['{} 시리즈 A 투자 유치', '{} 신규 서비스 출시', '{} 구조조정 돌입', '{} 해외 확장', '{} 인재 채용 확대']
+
+
+# ---------------------------------------------------------------------------
+# 합성 데이터
+
+def synth_company_name(rnd):
+    return f"{rnd.choice(NAMES)}{rnd.choice(NAMES)}{rnd.choice(SUFFIXES)}"
+
+
+def synth_date(rnd):
+    return f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+
+
+def synth_row_text(rnd):
+    return ' | '.join([synth_date(rnd), synth_company_name(rnd), f"{rnd.choice(INDUSTRIES)}",
+                       f"{rnd.randint(1, 500)}억", rnd.choice(STAGES), f"투자사: {rnd.choice(INVESTORS)}"])
+
+
+def synth_company(rnd, i):
+    name = f"{synth_company_name(rnd)}{i}"
+    jobs = [{'title': t, 'team': None, 'link': f"https://example.com/jobs/{i}/{k}", 'source': 'wanted'}
+            for k, t in enumerate(rnd.sample(JOB_TITLES, rnd.randint(0, 5)))]
+    news = [{'title': rnd.choice(NEWS_TITLES).format(name), 'link': f"https://news.example.com/{i}/{k}",
+             'content': '투자 유치와 함께 세일즈 조직을 확장한다고 밝혔다', 'published_at': synth_date(rnd),
+             'source_name': 'Naver'} for k in range(rnd.randint(0, 3))]
+    return {
+        'name': name, 'source': '스타트업레시피', 'funding_date': synth_date(rnd),
+        'funding_stage': rnd.choice(STAGES), 'funding_round': rnd.choice(STAGES),
+        'amount': f"{rnd.randint(1, 500)}억", 'investors': rnd.choice(INVESTORS),
+        'industry': rnd.choice(INDUSTRIES), 'news_list': news, 'job_roles': jobs,
+        'inferred_event': rnd.choice(['growing', 'unknown', 'declining']),
+    }
+
+
+def synth_month_page(rnd, rows=120):
+    """startuprecipe 월별 페이지 모양의 HTML (핫딜 표 + 전체 표 + 목록)."""
+    header = '<tr><th>날짜</th><th>기업명</th><th>업종</th><th>투자금액</th><th>단계</th><th>투자사</th></tr>'
+    body = []
+    for i in range(rows):
+        body.append('<tr>' + ''.join(f'<td>{v}</td>' for v in [
+            synth_date(rnd), f"{synth_company_name(rnd)}{i}", rnd.choice(INDUSTRIES),
+            f"{rnd.randint(1, 500)}억", rnd.choice(STAGES), rnd.choice(INVESTORS)]) + '</tr>')
+    hot = ''.join(body[:10])
+    nav = '<nav>' + ''.join(f'<a href="/p/{i}">메뉴 {i}</a>' for i in range(200)) + '</nav>'
+    return (f'<html><head><title>invest</title></head><body>{nav}<article>'
+            f'<h2>이달의 핫 딜</h2><table><thead>{header}</thead><tbody>{hot}</tbody></table>'
+            f'<h3>전체 투자</h3><div><table><thead>{header}</thead><tbody>{"".join(body)}</tbody></table></div>'
+            f'</article><footer>{nav}</footer></body></html>')
+
+
+# ---------------------------------------------------------------------------
+# 측정 도구
+
+def time_each(fn, inputs):
+    lat = []
+    for x in inputs:
+        t0 = time.perf_counter()
+        fn(x)
+        lat.append(time.perf_counter() - t0)
+    return lat
+
+
+def summarize(name, lat, items_per_op=1):
+    lat_sorted = sorted(lat)
+    total = sum(lat)
+
+    def pct(p):
+        if not lat_sorted:
+            return 0.0
+        return lat_sorted[min(int(p / 100.0 * len(lat_sorted)), len(lat_sorted) - 1)]
+
+    return {
+        'name': name,
+        'ops': len(lat),
+        'items': len(lat) * items_per_op,
+        'throughput': (len(lat) * items_per_op / total) if total else 0.0,
+        'p50_ms': pct(50) * 1000,
+        'p90_ms': pct(90) * 1000,
+        'p99_ms': pct(99) * 1000,
+        'total_s': total,
+    }
+
+
+@contextlib.contextmanager
+def quiet():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+@contextlib.contextmanager
+def temp_db():
+    """빈 임시 DB에 마이그레이션으로 최신 스키마를 만들고 db.DB_PATH를 바꿔 둡니다."""
+    import migrate
+    fd, path = tempfile.mkstemp(suffix='.db', prefix='bench_')
+    os.close(fd)
+    conn = db.connect(path)
+    migrate.upgrade(conn)
+    conn.close()
+    old = db.DB_PATH
+    db.DB_PATH = path
+    try:
+        yield path
+    finally:
+        db.close_all()
+        db.DB_PATH = old
+        for p in (path, path + '-wal', path + '-shm'):
+            if os.path.exists(p):
+                os.remove(p)
+
+
+# ---------------------------------------------------------------------------
+# 벤치마크
+
+def bench_parse_invest_info(n):
+    from collect import parse_invest_info
+    rnd = random.Random(SEED)
+    inputs = [synth_row_text(rnd) for _ in range(n)]
+    return summarize('collect.parse_invest_info', time_each(parse_invest_info, inputs))
+
+
+def bench_detect_table_columns(n):
+    from collect import detect_table_columns
+    from html_parse import parse_article
+    rnd = random.Random(SEED)
+    tables = parse_article(synth_month_page(rnd, rows=20)).find_all('table')
+    inputs = [tables[i % len(tables)] for i in range(max(n // 20, 10))]
+    return summarize('collect.detect_table_columns', time_each(detect_table_columns, inputs))
+
+
+@contextlib.contextmanager
+def _month_page_fixtures(n_pages, rows):
+    """합성 월 페이지를 임시 fixture 디렉터리에 만들어 replay 모드로 전환합니다. 블록이 끝나면 replay를 끄고 삭제합니다."""
+    import requests
+    rnd = random.Random(SEED)
+    with tempfile.TemporaryDirectory(prefix='bench_fx_') as fixtures:
+        replay.configure(None, fixtures)
+        for mm in range(1, n_pages + 1):
+            r = requests.Response()
+            r.status_code = 200
+            r._content = synth_month_page(rnd, rows).encode('utf-8')
+            r.encoding = 'utf-8'
+            replay.record(f"https://startuprecipe.co.kr/invest?m_year=2025&m_month={mm:02d}", r)
+        replay.configure('replay', fixtures, latency_ms=0)
+        http_cache.configure(enabled=False)
+        try:
+            yield fixtures
+        finally:
+            replay.configure(None)
+
+
+def bench_table_parsers(n, fixtures_dir=None):
+    from collect import scrape_startuprecipe_for_period
+    rows = 120
+    with contextlib.ExitStack() as stack:
+        if fixtures_dir:
+            replay.configure('replay', fixtures_dir, latency_ms=0)
+            http_cache.configure(enabled=False)
+        else:
+            stack.enter_context(_month_page_fixtures(12, rows))
+        reps = max(n // 1000, 3)
+        lat = []
+        for _ in range(reps):
+            for mm in range(1, 13):
+                t0 = time.perf_counter()
+                with quiet():
+                    scrape_startuprecipe_for_period(2025, mm, mm)
+                lat.append(time.perf_counter() - t0)
+    return summarize('collect.scrape_startuprecipe_for_period (per month page)', lat, items_per_op=1)
+
+
+def bench_classify_job_team(n):
+    from enrich import classify_job_team
+    rnd = random.Random(SEED)
+    inputs = [rnd.choice(JOB_TITLES) + rnd.choice(['', ' (경력)', ' - 서울', ' / Remote']) for _ in range(n)]
+    return summarize('enrich.classify_job_team', time_each(classify_job_team, inputs))
+
+
+def bench_normalize_company_name(n):
+    from utils import normalize_company_name
+    rnd = random.Random(SEED)
+    inputs = [synth_company_name(rnd) + rnd.choice(['', ' [벤처]', ' (구 옛이름)', '  ']) for _ in range(n)]
+    return summarize('utils.normalize_company_name', time_each(normalize_company_name, inputs))
+
+
+def bench_score_company_record(n):
+    from utils import score_company_record
+    rnd = random.Random(SEED)
+    inputs = [synth_company(rnd, i) for i in range(n)]
+    return summarize('utils.score_company_record', time_each(score_company_record, inputs))
+
+
+def bench_save_to_db(n, batch=50, bulk=False):
+    import store
+    rnd = random.Random(SEED)
+    companies = [synth_company(rnd, i) for i in range(max(n // 10, batch * 4))]
+    batches = [companies[i:i + batch] for i in range(0, len(companies), batch)]
+    with temp_db():
+        lat = []
+        for b in batches:
+            t0 = time.perf_counter()
+            with quiet():
+                store.save_to_db(b, bulk=bulk)
+            lat.append(time.perf_counter() - t0)
+    name = 'store.save_to_db_bulk' if bulk else 'store.save_to_db'
+    return summarize(f'{name} (batch={batch})', lat, items_per_op=batch)
+
+
+def bench_save_to_db_bulk(n):
+    return bench_save_to_db(n, bulk=True)
+
+
+def bench_process_scoring(n):
+    rnd = random.Random(SEED)
+    n_rows = max(n // 10, 500)
+    with temp_db() as path:
+        conn = sqlite3.connect(path)
+        conn.executemany(
+            "INSERT INTO raw_company_data (company_name, source, funding_stage, funding_date, job_roles) VALUES (?, ?, ?, ?, ?)",
+            [(f"{synth_company_name(rnd)}{i}", 'bench', rnd.choice(STAGES), synth_date(rnd),
+              ', '.join(rnd.sample(JOB_TITLES, 3))) for i in range(n_rows)])
+        conn.commit()
+        conn.close()
+        lat = []
+        argv = sys.argv
+        sys.argv = ['process_scoring.py', '--full']  # 매번 전체 재계산 (증분이면 두 번째부터 0건)
+        try:
+            for _ in range(3):
+                t0 = time.perf_counter()
+                with quiet():
+                    runpy.run_path(os.path.join(SRC, 'process_scoring.py'), run_name='__main__')
+                lat.append(time.perf_counter() - t0)
+        finally:
+            sys.argv = argv
+    return summarize(f'process_scoring.py (rows={n_rows})', lat, items_per_op=n_rows)
+
+
+BENCHES = [
+    ('collect.parse_invest_info', bench_parse_invest_info),
+    ('collect.detect_table_columns', bench_detect_table_columns),
+    ('collect.table_parsers', bench_table_parsers),
+    ('enrich.classify_job_team', bench_classify_job_team),
+    ('utils.normalize_company_name', bench_normalize_company_name),
+    ('utils.score_company_record', bench_score_company_record),
+    ('store.save_to_db', bench_save_to_db),
+    ('store.save_to_db_bulk', bench_save_to_db_bulk),
+    ('process_scoring', bench_process_scoring),
+]
+
+
+# ---------------------------------------------------------------------------
+# 결과 저장/비교
+
+def print_table(results):
+    print(f"{'benchmark':58} {'items/s':>12} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+    for r in results:
+        print(f"{r['name'][:58]:58} {r['throughput']:12.1f} {r['p50_ms']:9.3f} {r['p90_ms']:9.3f} {r['p99_ms']:9.3f}")
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        base = {r['key']: r for r in json.load(f)['results']}
+    regressions = 0
+    print(f"\n== 비교: {baseline_path} (회귀 기준 {threshold:.0%}) ==")
+    for r in results:
+        b = base.get(r['key'])
+        if not b or not b['throughput']:
+            print(f"{r['key']:40} (기준 없음)")
+            continue
+        ratio = r['throughput'] / b['throughput']
+        flag = ''
+        if ratio < 1 - threshold:
+            flag = '  <-- REGRESSION'
+            regressions += 1
+        elif ratio > 1 + threshold:
+            flag = '  (faster)'
+        print(f"{r['key']:40} {b['throughput']:12.1f} -> {r['throughput']:12.1f} items/s  x{ratio:.2f}{flag}")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pipeline stage benchmarks')
+    parser.add_argument('--label', type=str, help='Result file name (default: timestamp)')
+    parser.add_argument('--n', type=int, default=20000, help='Base number of operations for micro benchmarks')
+    parser.add_argument('--quick', action='store_true', help='Run with n=2000')
+    parser.add_argument('--only', type=str, help='Comma-separated benchmark name prefixes')
+    parser.add_argument('--fixtures', type=str, help='Recorded replay fixtures dir for the table parser benchmark')
+    parser.add_argument('--compare', type=str, help='Baseline result JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    n = 2000 if args.quick else args.n
+    prefixes = [p.strip() for p in args.only.split(',')] if args.only else None
+    results = []
+    for key, fn in BENCHES:
+        if prefixes and not any(key.startswith(p) for p in prefixes):
+            continue
+        print(f"running {key} ...", flush=True)
+        r = fn(n, args.fixtures) if key == 'collect.table_parsers' else fn(n)
+        r['key'] = key
+        results.append(r)
+    replay.configure(None)
+
+    print()
+    print_table(results)
+
+    label = args.label or time.strftime('%Y%m%d-%H%M%S')
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"{label}.json")
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'label': label,
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'n': n,
+            'results': results,
+        }, f, ensure_ascii=False, indent=1)
+    print(f"\n저장: {out_path}")
+
+    if args.compare:
+        sys.exit(1 if compare(results, args.compare, args.threshold) else 0)
@@ -1,16 +1,26 @@
+import os
 import sys
-from src.utils import normalize_company_name
-from src.db import get_conn
-from src.enrich import _search_naver_news, _search_wanted_jobs, _search_saramin_jobs, _search_naver_job_aggregates
+# src/ 모듈들은 서로를 최상위 이름(db, http_client ...)으로 import 하므로 src를 경로에 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+import http_cache
+import migrate
+from db import get_conn, find_company_id
+from keyword_match import KeywordMatcher
+from enrich import _search_naver_news, _search_wanted_jobs, _search_saramin_jobs, _search_naver_job_aggregates
 
 # 감정 분석 함수 (간단 키워드 기반)
+SENTIMENT = KeywordMatcher({
+    'positive': ['성장', '투자', '확장', '성공', '파트너십', '혁신', '상장', 'M&A', '증원', '채용'],
+    'negative': ['부도', '폐업', '소송', '손실', '감원', '위기', '파산', '부정', '문제'],
+}, ignore_case=True)
+
+
 def analyze_sentiment(content):
     if not content:
         return '중립'
-    positive_words = ['성장', '투자', '확장', '성공', '파트너십', '혁신', '상장', 'M&A', '증원', '채용']
-    negative_words = ['부도', '폐업', '소송', '손실', '감원', '위기', '파산', '부정', '문제']
-    pos_count = sum(1 for w in positive_words if w in content.lower())
-    neg_count = sum(1 for w in negative_words if w in content.lower())
+    counts = SENTIMENT.count(content)
+    pos_count = counts.get('positive', 0)
+    neg_count = counts.get('negative', 0)
     if pos_count > neg_count:
         return '긍정'
     elif neg_count > pos_count:
@@ -19,19 +29,25 @@ def analyze_sentiment(content):
         return '중립'
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("사용법: python query_company.py <회사명>")
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    flags = set(a for a in sys.argv[1:] if a.startswith('--'))
+    if not args:
+        print("사용법: python query_company.py <회사명> [--cache-only] [--no-cache]")
         sys.exit(1)
+    http_cache.configure(enabled='--no-cache' not in flags, offline='--cache-only' in flags)
     
-    company_name = sys.argv[1]
-    norm = normalize_company_name(company_name)
+    company_name = args[0]
     
     conn = get_conn()
+    migrate.upgrade(conn)
     cur = conn.cursor()
     
-    # 투자 정보 조회
-    cur.execute("SELECT * FROM raw_company_data WHERE lower(company_name) = ?", (norm,))
-    row = cur.fetchone()
+    # 투자 정보 조회 (normalized_name 인덱스)
+    row = None
+    company_id = find_company_id(cur, company_name)
+    if company_id is not None:
+        cur.execute("SELECT * FROM raw_company_data WHERE id = ?", (company_id,))
+        row = cur.fetchone()
     
     print(f"\n=== {company_name} 회사 정보 ===\n")
     
@@ -1,10 +1,36 @@
-import requests
-from bs4 import BeautifulSoup
 import re
-import time
+import sqlite3
 from datetime import date, datetime, timedelta
 
-HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'}
+import http_client
+from db import get_conn
+from html_parse import parse_article, TableIndex, TableMatrix
+from keyword_match import KeywordMatcher
+
+# 월별 페이지의 '핫 딜' 섹션 제목
+HOT_DEAL_HEADINGS = KeywordMatcher({'hot_deal': ['핫 딜', 'Top Deals', 'Top deal', 'TOP DEALS', 'HOT DEAL', '이달의 핫 딜']})
+# 회사명 칸이 이 단어를 포함하면 헤더 행으로 보고 건너뜀
+HEADER_WORDS = KeywordMatcher({'header': ['회사', '기업', '회사명', '기업명', '업체']})
+
+
+class MonthEnd:
+    """iter_* 제너레이터가 한 달 치 회사를 모두 내보낸 뒤 내보내는 표시.
+
+    저장 쪽(store.save_to_db 등)은 이 표시가 든 배치를 커밋할 때 processed_periods에 그 달을 기록합니다.
+    표시 앞의 회사는 모두 그 배치나 이전 배치에 들어 있으므로, 중간에 중단되면 그 달은 기록되지 않고
+    다음 실행에서 다시 수집됩니다.
+    """
+    __slots__ = ('period',)
+
+    def __init__(self, period):
+        self.period = period
+
+    def __repr__(self):
+        return f"MonthEnd({self.period!r})"
+
+
+def _companies_only(items):
+    return [c for c in items if not isinstance(c, MonthEnd)]
 
 
 def _months_back_dates(months=3):
@@ -22,57 +48,76 @@ def _months_back_dates(months=3):
     return res
 
 
+def _is_recent(c, since):
+    """funding_date가 since 이후인지. 날짜가 없거나 해석할 수 없으면 포함(안전하게)."""
+    fd_str = c.get('funding_date')
+    if not fd_str:
+        return True
+    try:
+        return datetime.strptime(fd_str, '%Y-%m-%d').date() >= since
+    except ValueError:
+        return True
+
+
 def scrape_startuprecipe_from_invest(months=3):
     """/invest?m_year=YYYY&m_month=MM 페이지를 지난 `months`개월분 가져와
     '핫딜(Top Deals)'과 'TOP' 표/목록을 우선 파싱하여 회사 목록을 반환합니다.
     반환: list of dict {name, source, funding_date, funding_stage, amount, investors, industry}
     최근 7일 이내 funding_date만 필터링.
     """
+    return _companies_only(iter_startuprecipe_from_invest(months))
+
+
+def _processed_periods():
+    """이미 처리된 월(YYYY-MM) 집합. 스레드 로컬 공용 연결로 읽습니다."""
+    try:
+        return set(r[0] for r in get_conn().execute("SELECT period FROM processed_periods"))
+    except sqlite3.Error:
+        return set()
+
+
+def iter_startuprecipe_from_invest(months=3):
+    """scrape_startuprecipe_from_invest의 제너레이터 버전: 월 페이지 하나를 파싱할 때마다 회사를 내보냅니다.
+    페이지를 읽고 파싱한 달은 그 달의 회사 뒤에 MonthEnd를 내보냅니다."""
     base = "https://startuprecipe.co.kr/invest"
-    companies = []
     seen_names = set()
     months_list = _months_back_dates(months)
+    week_ago = datetime.now().date() - timedelta(days=7)
+    total = kept = 0
 
-           # check processed periods from DB to skip months already handled
-    try:
-        from db import get_conn
-        conn = get_conn()
-        cur = conn.cursor()
-        done = set(r[0] for r in cur.execute("SELECT period FROM processed_periods").fetchall())
-        conn.close()
-    except Exception:
-        done = set()
+    # check processed periods from DB to skip months already handled
+    done = _processed_periods()
 
     for yy, mm in months_list:
         period_key = f"{yy}-{mm:02d}"
         if period_key in done:
             print(f"스킵(이미처리됨): {period_key}")
             continue
+        companies = []
         params = f"?m_year={yy}&m_month={mm:02d}"
         url = base + params
         print(f"읽는 중(월별): {url}")
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=10)
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            article = soup.find('article') or soup
+            resp = http_client.get(url)
+            article = parse_article(resp.text)
+            tables = TableIndex(article)
             headings = article.find_all(['h2', 'h3', 'h4'])
             month_str = f"{yy}-{mm:02d}"
 
             for h in headings:
                 htxt = h.get_text(strip=True)
-                if any(k in htxt for k in ['핫 딜', 'Top Deals', 'Top deal', 'TOP DEALS', 'HOT DEAL', '이달의 핫 딜']):
+                if HOT_DEAL_HEADINGS.any(htxt):
                     container = h.find_next_sibling() or h.parent
                     # 테이블
-                    for tr in container.find_all('tr'):
-                        tds = tr.find_all(['td', 'th'])
+                    for tds in (row for m in tables.within(container) for row in m.rows):
                         if not tds:
                             continue
-                        row_text = ' | '.join([td.get_text(' ', strip=True) for td in tds])
+                        row_text = ' | '.join([td.spaced for td in tds])
                         # 회사명 우선 추출(두번째 컬럼에 있는 경우가 많음)
-                        cname = tds[1].get_text(strip=True) if len(tds) > 1 else tds[0].get_text(strip=True)
+                        cname = tds[1].text if len(tds) > 1 else tds[0].text
                         if not cname:
                             continue
-                        if any(x in cname for x in ['회사', '기업', '회사명', '기업명', '업체']):
+                        if HEADER_WORDS.any(cname):
                             continue
                         if cname in seen_names:
                             continue
@@ -111,24 +156,23 @@ def scrape_startuprecipe_from_invest(months=3):
                                 'industry': meta.get('industry')
                             })
 
-            # 표 전반에서 회사명 추출 (TOP 15 등)
-            for table in article.find_all('table'):
+            # 표 전반에서 회사명 추출 (TOP 15 등) - 헤딩 패스에서 만든 행렬 재사용
+            for matrix in tables.all():
                 # try to detect header mapping to identify company/date/amount columns
-                colmap = detect_table_columns(table)
-                for tr in table.find_all('tr'):
-                    tds = tr.find_all(['td', 'th'])
+                colmap = detect_table_columns(matrix)
+                for tds in matrix.rows:
                     if not tds:
                         continue
-                    row_text = ' | '.join([td.get_text(' ', strip=True) for td in tds])
+                    row_text = ' | '.join([td.spaced for td in tds])
                     # pick company column based on detected mapping or fallback
                     cname = None
                     if colmap and colmap.get('company') is not None and len(tds) > colmap['company']:
-                        cname = tds[colmap['company']].get_text(strip=True)
+                        cname = tds[colmap['company']].text
                     else:
-                        cname = tds[1].get_text(strip=True) if len(tds) > 1 else tds[0].get_text(strip=True)
+                        cname = tds[1].text if len(tds) > 1 else tds[0].text
                     if not cname:
                         continue
-                    if any(x in cname for x in ['회사', '기업', '회사명', '기업명', '업체']):
+                    if HEADER_WORDS.any(cname):
                         continue
                     if cname in seen_names:
                         continue
@@ -138,19 +182,19 @@ def scrape_startuprecipe_from_invest(months=3):
                     if colmap:
                         try:
                             if colmap.get('amount') is not None and len(tds) > colmap['amount']:
-                                am = tds[colmap['amount']].get_text(' ', strip=True)
+                                am = tds[colmap['amount']].spaced
                                 if am:
                                     meta['amount'] = meta.get('amount') or am
                             if colmap.get('investors') is not None and len(tds) > colmap['investors']:
-                                iv = tds[colmap['investors']].get_text(' ', strip=True)
+                                iv = tds[colmap['investors']].spaced
                                 if iv:
                                     meta['investors'] = meta.get('investors') or iv
                             if colmap.get('industry') is not None and len(tds) > colmap['industry']:
-                                ind = tds[colmap['industry']].get_text(' ', strip=True)
+                                ind = tds[colmap['industry']].spaced
                                 if ind:
                                     meta['industry'] = meta.get('industry') or ind
                             if colmap.get('date') is not None and len(tds) > colmap['date']:
-                                fd = tds[colmap['date']].get_text(' ', strip=True)
+                                fd = tds[colmap['date']].spaced
                                 if fd:
                                     meta['funding_date'] = meta.get('funding_date') or fd
                         except Exception:
@@ -166,31 +210,23 @@ def scrape_startuprecipe_from_invest(months=3):
                         'investors': meta.get('investors'),
                         'industry': meta.get('industry')
                     })
-
-            time.sleep(0.8)
         except Exception as e:
             print('에러:', e)
-            continue
-
-    print(f"월별 스캔 완료: {len(companies)}개 회사 수집")
-    # 최근 7일 이내 funding_date만 필터링
-    today = datetime.now().date()
-    week_ago = today - timedelta(days=7)
-    filtered = []
-    for c in companies:
-        fd_str = c.get('funding_date')
-        if fd_str:
-            try:
-                fd = datetime.strptime(fd_str, '%Y-%m-%d').date()
-                if fd >= week_ago:
-                    filtered.append(c)
-            except ValueError:
-                # 날짜 파싱 실패 시 포함 (안전하게)
-                filtered.append(c)
+            parsed = False
         else:
-            filtered.append(c)
-    print(f"최근 7일 필터링 후: {len(filtered)}개 회사")
-    return filtered
+            parsed = True
+
+        # 최근 7일 이내 funding_date만 내보냄
+        total += len(companies)
+        for c in companies:
+            if _is_recent(c, week_ago):
+                kept += 1
+                yield c
+        if parsed:
+            yield MonthEnd(period_key)
+
+    print(f"월별 스캔 완료: {total}개 회사 수집")
+    print(f"최근 7일 필터링 후: {kept}개 회사")
 
 
 def scrape_startuprecipe_for_period(year, start_month, end_month):
@@ -199,39 +235,42 @@ def scrape_startuprecipe_for_period(year, start_month, end_month):
     반환: list of dict {name, source, funding_date, funding_stage, amount, investors, industry}
     필터링 없이 전체 데이터.
     """
+    return _companies_only(iter_startuprecipe_for_period(year, start_month, end_month))
+
+
+def iter_startuprecipe_for_period(year, start_month, end_month):
+    """scrape_startuprecipe_for_period의 제너레이터 버전: 월 페이지 하나를 파싱할 때마다 회사를 내보냅니다.
+    페이지를 읽고 파싱한 달은 그 달의 회사 뒤에 MonthEnd를 내보냅니다."""
     base = "https://startuprecipe.co.kr/invest"
-    companies = []
     seen_names = set()
+    total = 0
 
     for mm in range(start_month, end_month + 1):
         yy = year
+        companies = []
         period_key = f"{yy}-{mm:02d}"
         params = f"?m_year={yy}&m_month={mm:02d}"
         url = base + params
         print(f"읽는 중(월별): {url}")
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=10)
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            article = soup.find('article') or soup
-            headings = article.find_all(['h2', 'h3', 'h4'])
-            month_str = f"{yy}-{mm:02d}"
+            resp = http_client.get(url)
+            article = parse_article(resp.text)
 
             # 모든 테이블을 찾아서 투자 데이터 파싱 (헤딩 의존성 제거)
-            for table in article.find_all('table'):
-                for tr in table.find_all('tr'):
-                    tds = tr.find_all(['td', 'th'])
+            for matrix in TableIndex(article).all():
+                for tds in matrix.rows:
                     if len(tds) < 5:  # 최소 5개 컬럼: 날짜, 회사, 산업, 금액, 단계, 투자자
                         continue
-                    row_text = ' | '.join([td.get_text(' ', strip=True) for td in tds])
+                    row_text = ' | '.join([td.spaced for td in tds])
                     # 첫 번째 컬럼이 날짜인지 확인 (YYYY-MM-DD 형식)
-                    date_str = tds[0].get_text(strip=True)
+                    date_str = tds[0].text
                     if not re.match(r'\d{4}-\d{2}-\d{2}', date_str):
                         continue
                     # 회사명은 두 번째 컬럼
-                    cname = tds[1].get_text(strip=True) if len(tds) > 1 else None
+                    cname = tds[1].text if len(tds) > 1 else None
                     if not cname or len(cname) < 2:
                         continue
-                    if any(x in cname for x in ['회사', '기업', '회사명', '기업명', '업체']):
+                    if HEADER_WORDS.any(cname):
                         continue
                     if cname in seen_names:
                         continue
@@ -239,19 +278,19 @@ def scrape_startuprecipe_for_period(year, start_month, end_month):
                     meta = parse_invest_info(row_text)
                     # 컬럼 매핑: 0:날짜, 1:회사, 2:산업, 3:금액, 4:단계, 5:투자자
                     if len(tds) > 2:
-                        industry = tds[2].get_text(strip=True)
+                        industry = tds[2].text
                         if industry:
                             meta['industry'] = meta.get('industry') or industry
                     if len(tds) > 3:
-                        amount = tds[3].get_text(strip=True)
+                        amount = tds[3].text
                         if amount:
                             meta['amount'] = meta.get('amount') or amount
                     if len(tds) > 4:
-                        stage = tds[4].get_text(strip=True)
+                        stage = tds[4].text
                         if stage:
                             meta['funding_stage'] = meta.get('funding_stage') or stage
                     if len(tds) > 5:
-                        investors = tds[5].get_text(strip=True)
+                        investors = tds[5].text
                         if investors:
                             meta['investors'] = meta.get('investors') or investors
                     companies.append({
@@ -266,8 +305,13 @@ def scrape_startuprecipe_for_period(year, start_month, end_month):
                     })
         except Exception as e:
             print(f"월별 파싱 오류 {period_key}: {e}")
-    print(f"지정 기간 스캔 완료: {len(companies)}개 회사 수집")
-    return companies
+            total += len(companies)
+            yield from companies
+            continue
+        total += len(companies)
+        yield from companies
+        yield MonthEnd(period_key)
+    print(f"지정 기간 스캔 완료: {total}개 회사 수집")
 
 
 def parse_invest_info(text: str) -> dict:
@@ -309,20 +353,18 @@ def parse_invest_info(text: str) -> dict:
 
 def detect_table_columns(table):
     """테이블 헤더를 분석해 어느 컬럼이 회사명/날짜/금액/투자사/산업인지 추정합니다.
+    table: bs4 <table> 또는 이미 만들어 둔 html_parse.TableMatrix
     반환: dict e.g. {'company':1,'date':0,'amount':3,'investors':4,'industry':2}
     """
+    matrix = table if isinstance(table, TableMatrix) else TableMatrix(table)
     headers = []
     # look for header row
-    thead = table.find('thead')
-    if thead:
-        header_cells = thead.find_all(['th', 'td'])
-        headers = [c.get_text(' ', strip=True).lower() for c in header_cells]
+    if matrix.thead is not None:
+        headers = [c.spaced.lower() for c in matrix.thead]
     else:
         # fallback: first row if it looks like header (contains non-numeric words)
-        first_row = table.find('tr')
-        if first_row:
-            cells = first_row.find_all(['th', 'td'])
-            txts = [c.get_text(' ', strip=True) for c in cells]
+        if matrix.rows:
+            txts = [c.spaced for c in matrix.rows[0]]
             # heuristics: if many cells contain words like '회사' or '기업' treat as header
             if any(re.search(r'회사|기업|업종|투자|금액|라운드|날짜|invest', t, re.IGNORECASE) for t in txts):
                 headers = [t.lower() for t in txts]
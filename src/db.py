@@ -1,9 +1,146 @@
 # src/db.py
+"""SQLite 연결 관리.
+
+- 모든 연결에 WAL + 튜닝 PRAGMA 적용 (PRAGMAS)
+- get_conn(): 스레드마다 하나의 연결을 재사용. 호출부의 conn.close()는 연결을 닫지 않고, transaction()
+  블록 밖에 남은 커밋되지 않은 변경만 롤백합니다(기존 close 의미 유지). 실제로 닫으려면 close_all().
+- transaction(): BEGIN IMMEDIATE ~ COMMIT/ROLLBACK 컨텍스트 매니저. 이미 열린 트랜잭션 안에서는
+  SAVEPOINT로 중첩하며 바깥 트랜잭션을 커밋하거나 롤백하지 않습니다.
+여러 스레드의 쓰기를 한 스레드로 모으려면 write_behind.WriteBehindQueue를 씁니다.
+"""
+import contextlib
 import os
 import sqlite3
+import threading
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_PATH = os.path.join(BASE_DIR, "meta_sales_trigger.db")
 
+BUSY_TIMEOUT_MS = 5000
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    "PRAGMA cache_size = -20000",       # 약 20MB
+    "PRAGMA mmap_size = 268435456",     # 256MB
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+class Connection(sqlite3.Connection):
+    """connect()가 만드는 연결. transaction() 중첩 깊이를 기억합니다."""
+    tx_depth = 0
+
+
+class PooledConnection(Connection):
+    """get_conn()이 돌려주는 스레드 로컬 연결. close()는 연결을 유지합니다.
+
+    같은 스레드의 호출자들이 연결을 공유하므로, transaction() 블록이 열려 있는 동안의 close()는
+    아무것도 하지 않습니다(바깥 호출자의 트랜잭션을 버리지 않음). 블록 밖에 남은 변경만 롤백합니다.
+    """
+
+    def close(self):
+        if self.in_transaction and not self.tx_depth:
+            self.rollback()
+
+    def really_close(self):
+        sqlite3.Connection.close(self)
+
+
+_local = threading.local()
+_all_lock = threading.Lock()
+_all_conns = []
+_generation = 0  # close_all() 때마다 증가 -> 다른 스레드의 닫힌 연결도 다음 get_conn()에서 새로 만듦
+
+
+def connect(path=None, factory=Connection, check_same_thread=True):
+    """튜닝 PRAGMA를 적용한 새 연결 (재사용하지 않음)."""
+    conn = sqlite3.connect(path or DB_PATH, timeout=BUSY_TIMEOUT_MS / 1000.0,
+                           factory=factory, check_same_thread=check_same_thread)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
 def get_conn():
-    return sqlite3.connect(DB_PATH)
+    """현재 스레드의 DB_PATH 연결을 재사용해 반환합니다."""
+    conns = getattr(_local, 'conns', None)
+    if conns is None or _local.generation != _generation:
+        conns = _local.conns = {}
+        _local.generation = _generation
+    conn = conns.get(DB_PATH)
+    if conn is None:
+        conn = connect(DB_PATH, factory=PooledConnection)
+        conns[DB_PATH] = conn
+        with _all_lock:
+            _all_conns.append(conn)
+    return conn
+
+
+def close_all():
+    """모든 스레드의 재사용 연결을 닫습니다 (임시 DB 삭제 전, 종료 시)."""
+    global _generation
+    with _all_lock:
+        conns = list(_all_conns)
+        del _all_conns[:]
+        _generation += 1
+    for conn in conns:
+        try:
+            conn.really_close()
+        except sqlite3.ProgrammingError:
+            pass  # 다른 스레드 소유 연결 (해당 스레드 종료 시 정리됨)
+
+
+@contextlib.contextmanager
+def transaction(conn=None, immediate=True):
+    """with transaction() as cur: ... 블록 전체를 한 트랜잭션으로 실행합니다.
+
+    immediate=True면 시작 시점에 쓰기 잠금을 잡아(BEGIN IMMEDIATE) 도중 잠금 승격 실패를 피합니다.
+    이미 트랜잭션이 열려 있으면(바깥 블록 또는 호출자의 커밋 전 변경) SAVEPOINT로 중첩합니다:
+    실패하면 이 블록의 변경만 되돌리고, 커밋은 바깥 트랜잭션의 주인이 합니다.
+    """
+    conn = conn or get_conn()
+    cur = conn.cursor()
+    depth = conn.tx_depth
+    savepoint = f"tx_{depth + 1}" if conn.in_transaction else None
+    cur.execute(f"SAVEPOINT {savepoint}" if savepoint else "BEGIN IMMEDIATE" if immediate else "BEGIN")
+    conn.tx_depth = depth + 1
+    try:
+        yield cur
+        if savepoint:
+            cur.execute(f"RELEASE {savepoint}")
+        else:
+            conn.commit()
+    except BaseException:
+        if savepoint:
+            cur.execute(f"ROLLBACK TO {savepoint}")
+            cur.execute(f"RELEASE {savepoint}")
+        else:
+            conn.rollback()
+        raise
+    finally:
+        conn.tx_depth = depth
+
+
+def find_company_id(cur, name):
+    """회사명 -> raw_company_data.id. normalized_name 유니크 인덱스로 조회합니다(없으면 None)."""
+    from utils import company_key
+    key = company_key(name)
+    if key is None:
+        return None
+    row = cur.execute("SELECT id FROM raw_company_data WHERE normalized_name = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def stored_record_hash(cur, company_id, changes=None):
+    """저장된 회사 상태(raw 행 + news URL + jobs 제목)의 content_hash (utils.record_hash).
+    changes: 바꿔 쓸 raw 컬럼 값 -> 그 값으로 저장했을 때의 해시. 회사가 없으면 None."""
+    from utils import RECORD_HASH_FIELDS, record_hash
+    row = cur.execute(f"SELECT {', '.join(RECORD_HASH_FIELDS)} FROM raw_company_data WHERE id = ?", (company_id,)).fetchone()
+    if row is None:
+        return None
+    fields = dict(zip(RECORD_HASH_FIELDS, row))
+    fields.update(changes or {})
+    urls = [u for (u,) in cur.execute("SELECT url FROM news WHERE company_id = ?", (company_id,))]
+    titles = [t for (t,) in cur.execute("SELECT title FROM jobs WHERE company_id = ?", (company_id,))]
+    return record_hash(fields, urls, titles)
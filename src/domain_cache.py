@@ -0,0 +1,108 @@
+"""회사 도메인 탐색 결과 캐시 (_search_company_careers 용).
+
+추측한 도메인(회사명.com / .co.kr)마다 결과를 만료 시각과 함께 기록합니다.
+  - dns_fail    : DNS 조회 실패
+  - unreachable : 연결 실패/타임아웃
+  - no_careers  : 접속은 되지만 채용 경로가 모두 실패(404 등)
+  - ok          : 채용 페이지를 찾음 (careers_url 저장)
+만료 전에는 dns_fail/unreachable/no_careers 도메인을 다시 요청하지 않고,
+ok 도메인은 저장된 경로 하나만 요청합니다. 저장 위치는 HTTP 캐시와 같은 파일입니다.
+"""
+import socket
+import threading
+import time
+
+import db
+import http_cache
+import replay
+
+DAY = 86400
+STATUS_TTLS = {
+    'dns_fail': 30 * DAY,
+    'unreachable': 7 * DAY,
+    'no_careers': 14 * DAY,
+    'ok': 7 * DAY,
+}
+DEAD_STATUSES = ('dns_fail', 'unreachable', 'no_careers')
+
+_lock = threading.Lock()
+_conn = None
+_conn_path = None
+
+
+def _db():
+    global _conn, _conn_path
+    if _conn is None or _conn_path != http_cache.CACHE_PATH:
+        _conn_path = http_cache.CACHE_PATH
+        _conn = db.connect(_conn_path, check_same_thread=False)
+        _conn.execute('''
+        CREATE TABLE IF NOT EXISTS domain_probe (
+            domain TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            careers_url TEXT,
+            checked_at REAL,
+            expires_at REAL
+        )
+        ''')
+        _conn.commit()
+    return _conn
+
+
+def lookup(domain):
+    """만료되지 않은 (status, careers_url)을 반환합니다. 없으면 None.
+
+    replay 중에는 결과가 실행마다 같도록 캐시를 읽거나 쓰지 않습니다.
+    """
+    if replay.is_replaying():
+        return None
+    with _lock:
+        row = _db().execute(
+            "SELECT status, careers_url FROM domain_probe WHERE domain = ? AND expires_at > ?",
+            (domain, time.time())).fetchone()
+    return row
+
+
+def mark(domain, status, careers_url=None):
+    if replay.is_replaying():
+        return
+    now = time.time()
+    with _lock:
+        conn = _db()
+        conn.execute(
+            "INSERT OR REPLACE INTO domain_probe (domain, status, careers_url, checked_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (domain, status, careers_url, now, now + STATUS_TTLS[status]))
+        conn.commit()
+
+
+def forget(domain):
+    with _lock:
+        conn = _db()
+        conn.execute("DELETE FROM domain_probe WHERE domain = ?", (domain,))
+        conn.commit()
+
+
+def resolves(domain):
+    """경로를 탐색하기 전에 DNS를 한 번만 확인합니다. replay 중에는 fixture 존재 여부로 판단합니다."""
+    if replay.is_replaying():
+        return replay.has_host(domain)
+    try:
+        socket.getaddrinfo(domain, 443, proto=socket.IPPROTO_TCP)
+        return True
+    except (socket.gaierror, UnicodeError, OSError):
+        return False
+
+
+def candidate_domains(company_name, tlds=('com', 'co.kr')):
+    """회사명으로 추측 가능한 도메인 목록. 호스트명이 될 수 없는 이름은 미리 걸러냅니다."""
+    label = ''.join((company_name or '').lower().split())
+    if not label:
+        return []
+    try:
+        ascii_label = label.encode('idna').decode('ascii')
+    except UnicodeError:
+        return []
+    if len(ascii_label) > 63 or ascii_label.startswith('-') or ascii_label.endswith('-'):
+        return []
+    if not all(ch.isalnum() or ch == '-' for ch in ascii_label):
+        return []
+    return [f"{label}.{tld}" for tld in tlds]
@@ -1,12 +1,16 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 from urllib.parse import quote_plus
 from os import getenv
 from pprint import pprint
-import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
 
-HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'}
+import http_client
+from html_parse import make_soup
+import domain_cache
+from collect import MonthEnd
+from keyword_match import KeywordMatcher
 
 
 def _search_naver_news(company_name, max_items=3, from_date=None, to_date=None):
@@ -25,7 +29,7 @@ def _search_naver_news(company_name, max_items=3, from_date=None, to_date=None):
             if to_date:
                 params['to'] = to_date
             api_url = 'https://newsapi.org/v2/everything'
-            r = requests.get(api_url, params={**params, 'apiKey': api_key}, timeout=10)
+            r = http_client.get(api_url, params={**params, 'apiKey': api_key})
             if r.status_code == 200:
                 j = r.json()
                 res = []
@@ -50,8 +54,8 @@ def _search_naver_news(company_name, max_items=3, from_date=None, to_date=None):
     q = quote_plus(company_name)
     url = f"https://search.naver.com/search.naver?where=news&query={q}"
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(resp.text, 'html.parser')
+        resp = http_client.get(url)
+        soup = make_soup(resp.text)
         items = []
         selectors = ['.news_tit']
         for sel in selectors:
@@ -87,8 +91,8 @@ def _search_naver_job_aggregates(company_name, max_items=5):
     url = f"https://search.naver.com/search.naver?where=web&query={q}"
     jobs = []
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(resp.text, 'html.parser')
+        resp = http_client.get(url)
+        soup = make_soup(resp.text)
         # 검색 결과에서 채용 관련 제목 추출
         for a in soup.select('a[href]'):
             href = a.get('href')
@@ -107,40 +111,38 @@ def _search_naver_job_aggregates(company_name, max_items=5):
     return jobs
 
 def _search_wanted_jobs(company_name, max_items=5):
-    for attempt in range(3):
-        try:
-            q = quote_plus(company_name)
-            url = f"https://www.wanted.co.kr/search?query={q}"
-            resp = requests.get(url, headers=HEADERS, timeout=10)
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            jobs = []
-            cards = soup.find_all('div', class_=re.compile(r'JobCard'), limit=max_items)
-            if not cards:
-                cards = soup.select('.card-job, .job-card')[:max_items]
-            for card in cards[:max_items]:
-                title_elem = card.find(['a', 'h3', 'strong', 'h4'])
-                team_elem = None
-                for sel in ['.job-meta', '.JobCard_meta', '.meta', '.tags', '.job-tag']:
-                    team_elem = card.select_one(sel)
-                    if team_elem:
-                        break
-                title = title_elem.get_text().strip() if title_elem else None
-                team = None
+    # 재시도/백오프는 http_client 공통 정책이 담당
+    try:
+        q = quote_plus(company_name)
+        url = f"https://www.wanted.co.kr/search?query={q}"
+        resp = http_client.get(url)
+        soup = make_soup(resp.text)
+        jobs = []
+        cards = soup.find_all('div', class_=re.compile(r'JobCard'), limit=max_items)
+        if not cards:
+            cards = soup.select('.card-job, .job-card')[:max_items]
+        for card in cards[:max_items]:
+            title_elem = card.find(['a', 'h3', 'strong', 'h4'])
+            team_elem = None
+            for sel in ['.job-meta', '.JobCard_meta', '.meta', '.tags', '.job-tag']:
+                team_elem = card.select_one(sel)
                 if team_elem:
-                    team = team_elem.get_text().strip()
-                a = card.find('a', href=True)
-                link = None
-                if a:
-                    link = a.get('href')
-                    if link and link.startswith('/'):
-                        link = 'https://www.wanted.co.kr' + link
-                if title:
-                    jobs.append({'title': title, 'team': classify_job_team(title if not team else team), 'link': link})
-            return jobs
-        except Exception as e:
-            print(f"Wanted jobs error on attempt {attempt+1}: {e}")
-            if attempt < 2:
-                time.sleep(1)
+                    break
+            title = title_elem.get_text().strip() if title_elem else None
+            team = None
+            if team_elem:
+                team = team_elem.get_text().strip()
+            a = card.find('a', href=True)
+            link = None
+            if a:
+                link = a.get('href')
+                if link and link.startswith('/'):
+                    link = 'https://www.wanted.co.kr' + link
+            if title:
+                jobs.append({'title': title, 'team': classify_job_team(title if not team else team), 'link': link})
+        return jobs
+    except Exception as e:
+        print(f"Wanted jobs error: {e}")
     return []
 
 
@@ -149,8 +151,8 @@ def _search_saramin_jobs(company_name, max_items=5):
     try:
         q = quote_plus(company_name)
         url = f'https://www.saramin.co.kr/zf_user/search?searchword={q}'
-        resp = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(resp.text, 'html.parser')
+        resp = http_client.get(url)
+        soup = make_soup(resp.text)
         jobs = []
         for li in soup.select('div.item_recruit, .recruit_item')[:max_items]:
             title = None
@@ -168,96 +170,110 @@ def _search_saramin_jobs(company_name, max_items=5):
         return []
 
 
+def _careers_jobs_from_page(html, base, max_items):
+    s = make_soup(html)
+    # look for job listing anchors
+    jobs = []
+    for a in s.select('a'):
+        txt = a.get_text(strip=True)
+        if re.search(r'채용|recruit|career|job', txt, re.IGNORECASE):
+            link = a.get('href')
+            if link and link.startswith('/'):
+                link = base + link
+            jobs.append({'title': txt, 'team': classify_job_team(txt), 'link': link})
+            if len(jobs) >= max_items:
+                break
+    return jobs
+
+
 def _search_company_careers(company_name, max_items=5):
-    """회사 도메인에 흔한 채용 경로(/career, /careers, /recruit, /jobs)를 시도해 채용 제목을 수집합니다."""
+    """회사 도메인에 흔한 채용 경로(/career, /careers, /recruit, /jobs)를 시도해 채용 제목을 수집합니다.
+
+    도메인별 탐색 결과는 domain_cache에 만료 시각과 함께 저장되어, 죽은 도메인이나
+    채용 페이지가 없는 도메인은 다음 실행부터 요청하지 않습니다.
+    """
     trials = ['/career', '/careers', '/recruit', '/recruitment', '/jobs', '/채용']
-    jobs = []
     # try to find company homepage via simple Google-free heuristic: company-name + .com (best-effort)
     # This is a light heuristic; real solution should use a proper lookup (whois, company profile)
-    candidate_domains = [f'https://{company_name}.com', f'https://{company_name}.co.kr']
-    for base in candidate_domains:
+    for domain in domain_cache.candidate_domains(company_name):
+        base = f'https://{domain}'
+        cached = domain_cache.lookup(domain)
+        if cached:
+            status, careers_url = cached
+            if status in domain_cache.DEAD_STATUSES or not careers_url:
+                continue
+            try:
+                r = http_client.get(careers_url, timeout=6, retry=False)
+                if r.status_code == 200:
+                    jobs = _careers_jobs_from_page(r.text, base, max_items)
+                    if jobs:
+                        return jobs
+            except Exception:
+                pass
+            # 저장된 경로가 더 이상 유효하지 않으면 다음 실행에서 다시 전체 탐색
+            domain_cache.forget(domain)
+            continue
+
+        if not domain_cache.resolves(domain):
+            domain_cache.mark(domain, 'dns_fail')
+            continue
+        status = 'no_careers'
         for p in trials:
+            url = base + p
             try:
-                url = base + p
-                r = requests.get(url, headers=HEADERS, timeout=6)
-                if r.status_code != 200:
-                    continue
-                s = BeautifulSoup(r.text, 'html.parser')
-                # look for job listing anchors
-                found = 0
-                for a in s.select('a'):
-                    txt = a.get_text(strip=True)
-                    if re.search(r'채용|recruit|career|job', txt, re.IGNORECASE):
-                        link = a.get('href')
-                        if link and link.startswith('/'):
-                            link = base + link
-                        jobs.append({'title': txt, 'team': classify_job_team(txt), 'link': link})
-                        found += 1
-                        if found >= max_items:
-                            break
-                if jobs:
-                    return jobs[:max_items]
+                r = http_client.get(url, timeout=6, retry=False)
             except Exception:
+                # 연결 자체가 안 되면 나머지 경로도 시도하지 않음
+                status = 'unreachable'
+                break
+            if r.status_code != 200:
                 continue
-    return jobs
+            jobs = _careers_jobs_from_page(r.text, base, max_items)
+            if jobs:
+                domain_cache.mark(domain, 'ok', url)
+                return jobs
+        domain_cache.mark(domain, status)
+    return []
+
+
+# 직무 제목 -> 팀. 순서가 우선순위 (위에 있는 팀의 키워드가 먼저)
+JOB_TEAMS = KeywordMatcher({
+    'Marketing': ['마케', 'marketing', 'crm', '퍼포먼스', 'growth', '광고', '프로모션'],
+    'Product': ['product', '프로덕트', '기획', 'pd'],
+    'Engineering': ['engineer', '개발', '프론트', '백엔드', 'dev', 'data', 'ai', 'ml', 'software'],
+    'Sales': ['sales', '영업', 'biz', 'bd'],
+    'Design': ['디자', 'ux', 'ui', 'designer'],
+    'HR': ['채용', '인사', 'hr', 'recruit'],
+})
+
+# 뉴스 제목 -> 회사 동향. growing이 declining보다 우선
+NEWS_EVENTS = KeywordMatcher({
+    'growing': ['투자', '유치', '상장', '확장', '합류', '인수', '시리즈'],
+    'declining': ['감원', '적자', '구조조정', '폐업', '축소'],
+})
 
 
 def classify_job_team(title: str) -> str:
     """직무 제목을 간단 키워드 매핑으로 팀(부서)으로 분류합니다."""
     if not title:
         return 'Other'
-    t = title.lower()
-    marketing_kw = ['마케', 'marketing', 'crm', '퍼포먼스', 'growth', '광고', '프로모션']
-    product_kw = ['product', '프로덕트', '기획', 'pd']
-    eng_kw = ['engineer', '개발', '프론트', '백엔드', 'dev', 'data', 'ai', 'ml', 'software']
-    sales_kw = ['sales', '영업', 'biz', 'bd']
-    design_kw = ['디자', 'ux', 'ui', 'designer']
-    hr_kw = ['채용', '인사', 'hr', 'recruit']
-
-    for kw in marketing_kw:
-        if kw in t:
-            return 'Marketing'
-    for kw in product_kw:
-        if kw in t:
-            return 'Product'
-    for kw in eng_kw:
-        if kw in t:
-            return 'Engineering'
-    for kw in sales_kw:
-        if kw in t:
-            return 'Sales'
-    for kw in design_kw:
-        if kw in t:
-            return 'Design'
-    for kw in hr_kw:
-        if kw in t:
-            return 'HR'
-    return 'Other'
+    return JOB_TEAMS.first(title.lower(), 'Other')
 
 
 def _infer_event_from_news(news_titles):
-    growth_kw = ['투자', '유치', '상장', '확장', '합류', '인수', '시리즈']
-    decline_kw = ['감원', '적자', '구조조정', '폐업', '축소']
-    text = ' '.join(news_titles)
-    for kw in growth_kw:
-        if kw in text:
-            return 'growing'
-    for kw in decline_kw:
-        if kw in text:
-            return 'declining'
-    return 'unknown'
+    return NEWS_EVENTS.first(' '.join(news_titles), 'unknown')
 
 def _search_company_info(company_name):
     """Naver 검색으로 회사 설립일과 직원수 추출."""
     q = quote_plus(f"{company_name} 설립일 직원수")
     url = f'https://search.naver.com/search.naver?query={q}'
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
+        resp = http_client.get(url)
         resp.raise_for_status()
     except Exception:
         return {'founded_date': None, 'employee_count': None}
 
-    soup = BeautifulSoup(resp.text, 'html.parser')
+    soup = make_soup(resp.text)
     founded_date = None
     employee_count = None
 
@@ -280,63 +296,161 @@ def _search_company_info(company_name):
 
     return {'founded_date': founded_date, 'employee_count': employee_count}
 
-def enrich_companies(companies, max_news=3, max_jobs=5, show_sample=5):
-    """각 회사에 대해 뉴스/채용 조회 및 이벤트 추론을 수행하고 결과 리스트 반환"""
-    out = []
-    for i, c in enumerate(companies):
-        name = c.get('name')
-        # 뉴스 검색 시 투자 날짜 기준으로 기간 설정
-        funding_date = c.get('funding_date')
-        if funding_date:
+def _news_window(funding_date):
+    """투자 날짜 기준 ±7일 뉴스 검색 기간. 날짜가 없거나 해석할 수 없으면 (None, None)."""
+    if not funding_date:
+        return None, None
+    try:
+        fd = datetime.fromisoformat(funding_date)
+    except Exception:
+        return None, None
+    return (fd - timedelta(days=7)).strftime('%Y-%m-%d'), (fd + timedelta(days=7)).strftime('%Y-%m-%d')
+
+
+def _run_sources(tasks, pool=None):
+    """{이름: (함수, args, kwargs, 실패시 기본값)}을 실행해 {이름: 결과}를 반환합니다.
+
+    pool이 주어지면 소스들을 동시에 실행하고, 없으면 순서대로 실행합니다.
+    """
+    results = {}
+    if pool is None:
+        for key, (fn, args, kwargs, default) in tasks.items():
             try:
-                from datetime import datetime, timedelta
-                fd = datetime.fromisoformat(funding_date)
-                from_date = (fd - timedelta(days=7)).strftime('%Y-%m-%d')
-                to_date = (fd + timedelta(days=7)).strftime('%Y-%m-%d')
-                news = _search_naver_news(name, max_items=max_news, from_date=from_date, to_date=to_date)
+                results[key] = fn(*args, **kwargs)
             except Exception:
-                news = _search_naver_news(name, max_items=max_news)
-        else:
-            news = _search_naver_news(name, max_items=max_news)
-        jobs = _search_wanted_jobs(name, max_items=max_jobs)
-        # 추가 소스: 사람인, 회사 도메인, 네이버 집계
-        try:
-            saramin_jobs = _search_saramin_jobs(name, max_items=max_jobs)
-            if saramin_jobs:
-                jobs.extend(saramin_jobs)
-        except Exception:
-            pass
-        try:
-            company_jobs = _search_company_careers(name, max_items=max_jobs)
-            if company_jobs:
-                jobs.extend(company_jobs)
-        except Exception:
-            pass
+                results[key] = default
+        return results
+
+    futures = {key: pool.submit(fn, *args, **kwargs) for key, (fn, args, kwargs, default) in tasks.items()}
+    for key, fut in futures.items():
         try:
-            naver_jobs = _search_naver_job_aggregates(name, max_items=max_jobs)
-            if naver_jobs:
-                jobs.extend(naver_jobs)
+            results[key] = fut.result()
         except Exception:
-            pass
-        # dedupe by title
-        seen = set()
-        dedup_jobs = []
-        for j in jobs:
+            results[key] = tasks[key][3]
+    return results
+
+
+# 채용 소스 순서(원티드 -> 사람인 -> 회사 도메인 -> 네이버 집계)가 dedupe 우선순위
+JOB_SOURCES = ('wanted', 'saramin', 'careers', 'naver_jobs')
+# jobs.source 컬럼에 저장되는 값
+JOB_SOURCE_LABELS = {'wanted': 'wanted', 'saramin': 'Saramin', 'careers': 'careers', 'naver_jobs': 'Naver Search'}
+ALL_SOURCES = ('news',) + JOB_SOURCES + ('company_info',)
+SOURCES_PER_COMPANY = len(ALL_SOURCES)
+
+
+def _source_tasks(name, funding_date, max_news, max_jobs):
+    from_date, to_date = _news_window(funding_date)
+    news_kwargs = {'max_items': max_news}
+    if from_date:
+        news_kwargs.update(from_date=from_date, to_date=to_date)
+    return {
+        'news': (_search_naver_news, (name,), news_kwargs, []),
+        'wanted': (_search_wanted_jobs, (name,), {'max_items': max_jobs}, []),
+        'saramin': (_search_saramin_jobs, (name,), {'max_items': max_jobs}, []),
+        'careers': (_search_company_careers, (name,), {'max_items': max_jobs}, []),
+        'naver_jobs': (_search_naver_job_aggregates, (name,), {'max_items': max_jobs}, []),
+        'company_info': (_search_company_info, (name,), {}, {'founded_date': None, 'employee_count': None}),
+    }
+
+
+def fetch_sources(c, sources=None, max_news=3, max_jobs=5, source_pool=None):
+    """회사 1곳의 소스별 원본 결과 {소스: 결과}를 반환합니다. sources로 일부 소스만 조회할 수 있습니다."""
+    tasks = _source_tasks(c.get('name'), c.get('funding_date'), max_news, max_jobs)
+    if sources is not None:
+        tasks = {k: v for k, v in tasks.items() if k in sources}
+    r = _run_sources(tasks, source_pool)
+    for key in JOB_SOURCES:
+        for j in r.get(key) or []:
+            j.setdefault('source', JOB_SOURCE_LABELS[key])
+    return r
+
+
+def merge_jobs(job_lists, max_jobs=5):
+    """소스 순서대로 이어 붙이고 제목 기준으로 중복 제거."""
+    seen = set()
+    dedup_jobs = []
+    for jobs in job_lists:
+        for j in jobs or []:
             key = (j.get('title') or '').strip()
             if not key or key in seen:
                 continue
             seen.add(key)
             dedup_jobs.append(j)
-        jobs = dedup_jobs[:max_jobs]
-        event = _infer_event_from_news([n['title'] for n in news])
-        company_info = _search_company_info(c['name'])
-        nc = dict(c)
-        nc['news_list'] = news
-        nc['job_roles'] = jobs
-        nc['inferred_event'] = event
-        nc['founded_date'] = company_info['founded_date']
-        nc['employee_count'] = company_info['employee_count']
-        out.append(nc)
+    return dedup_jobs[:max_jobs]
+
+
+def _enrich_one(c, max_news=3, max_jobs=5, source_pool=None):
+    """회사 1곳에 대해 뉴스/채용/회사정보를 조회해 엔리치된 dict를 반환합니다."""
+    r = fetch_sources(c, None, max_news, max_jobs, source_pool)
+
+    news = r['news'] or []
+    jobs = merge_jobs([r[key] for key in JOB_SOURCES], max_jobs)
+    event = _infer_event_from_news([n['title'] for n in news])
+    company_info = r['company_info']
+    nc = dict(c)
+    nc['news_list'] = news
+    nc['job_roles'] = jobs
+    nc['inferred_event'] = event
+    nc['founded_date'] = company_info['founded_date']
+    nc['employee_count'] = company_info['employee_count']
+    # 저장 시 소스별 신선도 기록용
+    nc['enriched_sources'] = list(r)
+    return nc
+
+
+def _iter_ordered(fn, items, workers):
+    """fn(item, source_pool)을 items에 적용한 결과를 입력 순서대로 내보냅니다.
+
+    workers > 1이어도 한 번에 workers * 2개까지만 미리 제출하므로 입력을 한꺼번에
+    소비하지 않고 메모리 사용량이 일정하게 유지됩니다. collect.MonthEnd 표시는 그 자리에 그대로 내보냅니다.
+    """
+    if not workers or workers <= 1:
+        for item in items:
+            yield item if isinstance(item, MonthEnd) else fn(item, None)
+        return
+
+    window = workers * 2
+    # 회사 풀과 소스 풀을 분리해야 회사 작업이 소스 결과를 기다리며 교착되지 않습니다.
+    with ThreadPoolExecutor(max_workers=workers * SOURCES_PER_COMPANY, thread_name_prefix='enrich-src') as source_pool, \
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix='enrich') as company_pool:
+        pending = deque()
+        for item in items:
+            if isinstance(item, MonthEnd):
+                done = Future()
+                done.set_result(item)
+                pending.append(done)
+                continue
+            pending.append(company_pool.submit(fn, item, source_pool))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_enrich_companies(companies, max_news=3, max_jobs=5, workers=1):
+    """enrich_companies의 제너레이터 버전. companies는 임의의 iterable(제너레이터 포함)이며
+    엔리치된 회사를 입력 순서대로 하나씩 내보냅니다.
+    """
+    return _iter_ordered(lambda c, pool: _enrich_one(c, max_news, max_jobs, pool), companies, workers)
+
+
+def iter_refresh_sources(targets, max_news=3, max_jobs=5, workers=1):
+    """freshness.stale_targets()의 각 대상에 대해 만료된 소스만 다시 조회합니다.
+
+    (target, {소스: 결과}) 튜플을 입력 순서대로 내보냅니다.
+    """
+    return _iter_ordered(
+        lambda t, pool: (t, fetch_sources(t, t['sources'], max_news, max_jobs, pool)), targets, workers)
+
+
+def enrich_companies(companies, max_news=3, max_jobs=5, show_sample=5, workers=1):
+    """각 회사에 대해 뉴스/채용 조회 및 이벤트 추론을 수행하고 결과 리스트 반환
+
+    workers > 1이면 회사 단위와 소스 단위를 모두 스레드 풀로 동시에 처리합니다.
+    실제 동시 요청 수는 http_client의 전체/호스트별 상한(configure_concurrency)으로 제한되며,
+    결과 순서는 입력 순서와 동일합니다.
+    """
+    out = list(iter_enrich_companies(companies, max_news, max_jobs, workers))
 
     print(f"엔리치 완료: {len(out)}개")
     print(f"샘플(처음 {show_sample}):")
@@ -0,0 +1,63 @@
+"""회사 x 소스별 엔리치 신선도(마지막 조회 시각) 기록.
+
+소스마다 TTL이 달라서(뉴스는 자주, 회사 정보는 드물게) 만료된 소스만 다시 조회할 수 있습니다.
+기록이 없는 기존 회사는 raw_company_data.last_enrich_date를 마지막 조회 시각으로 간주합니다.
+"""
+from datetime import datetime, timedelta
+
+# enrich._source_tasks의 키와 동일
+SOURCE_TTL_DAYS = {
+    'news': 3,
+    'wanted': 7,
+    'saramin': 7,
+    'naver_jobs': 7,
+    'careers': 30,
+    'company_info': 90,
+}
+TS_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def ensure_table(cur):
+    cur.execute('''
+    CREATE TABLE IF NOT EXISTS enrich_freshness (
+        company_id INTEGER NOT NULL,
+        source TEXT NOT NULL,
+        fetched_at TEXT NOT NULL,
+        PRIMARY KEY (company_id, source),
+        FOREIGN KEY(company_id) REFERENCES raw_company_data(id)
+    )
+    ''')
+
+
+def mark(cur, company_id, sources, fetched_at=None):
+    """(company_id, 소스)별 조회 시각을 기록합니다. 마이그레이션 전의 DB에서도 쓸 수 있게 테이블을 먼저 만듭니다."""
+    fetched_at = fetched_at or datetime.now().strftime(TS_FORMAT)
+    ensure_table(cur)
+    cur.executemany(
+        "INSERT OR REPLACE INTO enrich_freshness (company_id, source, fetched_at) VALUES (?, ?, ?)",
+        [(company_id, s, fetched_at) for s in sources])
+
+
+def stale_targets(cur, sources=None, where='', params=(), now=None):
+    """TTL이 지난 (회사, 소스) 조합을 회사 단위로 묶어 반환합니다.
+
+    반환: [{'id', 'name', 'funding_date', 'sources': [...]}] (id 순)
+    where/params: raw_company_data(r)에 대한 추가 조건 (예: " AND r.industry IN (?)")
+    """
+    unknown = [s for s in sources or () if s not in SOURCE_TTL_DAYS]
+    if unknown:
+        raise ValueError(f"unknown source(s): {', '.join(unknown)} (expected {', '.join(SOURCE_TTL_DAYS)})")
+    now = now or datetime.now()
+    targets = {}
+    for source in sources or SOURCE_TTL_DAYS:
+        cutoff = (now - timedelta(days=SOURCE_TTL_DAYS[source])).strftime(TS_FORMAT)
+        rows = cur.execute(f'''
+        SELECT r.id, r.company_name, r.funding_date
+        FROM raw_company_data r
+        LEFT JOIN enrich_freshness f ON f.company_id = r.id AND f.source = ?
+        WHERE COALESCE(f.fetched_at, r.last_enrich_date, '') < ? {where}
+        ''', (source, cutoff, *params)).fetchall()
+        for cid, name, funding_date in rows:
+            t = targets.setdefault(cid, {'id': cid, 'name': name, 'funding_date': funding_date, 'sources': []})
+            t['sources'].append(source)
+    return [targets[k] for k in sorted(targets)]
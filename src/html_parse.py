@@ -0,0 +1,81 @@
+"""공용 HTML 파싱 레이어.
+
+- lxml이 설치되어 있으면 C 파서(lxml)를, 없으면 html.parser를 사용
+- parse_only로 필요한 서브트리(<article> 등)만 트리로 만듦
+- 표는 한 번만 순회해 셀 텍스트 행렬(TableMatrix)로 만들고 이후 패스들이 재사용
+"""
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    BACKEND = 'lxml'
+except ImportError:
+    BACKEND = 'html.parser'
+
+
+def make_soup(html, only=None):
+    """html을 파싱합니다. only(태그명 또는 태그명 리스트)를 주면 해당 서브트리만 파싱합니다."""
+    if only:
+        return BeautifulSoup(html or '', BACKEND, parse_only=SoupStrainer(only))
+    return BeautifulSoup(html or '', BACKEND)
+
+
+def parse_article(html):
+    """<article> 서브트리만 파싱해 반환합니다. <article>이 없으면 문서 전체를 파싱합니다."""
+    soup = make_soup(html, only='article')
+    article = soup.find('article')
+    if article is not None:
+        return article
+    return make_soup(html)
+
+
+class Cell:
+    """표 셀의 텍스트. text = get_text(strip=True), spaced = get_text(' ', strip=True)"""
+    __slots__ = ('text', 'spaced')
+
+    def __init__(self, tag):
+        strings = list(tag.stripped_strings)
+        self.text = ''.join(strings)
+        self.spaced = ' '.join(strings)
+
+
+class TableMatrix:
+    """<table>을 한 번만 순회해 만든 셀 행렬.
+
+    rows: tr마다 td/th 셀 리스트 (table.find_all('tr') 순서, 빈 행 포함)
+    thead: <thead>가 있으면 그 안의 셀 리스트, 없으면 None
+    """
+    __slots__ = ('rows', 'thead')
+
+    def __init__(self, table):
+        self.rows = [[Cell(td) for td in tr.find_all(['td', 'th'])] for tr in table.find_all('tr')]
+        thead = table.find('thead')
+        self.thead = [Cell(c) for c in thead.find_all(['th', 'td'])] if thead is not None else None
+
+
+class TableIndex:
+    """root 아래 모든 표의 행렬을 캐시해, 같은 표를 여러 패스가 다시 파싱하지 않게 합니다."""
+
+    def __init__(self, root):
+        self.root = root
+        self.tables = root.find_all('table')
+        self._matrices = {}
+
+    def matrix(self, table):
+        key = id(table)
+        m = self._matrices.get(key)
+        if m is None:
+            m = TableMatrix(table)
+            self._matrices[key] = m
+        return m
+
+    def all(self):
+        return [self.matrix(t) for t in self.tables]
+
+    def within(self, container):
+        """container(표 자체 또는 표를 감싼 요소) 안의 표 행렬들."""
+        if container is None:
+            return []
+        if container.name == 'table':
+            return [self.matrix(container)]
+        return [self.matrix(t) for t in container.find_all('table')]
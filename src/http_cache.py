@@ -0,0 +1,255 @@
+"""디스크(SQLite) 기반 HTTP 응답 캐시.
+
+- 키: 정규화된 URL + 정렬된 쿼리 파라미터 (apiKey 등 비밀 파라미터 제외)
+- 소스(호스트)별 TTL, ETag/Last-Modified 재검증
+- 전체 크기 상한을 넘으면 가장 오래 쓰이지 않은 항목부터 삭제(LRU)
+- offline(--cache-only) 모드: 네트워크 없이 캐시만 사용, 미스는 504 응답
+
+http_client.get이 자동으로 사용합니다. 단독 실행 시 통계 확인/비우기:
+    python http_cache.py --stats | --clear | --purge-expired
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import db
+from db import BASE_DIR
+
+CACHE_PATH = os.path.join(BASE_DIR, 'http_cache.db')
+
+HOUR = 3600
+DEFAULT_TTL = 6 * HOUR
+SOURCE_TTLS = {
+    'search.naver.com': 6 * HOUR,
+    'newsapi.org': 6 * HOUR,
+    'www.wanted.co.kr': 12 * HOUR,
+    'www.saramin.co.kr': 12 * HOUR,
+    'startuprecipe.co.kr': 24 * HOUR,
+    'thevc.kr': 24 * HOUR,
+}
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+
+# 캐시 키/저장 URL에서 제외할 파라미터(소문자)
+SECRET_PARAMS = {'apikey', 'api_key', 'key', 'token'}
+
+# 런타임 설정 (configure()로 변경)
+_enabled = True
+_offline = False
+
+_lock = threading.Lock()
+_conn = None
+_approx_bytes = None
+
+
+def configure(enabled=None, offline=None, path=None, max_bytes=None):
+    """캐시 동작을 변경합니다. offline=True면 네트워크 없이 캐시만 사용합니다."""
+    global _enabled, _offline, CACHE_PATH, MAX_CACHE_BYTES, _conn, _approx_bytes
+    with _lock:
+        if enabled is not None:
+            _enabled = enabled
+        if offline is not None:
+            _offline = offline
+        if max_bytes:
+            MAX_CACHE_BYTES = max_bytes
+        if path and path != CACHE_PATH:
+            if _conn is not None:
+                _conn.close()
+            _conn = None
+            _approx_bytes = None
+            CACHE_PATH = path
+
+
+def is_enabled():
+    return _enabled
+
+
+def is_offline():
+    return _offline
+
+
+def _db():
+    global _conn, _approx_bytes
+    if _conn is None:
+        _conn = db.connect(CACHE_PATH, check_same_thread=False)
+        _conn.execute('''
+        CREATE TABLE IF NOT EXISTS http_cache (
+            key TEXT PRIMARY KEY,
+            url TEXT,
+            status INTEGER,
+            headers TEXT,
+            body BLOB,
+            encoding TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at REAL,
+            expires_at REAL,
+            last_access REAL,
+            size INTEGER
+        )
+        ''')
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_last_access ON http_cache(last_access)")
+        _conn.commit()
+        _approx_bytes = _conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+    return _conn
+
+
+def cache_key(url, params=None):
+    """스킴/호스트 소문자화, 프래그먼트 제거, 쿼리 파라미터 정렬, 비밀 파라미터 제외."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        items = params.items() if isinstance(params, dict) else params
+        query.extend((str(k), str(v)) for k, v in items if v is not None)
+    query = sorted((k, v) for k, v in query if k.lower() not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', urlencode(query), ''))
+
+
+def ttl_for(url):
+    return SOURCE_TTLS.get(urlsplit(url).netloc.lower(), DEFAULT_TTL)
+
+
+class CacheEntry:
+    __slots__ = ('key', 'url', 'status', 'headers', 'body', 'encoding', 'etag', 'last_modified', 'expires_at')
+
+    def __init__(self, row):
+        (self.key, self.url, self.status, headers, self.body, self.encoding,
+         self.etag, self.last_modified, self.expires_at) = row
+        self.headers = json.loads(headers or '{}')
+
+    @property
+    def fresh(self):
+        return self.expires_at > time.time()
+
+    def validators(self):
+        """조건부 재검증 요청에 붙일 헤더."""
+        h = {}
+        if self.etag:
+            h['If-None-Match'] = self.etag
+        if self.last_modified:
+            h['If-Modified-Since'] = self.last_modified
+        return h
+
+    def to_response(self):
+        r = requests.Response()
+        r.status_code = self.status
+        r._content = self.body
+        r.headers = CaseInsensitiveDict(self.headers)
+        r.url = self.url
+        r.encoding = self.encoding
+        r.reason = 'OK'
+        r.from_cache = True
+        return r
+
+
+def lookup(key):
+    """캐시 항목(만료 포함)을 반환하고 LRU 접근 시각을 갱신합니다. 없으면 None."""
+    with _lock:
+        conn = _db()
+        row = conn.execute(
+            "SELECT key, url, status, headers, body, encoding, etag, last_modified, expires_at FROM http_cache WHERE key = ?",
+            (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE http_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+        conn.commit()
+    return CacheEntry(row)
+
+
+def store(key, resp, ttl):
+    """200 응답을 저장합니다. 크기 상한을 넘으면 LRU로 정리합니다."""
+    global _approx_bytes
+    if resp.status_code != 200:
+        return
+    body = resp.content or b''
+    headers = {k: v for k, v in resp.headers.items() if k.lower() not in ('set-cookie', 'content-encoding', 'transfer-encoding', 'content-length')}
+    now = time.time()
+    with _lock:
+        conn = _db()
+        old = conn.execute("SELECT size FROM http_cache WHERE key = ?", (key,)).fetchone()
+        conn.execute('''
+        INSERT OR REPLACE INTO http_cache (key, url, status, headers, body, encoding, etag, last_modified, fetched_at, expires_at, last_access, size)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (key, key, resp.status_code, json.dumps(headers, ensure_ascii=False), body, resp.encoding,
+              resp.headers.get('ETag'), resp.headers.get('Last-Modified'), now, now + ttl, now, len(body)))
+        _approx_bytes += len(body) - (old[0] if old else 0)
+        if _approx_bytes > MAX_CACHE_BYTES:
+            _evict(conn, int(MAX_CACHE_BYTES * 0.9))
+        conn.commit()
+
+
+def refresh(key, ttl):
+    """304(Not Modified) 재검증 성공 시 만료 시각만 연장합니다."""
+    now = time.time()
+    with _lock:
+        conn = _db()
+        conn.execute("UPDATE http_cache SET expires_at = ?, last_access = ? WHERE key = ?", (now + ttl, now, key))
+        conn.commit()
+
+
+def _evict(conn, target_bytes):
+    global _approx_bytes
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+    if total <= target_bytes:
+        _approx_bytes = total
+        return
+    freed = 0
+    victims = []
+    for key, size in conn.execute("SELECT key, size FROM http_cache ORDER BY last_access"):
+        victims.append((key,))
+        freed += size or 0
+        if total - freed <= target_bytes:
+            break
+    conn.executemany("DELETE FROM http_cache WHERE key = ?", victims)
+    _approx_bytes = total - freed
+
+
+def miss_response(url):
+    """offline 모드 캐시 미스: only-if-cached 관례대로 504를 돌려줍니다."""
+    r = requests.Response()
+    r.status_code = 504
+    r._content = b''
+    r.url = url
+    r.reason = 'Not in cache (offline)'
+    r.from_cache = False
+    return r
+
+
+def stats():
+    with _lock:
+        conn = _db()
+        n, size, expired = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(expires_at <= ?), 0) FROM http_cache",
+            (time.time(),)).fetchone()
+    return {'entries': n, 'bytes': size, 'expired': expired}
+
+
+def clear(expired_only=False):
+    global _approx_bytes
+    with _lock:
+        conn = _db()
+        if expired_only:
+            conn.execute("DELETE FROM http_cache WHERE expires_at <= ?", (time.time(),))
+        else:
+            conn.execute("DELETE FROM http_cache")
+        conn.commit()
+        _approx_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='HTTP response cache maintenance')
+    parser.add_argument('--stats', action='store_true', help='Show entry count and size')
+    parser.add_argument('--clear', action='store_true', help='Delete every cached response')
+    parser.add_argument('--purge-expired', action='store_true', help='Delete only expired responses')
+    args = parser.parse_args()
+    if args.clear:
+        clear()
+    elif args.purge_expired:
+        clear(expired_only=True)
+    st = stats()
+    print(f"캐시: {st['entries']}건 / {st['bytes'] / 1024:.1f} KB (만료 {st['expired']}건) - {CACHE_PATH}")
@@ -0,0 +1,229 @@
+"""모든 스크레이퍼가 공유하는 HTTP 클라이언트.
+
+- 호스트별 requests.Session 풀(keep-alive)로 TCP/TLS 핸드셰이크 재사용
+- 공통 재시도/백오프 정책과 일관된 타임아웃
+- 전체/호스트별 동시 요청 상한
+- 연결 재사용 통계(connection_stats / print_stats)
+- 디스크 응답 캐시(http_cache) 조회/재검증/저장
+- 호스트별 토큰 버킷(rate_limit)으로 요청 간격 조절, 429/Retry-After 준수
+- 녹화/재생(replay): 응답을 fixture로 저장하거나 네트워크 대신 fixture 사용
+"""
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+import http_cache
+import rate_limit
+import replay
+
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'}
+DEFAULT_TIMEOUT = 10
+
+# 재시도 2회(최대 3회 시도), 0.5s -> 1s 지수 백오프
+# 429는 urllib3가 아닌 _fetch가 처리해 해당 호스트의 토큰 버킷 전체를 멈춥니다
+RETRY_TOTAL = 2
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# 동시 요청 제한: 전체 상한 + 호스트별 상한 (호스트별 상한은 세션 풀 크기로도 사용)
+MAX_GLOBAL_REQUESTS = 16
+DEFAULT_HOST_LIMIT = 4
+HOST_LIMITS = {
+    'search.naver.com': 4,
+    'www.wanted.co.kr': 3,
+    'www.saramin.co.kr': 3,
+    'startuprecipe.co.kr': 2,
+    'newsapi.org': 2,
+}
+
+_lock = threading.Lock()
+_sessions = {}
+_global_slots = threading.BoundedSemaphore(MAX_GLOBAL_REQUESTS)
+_host_slots = {}
+_stats = {}
+
+
+def _count(host, key):
+    with _lock:
+        st = _stats.setdefault(host, {'requests': 0, 'connections': 0})
+        st[key] += 1
+
+
+# 실제 TCP 연결 수립(connect) 횟수를 세기 위한 연결/풀 클래스
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        _count(self.host, 'connections')
+        return super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        _count(self.host, 'connections')
+        return super().connect()
+
+
+class _CountingHTTPPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _CountingAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _CountingHTTPPool, 'https': _CountingHTTPSPool}
+
+
+def configure_concurrency(global_limit=None, host_limits=None, default_host_limit=None):
+    """전체/호스트별 동시 요청 상한을 변경합니다. 요청이 진행 중이지 않을 때 호출하세요."""
+    global _global_slots, DEFAULT_HOST_LIMIT
+    with _lock:
+        if global_limit:
+            _global_slots = threading.BoundedSemaphore(global_limit)
+        if default_host_limit:
+            DEFAULT_HOST_LIMIT = default_host_limit
+        if host_limits:
+            HOST_LIMITS.update(host_limits)
+        _host_slots.clear()
+        # 풀 크기가 새 상한을 따르도록 세션을 다시 만듭니다
+        for s in _sessions.values():
+            s.close()
+        _sessions.clear()
+
+
+def _host_limit(host):
+    return HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT)
+
+
+def _make_session(host, retry=True):
+    policy = Retry(
+        total=RETRY_TOTAL if retry else 0,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = _CountingAdapter(pool_connections=1, pool_maxsize=_host_limit(host), max_retries=policy)
+    if replay.is_replaying():
+        adapter = replay.ReplayAdapter()
+    s = requests.Session()
+    s.headers.update(HEADERS)
+    s.mount('http://', adapter)
+    s.mount('https://', adapter)
+    return s
+
+
+def _session_for(host, retry=True):
+    key = (host, retry, replay.is_replaying())
+    with _lock:
+        s = _sessions.get(key)
+        if s is None:
+            s = _make_session(host, retry)
+            _sessions[key] = s
+        return s
+
+
+def _host_slot(host):
+    with _lock:
+        sem = _host_slots.get(host)
+        if sem is None:
+            sem = threading.BoundedSemaphore(_host_limit(host))
+            _host_slots[host] = sem
+        return sem
+
+
+@contextmanager
+def _request_slot(host):
+    """전체 상한과 해당 호스트 상한을 모두 확보한 동안만 요청을 보냅니다.
+
+    호스트 슬롯을 먼저 잡아야, 한 호스트에 몰린 요청이 호스트 슬롯을 기다리는 동안
+    전체 슬롯을 붙잡아 다른 호스트의 요청까지 막는 일이 없습니다.
+    """
+    with _host_slot(host):
+        with _global_slots:
+            yield
+
+
+def _fetch(url, params, headers, timeout, retry, **kwargs):
+    host = urlparse(url).netloc
+    attempts = RETRY_TOTAL + 1 if retry else 1
+    for attempt in range(attempts):
+        if not replay.is_replaying():
+            rate_limit.scheduler.acquire(host)
+        _count(urlparse(url).hostname, 'requests')
+        with _request_slot(host):
+            resp = _session_for(host, retry).get(url, params=params, headers=headers, timeout=timeout, **kwargs)
+        if resp.status_code != 429:
+            return resp
+        wait = rate_limit.parse_retry_after(resp.headers.get('Retry-After'))
+        print(f"429 응답: {host} {wait:.1f}s 대기 (시도 {attempt + 1}/{attempts})")
+        rate_limit.scheduler.penalize(host, wait)
+    return resp
+
+
+def get(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT, retry=True, cache=True, **kwargs):
+    """호스트별 풀링 세션으로 GET 요청을 보냅니다. requests.Response를 반환합니다.
+
+    retry=False는 실패가 흔한 추측성 요청(예: 회사 도메인 탐색)에 사용합니다.
+    cache=True면 http_cache의 신선한 응답을 우선 사용하고, 만료된 항목은 ETag/Last-Modified로
+    재검증합니다. 캐시에서 나온 응답은 resp.from_cache == True 입니다.
+    replay 모드에서는 캐시를 건너뛰고 fixture만 사용하며, record 모드에서는 돌려준 응답을 저장합니다.
+    """
+    resp = _get(url, params, headers, timeout, retry, cache and not replay.is_replaying(), **kwargs)
+    if replay.is_recording() and resp.status_code != 504:
+        # 리다이렉트가 있어도 재생 시 어댑터가 받는 최초 요청 URL 기준으로 저장
+        replay.record(requests.Request('GET', url, params=params).prepare().url, resp)
+    return resp
+
+
+def _get(url, params, headers, timeout, retry, cache, **kwargs):
+    if not (cache and http_cache.is_enabled()):
+        return _fetch(url, params, headers, timeout, retry, **kwargs)
+
+    key = http_cache.cache_key(url, params)
+    entry = http_cache.lookup(key)
+    if entry is not None and (entry.fresh or http_cache.is_offline()):
+        return entry.to_response()
+    if http_cache.is_offline():
+        return http_cache.miss_response(url)
+
+    if entry is not None and entry.validators():
+        headers = {**(headers or {}), **entry.validators()}
+    resp = _fetch(url, params, headers, timeout, retry, **kwargs)
+    ttl = http_cache.ttl_for(url)
+    if resp.status_code == 304 and entry is not None:
+        http_cache.refresh(key, ttl)
+        return entry.to_response()
+    http_cache.store(key, resp, ttl)
+    resp.from_cache = False
+    return resp
+
+
+def connection_stats():
+    """호스트별 {'requests', 'connections', 'reused'} 통계를 반환합니다.
+
+    reused = 새 TCP 연결 없이 기존 keep-alive 연결로 처리된 요청 수(재시도 포함 근사치).
+    """
+    with _lock:
+        snapshot = {h: dict(st) for h, st in _stats.items()}
+    for st in snapshot.values():
+        st['reused'] = max(st['requests'] - st['connections'], 0)
+    return snapshot
+
+
+def print_stats():
+    stats = connection_stats()
+    if not stats:
+        return
+    print("== HTTP 연결 재사용 통계 ==")
+    for host, st in sorted(stats.items()):
+        print(f"  {host}: 요청 {st['requests']}건 / 연결 {st['connections']}개 / 재사용 {st['reused']}건")
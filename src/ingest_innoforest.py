@@ -1,9 +1,7 @@
-import sqlite3
-import requests
-from bs4 import BeautifulSoup
 import re
-import time
-from db import get_conn
+import http_client
+from store import upsert_source_summaries
+from html_parse import make_soup
 
 def scrape_innoforest_real():
     """혁신의숲 실제 투자 데이터 크롤링 (공개 페이지)"""
@@ -13,14 +11,13 @@ def scrape_innoforest_real():
         "https://koreatechdesk.com/innovation-forests-2023-report"
     ]
     
-    headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'}
     companies = []
     
     for url in urls:
         try:
             print(f"🌲 혁신의숲 {url} 크롤링...")
-            response = requests.get(url, headers=headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = http_client.get(url)
+            soup = make_soup(response.text)
             
             # 회사명 추출 (실제 패턴)
             titles = soup.find_all(['h1', 'h2', 'h3', 'p'], string=re.compile(r'[가-힣]{2,}'))
@@ -36,7 +33,6 @@ def scrape_innoforest_real():
                         'job_roles': '확인중',
                         'news_title': f"{company_match.group(1)} 투자/성장"
                     })
-            time.sleep(1)
         except:
             continue
     
@@ -44,22 +40,7 @@ def scrape_innoforest_real():
     return companies[:5]  # Top 5만
 
 def save_to_db(companies):
-    conn = get_conn()
-    cursor = conn.cursor()
-    
-    for company in companies:
-        cursor.execute("SELECT id FROM raw_company_data WHERE company_name = ?", (company['name'],))
-        if cursor.fetchone():
-            continue
-        cursor.execute('''
-        INSERT INTO raw_company_data (company_name, source, funding_stage, funding_date, job_roles, news_title)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ''', (company['name'], company['source'], company['funding_stage'], 
-              company['funding_date'], company['job_roles'], company['news_title']))
-        print(f"✅ {company['name']} 저장!")
-    
-    conn.commit()
-    conn.close()
+    return upsert_source_summaries(companies)
 
 if __name__ == "__main__":
     companies = scrape_innoforest_real()
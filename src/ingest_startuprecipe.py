@@ -2,8 +2,6 @@
 import warnings
 from urllib3.exceptions import NotOpenSSLWarning
 warnings.filterwarnings("ignore", category=NotOpenSSLWarning)
-import requests
-from bs4 import BeautifulSoup
 import re
 import time
 from urllib.parse import quote_plus
@@ -13,10 +11,15 @@ from datetime import date
 from os import getenv
 import argparse
 
-from utils import normalize_company_name, score_company_record
-
-
-HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'}
+from utils import company_key
+import http_client
+from html_parse import make_soup
+import http_cache
+import freshness
+import migrate
+import retention
+from collect import MonthEnd
+from write_behind import WriteBehindQueue
 
 
 def _search_naver_news(company_name, max_items=3):
@@ -24,12 +27,12 @@ def _search_naver_news(company_name, max_items=3):
     q = quote_plus(company_name)
     url = f'https://search.naver.com/search.naver?where=news&query={q}'
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
+        resp = http_client.get(url)
         resp.raise_for_status()
     except Exception:
         return []
 
-    soup = BeautifulSoup(resp.text, 'html.parser')
+    soup = make_soup(resp.text)
     results = []
     # 여러 선택자 시도: 네이버 구조가 바뀔 수 있어 여유있게 탐색
     for a in soup.select('a._sp_each_title, a.news_tit, a.tit'):
@@ -42,33 +45,133 @@ def _search_naver_news(company_name, max_items=3):
     return results
 
 
+def _without_enrichment(companies):
+    # enrich 없이 바로 save (기존 데이터 사용): job_roles, news_list 빈 리스트로
+    for c in companies:
+        if isinstance(c, MonthEnd):
+            yield c
+            continue
+        c['job_roles'] = []
+        c['news_list'] = []
+        c['inferred_event'] = 'unknown'
+        yield c
+
+
+def run_pipeline(companies, enrich=True, batch_size=50, workers=1, preview_n=10, bulk=False, upsert=False, max_wait=None):
+    """수집 -> 엔리치 -> 저장을 스트리밍으로 실행합니다.
+
+    companies(제너레이터 가능)에서 나온 회사가 엔리치되는 대로 write-behind 큐에 넣고,
+    전용 writer 스레드가 batch_size개씩 save_to_db로 커밋합니다. 엔리치(네트워크)와 저장(디스크)이
+    겹쳐 진행되며, 중간에 중단돼도 이미 넣은 회사는 종료 시 저장됩니다.
+    collect.MonthEnd 표시도 같은 순서로 큐에 넣어, 그 달의 회사가 모두 커밋되는 배치에서 processed_periods가 기록됩니다.
+    bulk=True면 배치마다 save_to_db_bulk(한 트랜잭션 + executemany)로 저장합니다.
+    upsert=True면 이미 있는 회사도 content_hash를 비교해 바뀐 행만 갱신합니다(upsert_companies).
+    max_wait(초)를 주면 배치가 덜 찼어도 그 시간이 지나면 저장합니다.
+    """
+    from enrich import iter_enrich_companies
+    from store import preview, save_to_db
+
+    stream = iter_enrich_companies(companies, max_news=3, max_jobs=5, workers=workers) if enrich else _without_enrichment(companies)
+    head = []
+    month_ends = 0
+    with WriteBehindQueue(lambda batch: save_to_db(batch, bulk=bulk, upsert=upsert), batch_size=batch_size, max_wait=max_wait) as q:
+        for c in stream:
+            if isinstance(c, MonthEnd):
+                q.put(c)
+                month_ends += 1
+                continue
+            if preview_n and len(head) < preview_n:
+                head.append(c)
+                if len(head) == preview_n:
+                    preview(head, n=preview_n)
+            q.put(c)
+    if preview_n and 0 < len(head) < preview_n:
+        preview(head, n=preview_n)
+    _print_write_stats(q, month_ends)
+    return q.stats['written'] - month_ends
+
+
+def _print_write_stats(q, month_ends=0):
+    st = q.stats
+    print(f"저장 완료: {st['written'] - month_ends}개 / 배치 {st['batches']}개 (쓰기 {st['write_sec']:.1f}s, 큐 대기 {st['blocked_sec']:.1f}s)")
+
+
+def run_refresh(targets, batch_size=50, workers=1, max_wait=None):
+    """만료된 소스만 다시 조회해 write-behind 큐로 batch_size개 회사마다 기존 행에 반영합니다."""
+    from enrich import iter_refresh_sources
+    from store import refresh_company_sources
+
+    n_pairs = sum(len(t['sources']) for t in targets)
+    print(f"신선도 만료: {len(targets)}개 회사 / {n_pairs}개 (회사, 소스) 조합")
+    with WriteBehindQueue(refresh_company_sources, batch_size=batch_size, max_wait=max_wait) as q:
+        for item in iter_refresh_sources(targets, max_news=3, max_jobs=5, workers=workers):
+            q.put(item)
+    _print_write_stats(q)
+    return q.stats['written']
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='StartupRecipe ingestion pipeline')
     parser.add_argument('--only-enrich', action='store_true', help='Skip collection, only enrich existing data')
     parser.add_argument('--skip-enrich', action='store_true', help='Skip enrichment, only collect and save')
     parser.add_argument('--batch-size', type=int, default=50, help='Batch size for processing')
+    parser.add_argument('--max-wait', type=float, help='Also flush a partial batch after this many seconds (default: only when --batch-size is reached)')
+    parser.add_argument('--upsert', action='store_true', help='Update already-stored companies whose content hash changed (always on for --only-enrich)')
+    parser.add_argument('--bulk', action='store_true', help='Write each batch in one transaction with executemany (faster for large loads)')
     parser.add_argument('--year', type=int, help='Year for period collection (e.g., 2025)')
     parser.add_argument('--start-month', type=int, help='Start month for period collection (1-12)')
     parser.add_argument('--end-month', type=int, help='End month for period collection (1-12)')
     parser.add_argument('--filter-company', type=str, help='Comma-separated list of company names to filter')
     parser.add_argument('--filter-industry', type=str, help='Comma-separated list of industries to filter')
     parser.add_argument('--update-old', action='store_true', help='Update companies not enriched in last 7 days')
+    parser.add_argument('--refresh-stale', action='store_true', help='Re-query only sources whose freshness TTL expired and update rows in place')
+    parser.add_argument('--sources', type=str, help='Comma-separated sources for --refresh-stale (news,wanted,saramin,careers,naver_jobs,company_info)')
+    parser.add_argument('--workers', type=int, default=1, help='Number of companies to enrich concurrently (1 = sequential)')
+    parser.add_argument('--max-requests', type=int, help='Global cap on concurrent HTTP requests during enrichment')
+    parser.add_argument('--per-host', type=int, help='Default cap on concurrent HTTP requests per host')
+    parser.add_argument('--cache-only', action='store_true', help='Offline mode: serve every request from the HTTP cache only')
+    parser.add_argument('--maintenance', action='store_true', help='Run scheduled retention/vacuum/analyze at the end (see retention.py --scheduled)')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the HTTP response cache')
     args = parser.parse_args()
+    sources = [s.strip() for s in args.sources.split(',') if s.strip()] if args.sources else None
+    if sources:
+        unknown = [s for s in sources if s not in freshness.SOURCE_TTL_DAYS]
+        if unknown:
+            parser.error(f"--sources: unknown source(s) {', '.join(unknown)} (choose from {', '.join(freshness.SOURCE_TTL_DAYS)})")
 
-    # 전체 파이프라인 실행: 수집 -> 엔리치 -> 미리보기 -> 저장
-    from collect import scrape_startuprecipe_from_invest, scrape_startuprecipe_for_period
-    from enrich import enrich_companies
-    from store import preview, save_to_db
+    # 전체 파이프라인 실행: 수집 -> 엔리치 -> 저장 (--batch-size 단위 스트리밍)
+    from collect import iter_startuprecipe_from_invest, iter_startuprecipe_for_period
+
+    http_client.configure_concurrency(global_limit=args.max_requests, default_host_limit=args.per_host)
+    http_cache.configure(enabled=not args.no_cache, offline=args.cache_only)
 
-    if args.only_enrich:
+    if args.refresh_stale:
+        conn = get_conn()
+        migrate.upgrade(conn)
+        cur = conn.cursor()
+        where = ''
+        params = []
+        if args.filter_company:
+            companies = [company_key(c) for c in args.filter_company.split(',')]
+            where += " AND r.normalized_name IN ({})".format(','.join('?' * len(companies)))
+            params.extend(companies)
+        if args.filter_industry:
+            industries = [i.strip() for i in args.filter_industry.split(',')]
+            where += " AND r.industry IN ({})".format(','.join('?' * len(industries)))
+            params.extend(industries)
+        targets = freshness.stale_targets(cur, sources, where, params)
+        conn.close()
+        run_refresh(targets, batch_size=args.batch_size, workers=args.workers, max_wait=args.max_wait)
+    elif args.only_enrich:
         # DB에서 기존 회사 가져와 enrich만
         conn = get_conn()
+        migrate.upgrade(conn)
         cur = conn.cursor()
         query = "SELECT id, company_name FROM raw_company_data WHERE 1=1"
         params = []
         if args.filter_company:
-            companies = [c.strip() for c in args.filter_company.split(',')]
-            query += " AND company_name IN ({})".format(','.join('?' * len(companies)))
+            companies = [company_key(c) for c in args.filter_company.split(',')]
+            query += " AND normalized_name IN ({})".format(','.join('?' * len(companies)))
             params.extend(companies)
         if args.filter_industry:
             industries = [i.strip() for i in args.filter_industry.split(',')]
@@ -79,28 +182,16 @@ if __name__ == '__main__':
         rows = cur.execute(query, params).fetchall()
         collected = [{'name': r[1], 'id': r[0]} for r in rows]
         conn.close()
-        enriched = enrich_companies(collected, max_news=3, max_jobs=5, show_sample=10)
-        preview(enriched, n=10)
-        save_to_db(enriched)
-    elif args.skip_enrich:
-        if args.year and args.start_month and args.end_month:
-            collected = scrape_startuprecipe_for_period(args.year, args.start_month, args.end_month)
-        else:
-            collected = scrape_startuprecipe_from_invest(months=1)
-        # enrich 없이 바로 save (기존 데이터 사용)
-        enriched = collected  # job_roles, news_list 빈 리스트로
-        for c in enriched:
-            c['job_roles'] = []
-            c['news_list'] = []
-            c['inferred_event'] = 'unknown'
-        preview(enriched, n=10)
-        save_to_db(enriched)
+        run_pipeline(collected, enrich=True, batch_size=args.batch_size, workers=args.workers, bulk=args.bulk, upsert=True,
+                     max_wait=args.max_wait)
     else:
         if args.year and args.start_month and args.end_month:
-            collected = scrape_startuprecipe_for_period(args.year, args.start_month, args.end_month)
+            collected = iter_startuprecipe_for_period(args.year, args.start_month, args.end_month)
         else:
-            collected = scrape_startuprecipe_from_invest(months=1)
-        enriched = enrich_companies(collected, max_news=3, max_jobs=5, show_sample=10)
-        preview(enriched, n=10)
-        save_to_db(enriched)
+            collected = iter_startuprecipe_from_invest(months=1)
+        run_pipeline(collected, enrich=not args.skip_enrich, batch_size=args.batch_size, workers=args.workers,
+                     bulk=args.bulk, upsert=args.upsert, max_wait=args.max_wait)
+    http_client.print_stats()
+    if args.maintenance:
+        retention.run_scheduled()
     print('완료!')
\ No newline at end of file
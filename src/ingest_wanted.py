@@ -1,17 +1,15 @@
-import sqlite3
-import requests
-from bs4 import BeautifulSoup
 import re
-from db import get_conn
+import http_client
+from store import upsert_source_summaries
+from html_parse import make_soup
 
 def scrape_wanted_real():
     """원티드 세일즈/마케팅 채용 실제 크롤링"""
     url = "https://www.wanted.co.kr/wdlist/518"  # 세일즈 직무
-    headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'}
     
     try:
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        response = http_client.get(url)
+        soup = make_soup(response.text)
         
         # 실제 원티드 클래스명으로 회사명/직무 추출
         job_cards = soup.find_all('div', class_=re.compile(r'JobCard'))
@@ -40,22 +38,7 @@ def scrape_wanted_real():
         return []
 
 def save_to_db(companies):
-    conn = get_conn()
-    cursor = conn.cursor()
-    
-    for company in companies:
-        cursor.execute("SELECT id FROM raw_company_data WHERE company_name = ?", (company['name'],))
-        if cursor.fetchone():
-            continue
-        cursor.execute('''
-        INSERT INTO raw_company_data (company_name, source, funding_stage, funding_date, job_roles, news_title)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ''', (company['name'], company['source'], company['funding_stage'], 
-              company['funding_date'], company['job_roles'], company['news_title']))
-        print(f"✅ {company['name']} ({company['job_roles']}) 저장!")
-    
-    conn.commit()
-    conn.close()
+    return upsert_source_summaries(companies)
 
 if __name__ == "__main__":
     companies = scrape_wanted_real()
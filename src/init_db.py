@@ -1,99 +1,30 @@
+import argparse
 import os
 from db import get_conn, DB_PATH
+import migrate
+
+# 기본 동작은 비파괴: migrate.py의 버전 마이그레이션만 적용합니다.
+# --reset을 줄 때만 기존 테이블을 삭제하고 새로 만듭니다.
+parser = argparse.ArgumentParser(description='Create or upgrade the DB schema')
+parser.add_argument('--reset', action='store_true', help='DROP every table first (destroys all data)')
+args = parser.parse_args()
 
 conn = get_conn()          # 🔥 반드시 () 붙이기
 cursor = conn.cursor()
 
-# 기존 테이블 삭제
-cursor.execute("DROP TABLE IF EXISTS raw_company_data")
-cursor.execute("DROP TABLE IF EXISTS signal_scores")
-cursor.execute("DROP TABLE IF EXISTS sales_mart")
-cursor.execute("DROP TABLE IF EXISTS news")
-cursor.execute("DROP TABLE IF EXISTS jobs")
-cursor.execute("DROP TABLE IF EXISTS processed_periods")
-
-# 1. Raw Layer
-cursor.execute('''
-CREATE TABLE raw_company_data (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    company_name TEXT NOT NULL,
-    source TEXT,
-    funding_stage TEXT,
-    funding_round TEXT,
-    funding_date TEXT,
-    amount TEXT,
-    investors TEXT,
-    industry TEXT,
-    keywords TEXT,
-    required_roles TEXT,
-    job_roles TEXT,
-    news_title TEXT,
-    collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-)
-''')
-
-# 2. Signal Layer
-cursor.execute('''
-CREATE TABLE signal_scores (
-    company_id INTEGER PRIMARY KEY,
-    funding_score INTEGER DEFAULT 0,
-    hiring_score INTEGER DEFAULT 0,
-    recency_score INTEGER DEFAULT 0,
-    total_score INTEGER DEFAULT 0,
-    FOREIGN KEY(company_id) REFERENCES raw_company_data(id)
-)
-''')
-
-# 3. Mart Layer
-cursor.execute('''
-CREATE TABLE sales_mart (
-    company_id INTEGER PRIMARY KEY,
-    priority TEXT DEFAULT 'Low',
-    sales_hook TEXT,
-    is_sent BOOLEAN DEFAULT 0,
-    FOREIGN KEY(company_id) REFERENCES raw_company_data(id)
-)
-''')
-
-# 4. News table (structured storage)
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS news (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    company_id INTEGER,
-    title TEXT,
-    content TEXT,
-    url TEXT,
-    published_at TEXT,
-    source_name TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY(company_id) REFERENCES raw_company_data(id)
-)
-''')
-
-# 5. Jobs table (structured storage)
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS jobs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    company_id INTEGER,
-    title TEXT,
-    team TEXT,
-    link TEXT,
-    source TEXT,
-    collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY(company_id) REFERENCES raw_company_data(id)
-)
-''')
-
-# 6. Processed periods to avoid re-processing same month
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS processed_periods (
-    period TEXT PRIMARY KEY,
-    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-)
-''')
+if args.reset:
+    # 기존 테이블 삭제
+    for table in ('news_fts', 'jobs_fts', 'signal_scores_history', 'maintenance_log', 'score_dirty', 'scoring_state', 'raw_company_data', 'signal_scores', 'sales_mart', 'news', 'jobs', 'processed_periods', 'enrich_freshness'):
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    cursor.execute("PRAGMA user_version = 0")
+    conn.commit()
 
-conn.commit()
+before = migrate.current_version(conn)
+applied = migrate.upgrade(conn, verbose=True)
 conn.close()
 
-print("✅ DB 스키마 완전 새로 생성 완료!")
+if args.reset:
+    print("✅ DB 스키마 완전 새로 생성 완료!")
+else:
+    print(f"✅ DB 스키마 버전 {before} -> {migrate.LATEST} ({applied}개 마이그레이션 적용, 기존 데이터 유지)")
 print(f"📊 파일 확인: {os.path.getsize(DB_PATH)} bytes")
@@ -0,0 +1,84 @@
+"""카테고리별 키워드 집합을 한 번에 찾는 공용 매처.
+
+모든 키워드를 긴 것부터 정렬한 정규식 alternation 하나로 컴파일해 두고, 텍스트를 한 번 훑어
+걸린 카테고리를 모두 돌려줍니다. 판정은 기존 `kw in text`와 같습니다(부분 문자열, 겹침 포함):
+  - 각 위치에서 lookahead로 가장 긴 키워드를 찾고
+  - 그 키워드에 포함된 더 짧은 키워드(같은 위치에서 시작하는 접두어 등)도 함께 걸린 것으로 봅니다.
+카테고리 순서가 우선순위입니다(first()는 가장 앞 카테고리).
+
+    TEAMS = KeywordMatcher({'Marketing': ['마케', 'crm'], 'Sales': ['영업', 'bd']})
+    TEAMS.first('b2b 영업 / crm', 'Other')   # 'Marketing'
+    TEAMS.matches('b2b 영업 / crm')          # {'Marketing': ['crm'], 'Sales': ['영업']}
+    TEAMS.first_many(titles, 'Other')        # 여러 문자열
+"""
+import re
+
+
+class KeywordMatcher:
+
+    def __init__(self, categories, ignore_case=False):
+        """categories: {카테고리: [키워드, ...]} (순서 = 우선순위). ignore_case면 키워드/텍스트를 str.lower()로 비교."""
+        self.ignore_case = ignore_case
+        self.order = list(categories)
+        self._owners = {}  # 키워드 -> 카테고리 리스트 (우선순위 순)
+        for category, words in categories.items():
+            for w in words:
+                w = w.lower() if ignore_case else w
+                if w and category not in self._owners.setdefault(w, []):
+                    self._owners[w].append(category)
+        words = sorted(self._owners, key=lambda w: (-len(w), w))
+        # 어떤 위치에서 가장 긴 키워드가 걸리면 그 안에 든 키워드도 모두 텍스트에 있음
+        self._implied = {w: [k for k in words if k in w] for w in words}
+        self._regex = re.compile('(?=(' + '|'.join(map(re.escape, words)) + '))') if words else None
+        # 키워드가 걸렸을 때 함께 걸리는 카테고리 중 가장 높은 우선순위 (first()용)
+        self._rank = {w: min(self.order.index(c) for k in self._implied[w] for c in self._owners[k]) for w in words}
+
+    def keywords(self, text):
+        """text에 들어 있는 키워드 집합."""
+        if not text or self._regex is None:
+            return set()
+        if self.ignore_case:
+            text = text.lower()
+        found = set()
+        for w in set(self._regex.findall(text)):
+            found.update(self._implied[w])
+        return found
+
+    def matches(self, text):
+        """{카테고리: [걸린 키워드]} (카테고리는 우선순위 순, 없으면 빈 dict)."""
+        hit = {}
+        for w in self.keywords(text):
+            for category in self._owners[w]:
+                hit.setdefault(category, []).append(w)
+        return {c: sorted(hit[c]) for c in self.order if c in hit}
+
+    def categories(self, text):
+        """걸린 카테고리 리스트 (우선순위 순)."""
+        return list(self.matches(text))
+
+    def first(self, text, default=None):
+        """우선순위가 가장 높은 카테고리 (기존 if/return 체인과 같은 결과)."""
+        if not text or self._regex is None:
+            return default
+        found = self._regex.findall(text.lower() if self.ignore_case else text)
+        return self.order[min(map(self._rank.__getitem__, found))] if found else default
+
+    def count(self, text):
+        """{카테고리: 걸린 서로 다른 키워드 수}"""
+        return {c: len(ws) for c, ws in self.matches(text).items()}
+
+    def any(self, text):
+        if not text or self._regex is None:
+            return False
+        return self._regex.search(text.lower() if self.ignore_case else text) is not None
+
+    # -- 여러 문자열 ---------------------------------------------------------
+
+    def matches_many(self, texts):
+        return [self.matches(t) for t in texts]
+
+    def first_many(self, texts, default=None):
+        return [self.first(t, default) for t in texts]
+
+    def keywords_many(self, texts):
+        return [self.keywords(t) for t in texts]
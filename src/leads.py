@@ -0,0 +1,122 @@
+"""영업 리드 순위 조회 (점수 순 상위 K개 + 커서 페이지네이션).
+
+sales_mart를 (is_sent, total_score DESC, company_id) 인덱스 순서대로 읽으므로 정렬 단계 없이
+필요한 K행(+ 필터에서 걸러지는 행)만 읽습니다. total_score는 signal_scores에서 트리거로 복사됩니다(migrate 11).
+업종/펀딩 기간 필터는 raw_company_data(industry, funding_day) 인덱스를 씁니다.
+
+커서는 마지막 행의 "점수:회사id" 문자열이며, 다음 페이지는 그 뒤부터 이어서 읽습니다(OFFSET 없음).
+
+    python leads.py --limit 20 --industry 핀테크 --since 2026-09      # 지난달 이후 핀테크 미발송 리드 상위 20
+    python leads.py --stage "Series A,Seed" --priority High --cursor 65:123
+    python leads.py --all --until 2026-06                           # 발송한 리드 포함
+"""
+import argparse
+
+import numpy as np
+
+import migrate
+from db import get_conn
+from scoring import _parse_day
+
+QUERY = '''
+SELECT m.company_id, r.company_name, r.industry, r.funding_stage, r.funding_date,
+       m.total_score, s.funding_score, s.hiring_score, s.recency_score, m.priority, m.is_sent, m.sales_hook
+FROM sales_mart m
+JOIN raw_company_data r ON r.id = m.company_id
+LEFT JOIN signal_scores s ON s.company_id = m.company_id
+'''
+FIELDS = ('company_id', 'company_name', 'industry', 'funding_stage', 'funding_date',
+          'total_score', 'funding_score', 'hiring_score', 'recency_score', 'priority', 'is_sent', 'sales_hook')
+
+
+def parse_cursor(cursor):
+    """'점수:회사id' -> (score, company_id)"""
+    try:
+        score, company_id = cursor.split(':')
+        return int(score), int(company_id)
+    except (AttributeError, ValueError):
+        raise ValueError(f"invalid cursor: {cursor!r} (expected 'score:company_id')")
+
+
+def _day(value, end=False):
+    """'YYYY-MM-DD' / 'YYYY-MM' -> 'YYYY-MM-DD'. end=True면 'YYYY-MM'은 그 달의 마지막 날."""
+    day = _parse_day(value)
+    if day is None:
+        raise ValueError(f"invalid date: {value!r} (expected YYYY-MM or YYYY-MM-DD)")
+    if end and len(value.strip()) == 7:
+        day = str(np.datetime64(value.strip(), 'M') + 1 - np.timedelta64(1, 'D'))
+    return day
+
+
+def _in(column, values):
+    return f"{column} IN ({','.join('?' * len(values))})", list(values)
+
+
+def top_leads(limit=20, industry=None, stage=None, since=None, until=None, priority=None,
+              include_sent=False, cursor=None, conn=None):
+    """점수 순 리드 한 페이지.
+
+    industry/stage/priority: 문자열 하나 또는 리스트(IN). since/until: 펀딩일 범위(YYYY-MM / YYYY-MM-DD, 양끝 포함).
+    include_sent=False면 미발송(is_sent=0)만. cursor: 이전 페이지의 next_cursor.
+    반환: (rows, next_cursor) - rows는 dict 리스트, 다음 페이지가 없으면 next_cursor는 None
+    """
+    conn = conn or get_conn()
+    migrate.upgrade(conn)
+    where, params = [], []
+    if not include_sent:
+        where.append("m.is_sent = 0")
+    for column, value in (('r.industry', industry), ('r.funding_stage', stage), ('m.priority', priority)):
+        if value:
+            clause, values = _in(column, [value] if isinstance(value, str) else value)
+            where.append(clause)
+            params += values
+    if since:
+        where.append("r.funding_day >= ?")
+        params.append(_day(since))
+    if until:
+        where.append("r.funding_day <= ?")
+        params.append(_day(until, end=True))
+    if cursor:
+        score, company_id = parse_cursor(cursor)
+        # 범위 조건(total_score <= ?)으로 두어야 인덱스에서 커서 위치부터 바로 읽음
+        where.append("m.total_score <= ? AND (m.total_score < ? OR m.company_id > ?)")
+        params += [score, score, company_id]
+
+    sql = QUERY + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY m.total_score DESC, m.company_id LIMIT ?"
+    rows = conn.execute(sql, params + [limit + 1]).fetchall()
+    rows = [dict(zip(FIELDS, r)) for r in rows]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = f"{rows[-1]['total_score']}:{rows[-1]['company_id']}"
+    return rows, next_cursor
+
+
+def _split(value):
+    return [v.strip() for v in value.split(',') if v.strip()] if value else None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rank sales leads by score (top-K with cursor pagination)')
+    parser.add_argument('--limit', type=int, default=20, help='Leads per page')
+    parser.add_argument('--industry', type=str, help='Comma-separated list of industries')
+    parser.add_argument('--stage', type=str, help='Comma-separated list of funding stages')
+    parser.add_argument('--priority', type=str, help='Comma-separated list of priorities (e.g. High)')
+    parser.add_argument('--since', type=str, help='Funding date from (YYYY-MM or YYYY-MM-DD)')
+    parser.add_argument('--until', type=str, help='Funding date until, inclusive (YYYY-MM or YYYY-MM-DD)')
+    parser.add_argument('--all', action='store_true', help='Include leads already sent')
+    parser.add_argument('--cursor', type=str, help='next_cursor printed by the previous page')
+    args = parser.parse_args()
+
+    try:
+        rows, next_cursor = top_leads(args.limit, _split(args.industry), _split(args.stage), args.since, args.until,
+                                      _split(args.priority), args.all, args.cursor)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"\n=== 리드 {len(rows)}개 ===")
+    for i, r in enumerate(rows, 1):
+        sent = ' (발송)' if r['is_sent'] else ''
+        print(f"{i:3}. {r['company_name']} (id={r['company_id']}) {r['total_score']}점{sent}"
+              f" - {r['industry'] or '-'} / {r['funding_stage'] or '-'} / {r['funding_date'] or '-'} / {r['priority']}")
+    if next_cursor:
+        print(f"\n다음 페이지: --cursor {next_cursor}")
@@ -0,0 +1,454 @@
+"""버전 기반 스키마 마이그레이션 (비파괴).
+
+DB의 PRAGMA user_version에 마지막으로 적용한 버전을 기록하고, 그보다 새로운 MIGRATIONS만
+순서대로 각각 한 트랜잭션으로 적용합니다. 테이블/컬럼은 지우지 않지만, UNIQUE 인덱스를 만들기 전에
+중복 행은 정리합니다(signal_scores/sales_mart는 회사별 마지막 행, news/jobs는 같은 회사+URL/제목의 첫 행만 남김).
+지운 행 수는 테이블별로 출력합니다.
+
+    python migrate.py            # 최신 버전까지 적용
+    python migrate.py --status   # 현재 버전과 대기 중인 마이그레이션 출력
+
+새 마이그레이션은 MIGRATIONS 끝에 (버전, 설명, 함수)로 추가합니다. 함수는 cursor를 받고,
+이미 적용된 DB(수동으로 컬럼을 추가한 DB 등)에서 다시 실행돼도 안전해야 합니다.
+"""
+import argparse
+import sqlite3
+
+import freshness
+from utils import company_key
+from db import get_conn, transaction, DB_PATH
+
+
+def _columns(cur, table):
+    return [r[1] for r in cur.execute(f"PRAGMA table_info({table})")]
+
+
+def _add_column(cur, table, column, decl):
+    if column not in _columns(cur, table):
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _delete_duplicates(cur, table, sql):
+    """중복 정리 DELETE를 실행하고 지운 행 수를 출력합니다."""
+    n = cur.execute(sql).rowcount
+    if n > 0:
+        print(f"마이그레이션: {table} 중복 {n}행 삭제")
+    return n
+
+
+def _ensure_company_key(cur, table):
+    """예전 스키마(company_id에 PK 없음)면 중복을 정리하고 UNIQUE 인덱스를 만들어
+    INSERT OR REPLACE / OR IGNORE가 회사당 한 행으로 동작하게 합니다."""
+    pk = [r[1] for r in cur.execute(f"PRAGMA table_info({table})") if r[5]]
+    if pk == ['company_id']:
+        return
+    _delete_duplicates(cur, table, f"DELETE FROM {table} WHERE rowid NOT IN (SELECT MAX(rowid) FROM {table} GROUP BY company_id)")
+    cur.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{table}_company ON {table}(company_id)")
+
+
+def _m001_base_schema(cur):
+    # 1. Raw Layer
+    cur.execute('''
+    CREATE TABLE IF NOT EXISTS raw_company_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_name TEXT NOT NULL,
+        source TEXT,
+        funding_stage TEXT,
+        funding_round TEXT,
+        funding_date TEXT,
+        amount TEXT,
+        investors TEXT,
+        industry TEXT,
+        keywords TEXT,
+        required_roles TEXT,
+        job_roles TEXT,
+        news_title TEXT,
+        collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    # 예전 스키마에 없던 컬럼 + init_db.py 밖에서 수동으로 추가되던 컬럼
+    for column in ('funding_round', 'amount', 'investors', 'industry', 'keywords', 'required_roles'):
+        _add_column(cur, 'raw_company_data', column, 'TEXT')
+    _add_column(cur, 'raw_company_data', 'founded_date', 'TEXT')
+    _add_column(cur, 'raw_company_data', 'employee_count', 'TEXT')
+    _add_column(cur, 'raw_company_data', 'last_enrich_date', 'TEXT')
+
+    # 2. Signal Layer
+    cur.execute('''
+    CREATE TABLE IF NOT EXISTS signal_scores (
+        company_id INTEGER PRIMARY KEY,
+        funding_score INTEGER DEFAULT 0,
+        hiring_score INTEGER DEFAULT 0,
+        recency_score INTEGER DEFAULT 0,
+        total_score INTEGER DEFAULT 0,
+        FOREIGN KEY(company_id) REFERENCES raw_company_data(id)
+    )
+    ''')
+    _ensure_company_key(cur, 'signal_scores')
+
+    # 3. Mart Layer
+    cur.execute('''
+    CREATE TABLE IF NOT EXISTS sales_mart (
+        company_id INTEGER PRIMARY KEY,
+        priority TEXT DEFAULT 'Low',
+        sales_hook TEXT,
+        is_sent BOOLEAN DEFAULT 0,
+        FOREIGN KEY(company_id) REFERENCES raw_company_data(id)
+    )
+    ''')
+    _ensure_company_key(cur, 'sales_mart')
+
+    # 4. News / 5. Jobs (structured storage)
+    cur.execute('''
+    CREATE TABLE IF NOT EXISTS news (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_id INTEGER,
+        title TEXT,
+        content TEXT,
+        url TEXT,
+        published_at TEXT,
+        source_name TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(company_id) REFERENCES raw_company_data(id)
+    )
+    ''')
+    cur.execute('''
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_id INTEGER,
+        title TEXT,
+        team TEXT,
+        link TEXT,
+        source TEXT,
+        collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY(company_id) REFERENCES raw_company_data(id)
+    )
+    ''')
+
+    # 6. Processed periods to avoid re-processing same month
+    cur.execute('''
+    CREATE TABLE IF NOT EXISTS processed_periods (
+        period TEXT PRIMARY KEY,
+        processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    # 7. 관심 회사 목록
+    cur.execute('''
+    CREATE TABLE IF NOT EXISTS interested_companies (
+        company_name TEXT PRIMARY KEY,
+        industry TEXT,
+        priority INTEGER DEFAULT 1
+    )
+    ''')
+
+
+def _m002_enrich_freshness(cur):
+    freshness.ensure_table(cur)
+
+
+def _m003_indexes(cur):
+    # UNIQUE 인덱스를 만들기 전에 중복 행은 가장 먼저 들어간 행만 남깁니다.
+    _delete_duplicates(cur, 'news', "DELETE FROM news WHERE id NOT IN (SELECT MIN(id) FROM news GROUP BY company_id, url)")
+    _delete_duplicates(cur, 'jobs', "DELETE FROM jobs WHERE id NOT IN (SELECT MIN(id) FROM jobs GROUP BY company_id, title)")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_news_company ON news(company_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_jobs_company ON jobs(company_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_raw_industry_funding ON raw_company_data(industry, funding_date)")
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_news_company_url ON news(company_id, url)")
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_jobs_company_title ON jobs(company_id, title)")
+
+
+def _m004_normalized_name(cur):
+    _add_column(cur, 'raw_company_data', 'normalized_name', 'TEXT')
+    # 백필: 정규화 결과가 겹치는 회사는 가장 먼저 저장된 행(id 최소)만 키를 갖습니다.
+    seen = set()
+    updates = []
+    for cid, name in cur.execute("SELECT id, company_name FROM raw_company_data ORDER BY id").fetchall():
+        key = company_key(name)
+        if key in seen:
+            key = None
+        if key is not None:
+            seen.add(key)
+        updates.append((key, cid))
+    cur.executemany("UPDATE raw_company_data SET normalized_name = ? WHERE id = ?", updates)
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_raw_normalized_name ON raw_company_data(normalized_name)")
+
+
+def _m005_content_hash(cur):
+    # NULL이면 upsert가 처음 비교할 때 저장된 행으로 계산합니다.
+    _add_column(cur, 'raw_company_data', 'content_hash', 'TEXT')
+
+
+FTS_TABLES = {
+    # fts 테이블: (원본 테이블, 색인 컬럼)
+    'news_fts': ('news', ('title', 'content')),
+    'jobs_fts': ('jobs', ('title', 'team')),
+}
+
+
+def _m006_fts(cur):
+    """news/jobs 전문 검색용 FTS5(trigram) 외부 콘텐츠 테이블 + 동기화 트리거.
+
+    trigram 토크나이저는 형태소 분석 없이 3글자 단위로 색인해 한국어 부분 문자열 검색이 됩니다.
+    FTS5가 없는 SQLite에서는 건너뛰며(search.py가 LIKE 검색으로 대신), 나중에 FTS5가 있는 SQLite로
+    upgrade()를 부르면 _retry_fts가 색인을 만듭니다.
+    """
+    for fts, (table, cols) in FTS_TABLES.items():
+        col_list = ', '.join(cols)
+        new_vals = ', '.join(f"new.{c}" for c in cols)
+        old_vals = ', '.join(f"old.{c}" for c in cols)
+        try:
+            cur.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({col_list}, content='{table}', content_rowid='id', tokenize='trigram')")
+        except sqlite3.OperationalError as e:
+            print(f"FTS5 사용 불가, 전문 검색 색인 생략: {e}")
+            return
+        cur.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals});
+        END""")
+        cur.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals});
+        END""")
+        cur.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE OF {col_list} ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals});
+            INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals});
+        END""")
+        cur.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def _fts5_available(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        return False
+    conn.execute("DROP TABLE temp._fts5_probe")
+    return True
+
+
+_fts_checked = set()
+
+
+def _retry_fts(conn):
+    """6번을 FTS5가 없는 SQLite에서 적용해 색인이 빠진 DB면, FTS5를 쓸 수 있게 됐을 때 다시 만듭니다.
+    (버전은 이미 올라가 있으므로 upgrade()가 DB 파일별로 프로세스당 한 번 확인)"""
+    path = conn.execute("PRAGMA database_list").fetchone()[2]
+    if path in _fts_checked or current_version(conn) < 6:
+        return
+    _fts_checked.add(path)
+    names = set(r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'"))
+    if all(fts in names for fts in FTS_TABLES) or not _fts5_available(conn):
+        return
+    with transaction(conn) as cur:
+        _m006_fts(cur)
+    print("마이그레이션 6 보완: 전문 검색 색인 생성")
+
+
+def _m007_maintenance_log(cur):
+    # retention.run_scheduled()가 작업별 마지막 실행 시각을 기록
+    cur.execute('''
+    CREATE TABLE IF NOT EXISTS maintenance_log (
+        task TEXT PRIMARY KEY,
+        last_run TEXT NOT NULL
+    )
+    ''')
+
+
+SCORE_COLUMNS = ('funding_score', 'hiring_score', 'recency_score', 'total_score')
+
+
+def _m008_score_history(cur):
+    """signal_scores_history: 점수 구성요소가 바뀔 때만 한 행.
+
+    signal_scores의 INSERT(INSERT OR REPLACE, process_scoring의 삭제 후 재삽입 포함)와 UPDATE마다
+    트리거가 회사의 마지막 기록과 비교해 다를 때만 새 행을 남깁니다. 기존 점수는 현재 시각으로 시드합니다.
+    """
+    cur.execute('''
+    CREATE TABLE IF NOT EXISTS signal_scores_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_id INTEGER NOT NULL,
+        funding_score INTEGER,
+        hiring_score INTEGER,
+        recency_score INTEGER,
+        total_score INTEGER,
+        as_of TEXT NOT NULL,
+        FOREIGN KEY(company_id) REFERENCES raw_company_data(id)
+    )
+    ''')
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_score_hist_company_asof ON signal_scores_history(company_id, as_of)")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_score_hist_asof ON signal_scores_history(as_of)")
+    cols = ', '.join(SCORE_COLUMNS)
+    new_vals = ', '.join(f"new.{c}" for c in SCORE_COLUMNS)
+    same = ' AND '.join(f"{c} IS new.{c}" for c in SCORE_COLUMNS)
+    for event in ('INSERT', 'UPDATE'):
+        cur.execute(f"""CREATE TRIGGER IF NOT EXISTS signal_scores_hist_{event.lower()} AFTER {event} ON signal_scores
+        WHEN NOT EXISTS (
+            SELECT 1 FROM (SELECT {cols} FROM signal_scores_history WHERE company_id = new.company_id
+                           ORDER BY as_of DESC, id DESC LIMIT 1)
+            WHERE {same}
+        )
+        BEGIN
+            INSERT INTO signal_scores_history (company_id, {cols}, as_of)
+            VALUES (new.company_id, {new_vals}, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'));
+        END""")
+    cur.execute(f"""INSERT INTO signal_scores_history (company_id, {cols}, as_of)
+        SELECT s.company_id, {', '.join('s.' + c for c in SCORE_COLUMNS)}, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')
+        FROM signal_scores s
+        WHERE NOT EXISTS (SELECT 1 FROM signal_scores_history h WHERE h.company_id = s.company_id)""")
+
+
+# 점수 입력이 바뀌면 회사를 score_dirty에 표시하는 트리거: (테이블, 이벤트, 회사 id 식)
+DIRTY_TRIGGERS = [
+    ('raw_company_data', 'INSERT', 'new.id'),
+    ('raw_company_data', 'UPDATE OF funding_stage, funding_date, job_roles', 'new.id'),
+    ('jobs', 'INSERT', 'new.company_id'),
+    ('jobs', 'UPDATE', 'new.company_id'),
+    ('jobs', 'DELETE', 'old.company_id'),
+    ('news', 'INSERT', 'new.company_id'),
+    ('news', 'UPDATE', 'new.company_id'),
+    ('news', 'DELETE', 'old.company_id'),
+]
+
+
+def _m009_score_dirty(cur):
+    """score_dirty: 마지막 스코어링 이후 입력이 바뀐 회사 (scoring.rescore_pending이 이것만 다시 계산).
+
+    scoring_state: 마지막 실행의 설정 해시/기준일. 해시가 다르면 전체 재계산합니다.
+    기존 DB는 scoring_state가 비어 있으므로 첫 실행이 전체 재계산이 됩니다.
+    """
+    cur.execute('''
+    CREATE TABLE IF NOT EXISTS score_dirty (
+        company_id INTEGER PRIMARY KEY,
+        marked_at TEXT NOT NULL
+    )
+    ''')
+    cur.execute('''
+    CREATE TABLE IF NOT EXISTS scoring_state (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    ''')
+    # 최신성 경계(기준일 - recency_days)에 걸친 회사를 찾을 때 사용 (10에서 funding_day 인덱스로 대체)
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_raw_funding_date ON raw_company_data(funding_date)")
+    for table, event, company_id in DIRTY_TRIGGERS:
+        kind = event.split()[0].lower()
+        cur.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_dirty_{kind} AFTER {event} ON {table}
+        WHEN {company_id} IS NOT NULL
+        BEGIN
+            INSERT OR REPLACE INTO score_dirty (company_id, marked_at)
+            VALUES ({company_id}, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'));
+        END""")
+
+
+def funding_day_sql(col):
+    """funding_date 식 -> 'YYYY-MM-DD' 또는 NULL ('YYYY-MM'은 1일, 없는 날짜는 NULL). scoring._parse_day와 같은 규칙."""
+    d = f"trim({col})"
+    day = (f"(CASE WHEN {d} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]' THEN {d} "
+           f"WHEN {d} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]' THEN {d} || '-01' END)")
+    return f"(CASE WHEN date(julianday({day})) = {day} THEN {day} END)"
+
+
+def _m010_funding_day(cur):
+    """raw_company_data.funding_day: 파싱된 펀딩 날짜(최신성 점수/증분 경계 계산용), 트리거로 동기화."""
+    _add_column(cur, 'raw_company_data', 'funding_day', 'TEXT')
+    cur.execute(f"UPDATE raw_company_data SET funding_day = {funding_day_sql('funding_date')}")
+    for event in ('INSERT', 'UPDATE OF funding_date'):
+        kind = event.split()[0].lower()
+        cur.execute(f"""CREATE TRIGGER IF NOT EXISTS raw_company_data_funding_day_{kind} AFTER {event} ON raw_company_data
+        BEGIN
+            UPDATE raw_company_data SET funding_day = {funding_day_sql('new.funding_date')} WHERE id = new.id;
+        END""")
+    cur.execute("DROP INDEX IF EXISTS ix_raw_funding_date")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_raw_funding_day ON raw_company_data(funding_day)")
+
+
+def _m011_lead_ranking(cur):
+    """리드 순위 조회(leads.py)용 인덱스.
+
+    sales_mart.total_score: signal_scores.total_score 복사본(트리거로 동기화) - (is_sent, total_score DESC, company_id)
+    인덱스 하나로 '미발송 리드 점수 순 상위 K개'를 정렬 없이 K행만 읽습니다.
+    raw_company_data(industry, funding_day): 업종 + 펀딩 기간 필터용.
+    """
+    _add_column(cur, 'sales_mart', 'total_score', 'INTEGER NOT NULL DEFAULT 0')
+    cur.execute("UPDATE sales_mart SET is_sent = 0 WHERE is_sent IS NULL")
+    cur.execute("""UPDATE sales_mart SET total_score = COALESCE(
+        (SELECT s.total_score FROM signal_scores s WHERE s.company_id = sales_mart.company_id), 0)""")
+    for event in ('INSERT', 'UPDATE OF total_score'):
+        kind = event.split()[0].lower()
+        cur.execute(f"""CREATE TRIGGER IF NOT EXISTS signal_scores_mart_{kind} AFTER {event} ON signal_scores
+        BEGIN
+            UPDATE sales_mart SET total_score = COALESCE(new.total_score, 0)
+            WHERE company_id = new.company_id AND total_score IS NOT COALESCE(new.total_score, 0);
+        END""")
+    cur.execute("""CREATE TRIGGER IF NOT EXISTS sales_mart_score_insert AFTER INSERT ON sales_mart
+        BEGIN
+            UPDATE sales_mart SET total_score = COALESCE(
+                (SELECT s.total_score FROM signal_scores s WHERE s.company_id = new.company_id), 0)
+            WHERE company_id = new.company_id;
+        END""")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_mart_sent_score ON sales_mart(is_sent, total_score DESC, company_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_raw_industry_funding_day ON raw_company_data(industry, funding_day)")
+
+
+MIGRATIONS = [
+    (1, 'base schema (raw/signal/mart/news/jobs/periods) + founded_date/employee_count/last_enrich_date', _m001_base_schema),
+    (2, 'enrich_freshness', _m002_enrich_freshness),
+    (3, 'indexes: news/jobs(company_id), raw(industry, funding_date); unique news(company_id, url), jobs(company_id, title)', _m003_indexes),
+    (4, 'raw_company_data.normalized_name (backfill) + unique index', _m004_normalized_name),
+    (5, 'raw_company_data.content_hash', _m005_content_hash),
+    (6, 'FTS5 trigram index: news(title, content), jobs(title, team) + sync triggers', _m006_fts),
+    (7, 'maintenance_log (retention/vacuum/analyze schedule)', _m007_maintenance_log),
+    (8, 'signal_scores_history (change-only rows via triggers) + (company_id, as_of) index', _m008_score_history),
+    (9, 'score_dirty (marked by raw/jobs/news triggers) + scoring_state (config hash)', _m009_score_dirty),
+    (10, 'raw_company_data.funding_day (parsed funding_date, trigger-synced) + index', _m010_funding_day),
+    (11, 'sales_mart.total_score (synced from signal_scores) + (is_sent, total_score) and raw(industry, funding_day) indexes', _m011_lead_ranking),
+]
+LATEST = MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending(conn):
+    version = current_version(conn)
+    return [m for m in MIGRATIONS if m[0] > version]
+
+
+def upgrade(conn, verbose=False):
+    """대기 중인 마이그레이션을 적용하고 적용한 개수를 반환합니다. 최신이면 바로 반환합니다.
+
+    마이그레이션마다 db.transaction()으로 적용합니다. 호출자의 트랜잭션이 열려 있으면 커밋하지 않고
+    그 안에 SAVEPOINT로 중첩되며, 바깥 트랜잭션이 커밋될 때 함께 확정됩니다.
+    """
+    todo = pending(conn)
+    if not todo:
+        _retry_fts(conn)
+        return 0
+    applied = 0
+    for version, desc, fn in todo:
+        with transaction(conn) as cur:
+            # 다른 프로세스가 먼저 적용했으면 건너뜀
+            if current_version(conn) >= version:
+                continue
+            fn(cur)
+            cur.execute(f"PRAGMA user_version = {int(version)}")
+        applied += 1
+        if verbose:
+            print(f"마이그레이션 {version} 적용: {desc}")
+    _retry_fts(conn)
+    return applied
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Apply schema migrations (keeps tables/columns, removes duplicate rows before unique indexes)')
+    parser.add_argument('--status', action='store_true', help='Show current version and pending migrations only')
+    args = parser.parse_args()
+
+    conn = get_conn()
+    if args.status:
+        print(f"{DB_PATH}: version {current_version(conn)} / latest {LATEST}")
+        for version, desc, _ in pending(conn):
+            print(f"  대기: {version} {desc}")
+    else:
+        n = upgrade(conn, verbose=True)
+        print(f"✅ 스키마 버전 {current_version(conn)} ({n}개 적용)")
+    conn.close()
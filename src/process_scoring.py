@@ -1,76 +1,27 @@
-import sqlite3
-from db import get_conn
-import json
-import os
-
-# 설정 파일 경로
-CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'scoring_config.json')
+import argparse
 
-def load_scoring_config():
-    if os.path.exists(CONFIG_PATH):
-        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {
-        "funding_weights": {"Series A": 30, "Seed": 10},
-        "job_keywords": {"세일즈": 25, "영업": 25, "마케터": 20, "마케팅": 20},
-        "recency_days": 30,
-        "recency_score": 10
-    }
-
-def calculate_score(row, config):
-    # row: (id, company_name, funding_stage, funding_date, job_roles)
-    score = 0
-    
-    # 투자 점수
-    funding_stage = row[2] or ""
-    score += config["funding_weights"].get(funding_stage, 0)
-        
-    # 채용 점수
-    jobs = row[4] or ""
-    for keyword, points in config["job_keywords"].items():
-        if keyword in jobs:
-            score += points
-        
-    # 최신성 점수
-    if row[3] and f"2025-{config['recency_days']//30:02d}" in row[3]:
-        score += config["recency_score"]
-        
-    return score
+from db import get_conn
+import migrate
+import scoring
 
-conn = get_conn()
-cursor = conn.cursor()
+# 점수 재계산: 지난 실행 이후 입력이 바뀐 회사만(score_dirty) 열 단위로 계산해
+# signal_scores(funding/hiring/recency/total)와 sales_mart(High)를 한 트랜잭션으로 갱신.
+# scoring_config.json이 바뀌었으면(설정 해시) 또는 --full이면 전체 재계산.
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rescore companies whose inputs changed since the last run')
+    parser.add_argument('--full', action='store_true', help='Rescore every company')
+    args = parser.parse_args()
 
-config = load_scoring_config()
+    conn = get_conn()
+    migrate.upgrade(conn)
 
-# Raw 데이터 가져오기
-cursor.execute("SELECT id, company_name, funding_stage, funding_date, job_roles FROM raw_company_data")
-rows = cursor.fetchall()
+    print("🧮 스코어링 분석 시작...")
 
-print("🧮 스코어링 분석 시작...")
+    result = scoring.rescore_pending(conn, scoring.plan(), full=args.full)
+    print(f"{'전체' if result['mode'] == 'full' else '증분'} 재계산: {result['scored']}개 회사")
 
-for row in rows:
-    company_id = row[0]
-    company_name = row[1]
-    
-    # 점수 계산 함수 호출
-    total_score = calculate_score(row, config)
-    
-    # Signal 테이블에 저장 (이미 있으면 업데이트 로직 필요하나 여기선 생략)
-    # 간단하게 삭제 후 재입력 방식 사용
-    cursor.execute("DELETE FROM signal_scores WHERE company_id = ?", (company_id,))
-    cursor.execute('''
-    INSERT INTO signal_scores (company_id, total_score)
-    VALUES (?, ?)
-    ''', (company_id, total_score))
-    
-    # Mart(타겟팅) 조건: 50점 이상이면 High Priority
-    priority = "Low"
-    if total_score >= 50:
-        priority = "High"
+    # Mart(타겟팅) 조건: high_priority_score(기본 50점) 이상이면 High Priority
+    for company_id, company_name, total_score in result['targets']:
         print(f"🎯 [TARGET] {company_name} (점수: {total_score}) -> 영업팀 전달 대상!")
-        
-        # Mart 테이블에 적재
-        cursor.execute("INSERT OR IGNORE INTO sales_mart (company_id, priority) VALUES (?, ?)", (company_id, priority))
 
-conn.commit()
-conn.close()
\ No newline at end of file
+    conn.close()
@@ -0,0 +1,111 @@
+"""호스트별 토큰 버킷 요청 스케줄러.
+
+고정 sleep 대신 호스트마다 초당 요청 수(rate)와 순간 허용량(burst)을 지킵니다.
+서로 다른 호스트는 서로를 기다리지 않으며, 429/Retry-After를 받으면 해당 호스트만
+지정된 시간 동안 멈춥니다. http_client가 네트워크 요청 직전에 acquire()를 호출합니다.
+"""
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+# 호스트: (초당 요청 수, burst)
+DEFAULT_RATE = (5.0, 5)
+HOST_RATES = {
+    'startuprecipe.co.kr': (1.0, 2),
+    'thevc.kr': (1.0, 1),
+    'koreatechdesk.com': (1.0, 1),
+    'search.naver.com': (5.0, 5),
+    'www.wanted.co.kr': (3.0, 3),
+    'www.saramin.co.kr': (3.0, 3),
+    'newsapi.org': (2.0, 2),
+}
+# Retry-After가 없는 429에 적용할 기본 대기(초)
+DEFAULT_PENALTY = 5.0
+MAX_PENALTY = 300.0
+
+
+class TokenBucket:
+    """rate(초당 토큰)로 채워지고 최대 burst개까지 쌓이는 버킷. 스레드 안전."""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """토큰 1개를 예약하고, 호출자가 기다려야 할 시간(초)을 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = max(self.blocked_until - now, 0.0)
+            self.tokens -= 1
+            if self.tokens < 0:
+                wait = max(wait, -self.tokens / self.rate)
+            return wait
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def block_for(self, seconds):
+        """seconds 동안 새 요청을 내보내지 않습니다(429 대응)."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = min(self.tokens, 0.0)
+
+
+class HostScheduler:
+    def __init__(self, host_rates=None, default_rate=DEFAULT_RATE):
+        self.host_rates = dict(HOST_RATES if host_rates is None else host_rates)
+        self.default_rate = default_rate
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host):
+        with self._lock:
+            b = self._buckets.get(host)
+            if b is None:
+                b = TokenBucket(*self.host_rates.get(host, self.default_rate))
+                self._buckets[host] = b
+            return b
+
+    def configure(self, host_rates=None, default_rate=None):
+        with self._lock:
+            if host_rates:
+                self.host_rates.update(host_rates)
+            if default_rate:
+                self.default_rate = default_rate
+            self._buckets.clear()
+
+    def acquire(self, host):
+        """host에 요청을 보내도 될 때까지 기다립니다. 기다린 시간(초)을 반환합니다."""
+        return self.bucket(host).acquire()
+
+    def penalize(self, host, seconds):
+        self.bucket(host).block_for(min(max(seconds, 0.0), MAX_PENALTY))
+
+
+def parse_retry_after(value, default=DEFAULT_PENALTY):
+    """Retry-After 헤더(초 또는 HTTP-date)를 초 단위로 변환합니다."""
+    if not value:
+        return default
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return max((dt - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+scheduler = HostScheduler()
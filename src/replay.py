@@ -0,0 +1,162 @@
+"""HTTP 응답 녹화(record) / 재생(replay) 레이어.
+
+네트워크 없이 수집/엔리치 경로를 결정적으로 실행하기 위한 도구입니다.
+  - record: http_client.get이 돌려준 응답을 fixture 파일(JSON)로 저장
+  - replay: 모든 세션에 ReplayAdapter를 붙여 fixture에서 응답을 돌려줌
+            (fixture가 없으면 ConnectionError, 선택적으로 지연 주입)
+
+환경 변수로도 켤 수 있어 기존 스크립트를 그대로 사용할 수 있습니다.
+    MST_HTTP_MODE=record|replay
+    MST_FIXTURES_DIR=<경로>       (기본: <repo>/fixtures/http)
+    MST_REPLAY_LATENCY_MS=<밀리초> (replay 시 응답마다 지연)
+
+    MST_HTTP_MODE=record python ingest_startuprecipe.py --year 2025 --start-month 1 --end-month 1
+    MST_HTTP_MODE=replay python ingest_startuprecipe.py --year 2025 --start-month 1 --end-month 1
+    python replay.py --list
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from db import BASE_DIR
+from http_cache import cache_key
+
+MODES = ('record', 'replay')
+_UNSET = object()
+
+
+def _check_mode(mode, source='replay mode'):
+    if mode is not None and mode not in MODES:
+        raise ValueError(f"unknown {source}: {mode!r} (expected one of {', '.join(MODES)})")
+    return mode
+
+
+_mode = _check_mode(os.environ.get('MST_HTTP_MODE') or None, 'MST_HTTP_MODE')
+_fixtures_dir = os.environ.get('MST_FIXTURES_DIR') or os.path.join(BASE_DIR, 'fixtures', 'http')
+_latency = float(os.environ.get('MST_REPLAY_LATENCY_MS') or 0) / 1000.0
+_lock = threading.Lock()
+
+
+def configure(mode=_UNSET, fixtures_dir=None, latency_ms=None):
+    """mode: 'record' | 'replay' | None(끄기), 생략하면 현재 모드 유지. http_client 세션보다 먼저 호출하세요."""
+    global _mode, _fixtures_dir, _latency
+    if mode is not _UNSET:
+        _mode = _check_mode(mode)
+    if fixtures_dir:
+        _fixtures_dir = fixtures_dir
+    if latency_ms is not None:
+        _latency = latency_ms / 1000.0
+
+
+def is_recording():
+    return _mode == 'record'
+
+
+def is_replaying():
+    return _mode == 'replay'
+
+
+def fixture_path(url):
+    key = cache_key(url)
+    host = urlsplit(key).netloc or '_'
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+    return os.path.join(_fixtures_dir, host.replace(':', '_'), f"{digest}.json")
+
+
+def record(url, resp):
+    """응답을 fixture로 저장합니다. 같은 URL은 덮어씁니다."""
+    body = resp.content or b''
+    try:
+        text, body_encoding = body.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        text, body_encoding = base64.b64encode(body).decode('ascii'), 'base64'
+    headers = {k: v for k, v in resp.headers.items() if k.lower() not in ('set-cookie', 'content-encoding', 'transfer-encoding', 'content-length')}
+    data = {
+        'url': cache_key(url),
+        'status': resp.status_code,
+        'headers': headers,
+        'encoding': resp.encoding,
+        'body_encoding': body_encoding,
+        'body': text,
+        'recorded_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    path = fixture_path(url)
+    with _lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, path)
+
+
+def load(url):
+    """fixture를 requests.Response로 돌려줍니다. 없으면 None."""
+    path = fixture_path(url)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    body = data['body']
+    r = requests.Response()
+    r.status_code = data['status']
+    r._content = base64.b64decode(body) if data.get('body_encoding') == 'base64' else body.encode('utf-8')
+    r.headers = CaseInsensitiveDict(data.get('headers') or {})
+    r.encoding = data.get('encoding')
+    r.url = url
+    r.reason = 'Replayed'
+    return r
+
+
+def has_host(host):
+    """replay 중 DNS 사전 확인 대용: 해당 호스트의 fixture가 하나라도 있는지."""
+    return os.path.isdir(os.path.join(_fixtures_dir, host.replace(':', '_')))
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests 전송 어댑터: 네트워크 대신 fixture에서 응답을 돌려줍니다."""
+
+    def send(self, request, **kwargs):
+        if _latency:
+            time.sleep(_latency)
+        resp = load(request.url)
+        if resp is None:
+            raise requests.ConnectionError(f"no replay fixture for {request.url}", request=request)
+        resp.request = request
+        return resp
+
+    def close(self):
+        pass
+
+
+def list_fixtures():
+    for root, _, files in os.walk(_fixtures_dir):
+        for name in sorted(files):
+            if not name.endswith('.json'):
+                continue
+            with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            yield data['url'], data['status'], data.get('recorded_at')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Recorded HTTP fixtures')
+    parser.add_argument('--list', action='store_true', help='List recorded fixtures')
+    parser.add_argument('--dir', type=str, help='Fixtures directory')
+    args = parser.parse_args()
+    if args.dir:
+        configure(fixtures_dir=args.dir)
+    n = 0
+    for url, status, recorded_at in list_fixtures():
+        n += 1
+        if args.list:
+            print(f"{status} {recorded_at} {url}")
+    print(f"fixture {n}개 - {_fixtures_dir}")
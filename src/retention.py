@@ -0,0 +1,249 @@
+"""news/jobs 보존 정책, 아카이브, DB 압축.
+
+hot 테이블(news, jobs)에는 회사별 최신 행만 남기고, 나머지는 월(period)별로 묶어
+zlib 압축 JSON으로 아카이브 DB(ARCHIVE_PATH)의 archive_batches 테이블에 옮깁니다.
+  - 회사별 최신 KEEP[kind]['keep']개를 넘는 행
+  - max_age_days보다 오래된 행 (단, 회사별 최신 min_keep개는 요약/점수 계산용으로 항상 유지)
+아카이브를 먼저 커밋한 뒤 hot 행을 지우므로 중간에 실패해도 데이터는 사라지지 않습니다. 아카이브한 행의
+원본 id를 archived_rows에 함께 기록해, 삭제 전에 실패한 뒤 다시 실행해도 같은 행을 두 번 아카이브하지 않습니다.
+
+압축/통계: auto_vacuum=INCREMENTAL(최초 1회 VACUUM으로 전환) 후 incremental_vacuum, ANALYZE.
+run_scheduled()는 maintenance_log를 보고 주기가 지난 작업만 실행합니다(ingest_startuprecipe.py --maintenance 또는 --scheduled).
+
+    python retention.py --dry-run      # 옮길 행 수만 출력
+    python retention.py                # 주기와 무관하게 보존 정책 + 압축 + ANALYZE 실행
+    python retention.py --scheduled    # 주기가 지난 작업만 실행
+    python retention.py --list         # 아카이브 배치 목록
+"""
+import argparse
+import json
+import os
+import zlib
+from datetime import datetime, timedelta
+
+import db
+import migrate
+from db import BASE_DIR, get_conn, transaction
+
+ARCHIVE_PATH = os.path.join(BASE_DIR, "meta_sales_trigger_archive.db")
+
+# kind -> 보존 정책
+KEEP = {
+    'news': {'table': 'news', 'date_col': 'created_at', 'keep': 20, 'min_keep': 5, 'max_age_days': 365},
+    'jobs': {'table': 'jobs', 'date_col': 'collected_at', 'keep': 20, 'min_keep': 5, 'max_age_days': 180},
+}
+
+# 작업 -> 실행 주기
+SCHEDULE = {
+    'retention': timedelta(days=1),
+    'vacuum': timedelta(days=1),
+    'analyze': timedelta(days=7),
+}
+VACUUM_PAGES = 2000  # incremental_vacuum 한 번에 돌려줄 최대 페이지 수 (None이면 전부)
+CHUNK = 500
+TS_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _archive_db():
+    conn = db.connect(ARCHIVE_PATH)
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS archive_batches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        period TEXT NOT NULL,
+        row_count INTEGER NOT NULL,
+        payload BLOB NOT NULL,
+        archived_at TEXT NOT NULL
+    )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_archive_kind_period ON archive_batches(kind, period)")
+    # 원본 행 id -> 배치 (재실행 시 이미 아카이브한 행 건너뜀)
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS archived_rows (
+        kind TEXT NOT NULL,
+        source_id INTEGER NOT NULL,
+        batch_id INTEGER NOT NULL,
+        PRIMARY KEY (kind, source_id)
+    ) WITHOUT ROWID
+    ''')
+    conn.commit()
+    return conn
+
+
+def cold_ids(conn, kind, now=None):
+    """보존 정책상 hot 테이블에서 내보낼 행 id 목록 (회사별 date_col 최신 순으로 순위를 매김)."""
+    p = KEEP[kind]
+    cutoff = ((now or datetime.now()) - timedelta(days=p['max_age_days'])).strftime(TS_FORMAT)
+    rows = conn.execute(f'''
+    SELECT id FROM (
+        SELECT id, {p['date_col']} AS d,
+               ROW_NUMBER() OVER (PARTITION BY company_id ORDER BY {p['date_col']} DESC, id DESC) AS rn
+        FROM {p['table']}
+    )
+    WHERE rn > ? OR (rn > ? AND d < ?)
+    ''', (p['keep'], p['min_keep'], cutoff)).fetchall()
+    return [r[0] for r in rows]
+
+
+def _chunks(seq, size=CHUNK):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+def archive_rows(conn, kind, ids):
+    """ids 행을 월별 압축 배치로 아카이브 DB에 쓰고 hot 테이블에서 지웁니다. 반환: 옮긴 행 수
+
+    이미 archived_rows에 있는 행(이전 실행에서 아카이브만 되고 삭제 전에 실패한 행)은 다시 쓰지 않고 지우기만 합니다.
+    """
+    if not ids:
+        return 0
+    p = KEEP[kind]
+    table = p['table']
+    adb = _archive_db()
+    try:
+        archived = set()
+        for chunk in _chunks(ids):
+            archived.update(r[0] for r in adb.execute(
+                f"SELECT source_id FROM archived_rows WHERE kind = ? AND source_id IN ({','.join('?' * len(chunk))})", [kind] + chunk))
+        todo = [i for i in ids if i not in archived]
+
+        columns = None
+        by_period = {}
+        for chunk in _chunks(todo):
+            cur = conn.execute(f"SELECT * FROM {table} WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            columns = columns or [d[0] for d in cur.description]
+            date_idx = columns.index(p['date_col'])
+            for row in cur:
+                period = (str(row[date_idx])[:7] if row[date_idx] else None) or 'unknown'
+                by_period.setdefault(period, []).append(row)
+
+        now = datetime.now().strftime(TS_FORMAT)
+        id_idx = columns.index('id') if columns else 0
+        for period, rows in sorted(by_period.items()):
+            payload = zlib.compress(json.dumps({'columns': columns, 'rows': rows}, ensure_ascii=False, default=str).encode('utf-8'), 9)
+            batch_id = adb.execute(
+                "INSERT INTO archive_batches (kind, period, row_count, payload, archived_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, period, len(rows), payload, now)).lastrowid
+            adb.executemany("INSERT INTO archived_rows (kind, source_id, batch_id) VALUES (?, ?, ?)",
+                            [(kind, row[id_idx], batch_id) for row in rows])
+        adb.commit()
+    finally:
+        adb.close()
+
+    with transaction(conn) as cur:
+        for chunk in _chunks(ids):
+            cur.execute(f"DELETE FROM {table} WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+    return len(ids)
+
+
+def apply_retention(conn=None, kinds=('news', 'jobs'), dry_run=False):
+    conn = conn or get_conn()
+    migrate.upgrade(conn)
+    result = {}
+    for kind in kinds:
+        ids = cold_ids(conn, kind)
+        result[kind] = len(ids) if dry_run else archive_rows(conn, kind, ids)
+        print(f"{'대상' if dry_run else '아카이브'}: {kind} {result[kind]}행")
+    return result
+
+
+def _require_no_transaction(conn, task):
+    """VACUUM/ANALYZE 전에 호출자의 트랜잭션이 열려 있으면 대신 커밋하지 않고 오류로 알립니다."""
+    if conn.in_transaction or getattr(conn, 'tx_depth', 0):
+        raise RuntimeError(f"{task}: connection has an open transaction; commit or roll it back first")
+
+
+def compact(conn=None, pages=VACUUM_PAGES):
+    """빈 페이지를 파일에서 돌려줍니다. auto_vacuum이 꺼져 있으면 최초 1회 전체 VACUUM으로 INCREMENTAL 전환."""
+    conn = conn or get_conn()
+    _require_no_transaction(conn, 'compact')
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    before = os.path.getsize(db.DB_PATH)
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    else:
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages)})" if pages else "PRAGMA incremental_vacuum")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    after = os.path.getsize(db.DB_PATH)
+    print(f"압축: {before:,} -> {after:,} bytes")
+    return before, after
+
+
+def analyze(conn=None):
+    conn = conn or get_conn()
+    _require_no_transaction(conn, 'analyze')
+    conn.execute("ANALYZE")
+    conn.commit()
+    print("ANALYZE 완료")
+
+
+TASKS = {
+    'retention': lambda conn: apply_retention(conn),
+    'vacuum': lambda conn: compact(conn),
+    'analyze': lambda conn: analyze(conn),
+}
+
+
+def run_scheduled(conn=None, force=False, now=None):
+    """maintenance_log 기준으로 주기가 지난 작업만 실행합니다. 반환: 실행한 작업 이름 리스트"""
+    conn = conn or get_conn()
+    migrate.upgrade(conn)
+    now = now or datetime.now()
+    last = dict(conn.execute("SELECT task, last_run FROM maintenance_log").fetchall())
+    ran = []
+    for task, interval in SCHEDULE.items():
+        if not force and last.get(task) and last[task] > (now - interval).strftime(TS_FORMAT):
+            continue
+        TASKS[task](conn)
+        conn.execute("INSERT OR REPLACE INTO maintenance_log (task, last_run) VALUES (?, ?)", (task, now.strftime(TS_FORMAT)))
+        conn.commit()
+        ran.append(task)
+    return ran
+
+
+def list_archives():
+    adb = _archive_db()
+    try:
+        return adb.execute(
+            "SELECT kind, period, SUM(row_count), SUM(length(payload)), COUNT(*) FROM archive_batches GROUP BY kind, period ORDER BY kind, period").fetchall()
+    finally:
+        adb.close()
+
+
+def iter_archived(kind, period=None):
+    """아카이브된 행을 dict로 돌려줍니다 (period 'YYYY-MM' 지정 가능)."""
+    adb = _archive_db()
+    try:
+        sql = "SELECT payload FROM archive_batches WHERE kind = ?"
+        params = [kind]
+        if period:
+            sql += " AND period = ?"
+            params.append(period)
+        for (payload,) in adb.execute(sql + " ORDER BY id", params).fetchall():
+            data = json.loads(zlib.decompress(payload).decode('utf-8'))
+            for row in data['rows']:
+                yield dict(zip(data['columns'], row))
+    finally:
+        adb.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Retention, archiving and compaction for news/jobs')
+    parser.add_argument('--dry-run', action='store_true', help='Only count rows that would be archived')
+    parser.add_argument('--scheduled', action='store_true', help='Run only tasks whose interval has elapsed')
+    parser.add_argument('--list', action='store_true', help='List archive batches')
+    parser.add_argument('--keep', type=int, help='Override latest rows kept per company (news and jobs)')
+    args = parser.parse_args()
+
+    if args.keep is not None:
+        for p in KEEP.values():
+            p['keep'] = max(args.keep, p['min_keep'])
+    if args.list:
+        for kind, period, rows, size, batches in list_archives():
+            print(f"{kind:5} {period:8} {rows:>7}행 {size:>10,} bytes ({batches}개 배치)")
+    elif args.dry_run:
+        apply_retention(dry_run=True)
+    else:
+        ran = run_scheduled(force=not args.scheduled)
+        print(f"실행한 작업: {', '.join(ran) or '없음'}")
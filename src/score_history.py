@@ -0,0 +1,97 @@
+"""점수 이력(signal_scores_history) 조회.
+
+이력은 migrate.py의 트리거가 signal_scores가 바뀔 때만 기록합니다(변경분만 저장).
+movers()는 기간 시작 시점의 점수와 현재 점수를 비교해 가장 많이 오른(내린) 회사를 찾습니다.
+
+    python score_history.py --days 7            # 이번 주 점수가 가장 많이 오른 회사
+    python score_history.py --days 30 --down    # 30일간 가장 많이 내린 회사
+    python score_history.py --company 망고하다    # 한 회사의 점수 변화
+"""
+import argparse
+from datetime import datetime, timedelta
+
+import migrate
+from db import get_conn, find_company_id
+
+TS_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def movers(days=7, limit=20, direction='up', min_delta=1, include_new=False, now=None, conn=None):
+    """기간(days) 동안 total_score 변화가 큰 회사.
+
+    기준 점수 = 기간 시작 시점(as_of <= start)의 마지막 기록. 기간 안에 처음 생긴 회사는
+    include_new=True일 때만 기준 0으로 포함합니다.
+    direction: 'up'(상승 순) | 'down'(하락 순) | 'both'(절댓값 순)
+    반환: [{'company_id', 'company_name', 'before', 'after', 'delta', 'changed_at'}]
+    """
+    conn = conn or get_conn()
+    migrate.upgrade(conn)
+    start = ((now or datetime.now()) - timedelta(days=days)).strftime(TS_FORMAT)
+    # 기간 안에 기록이 생긴 회사만 후보 -> 회사별 이전/최신 점수는 (company_id, as_of) 인덱스로 조회
+    rows = conn.execute('''
+    SELECT c.company_id, r.company_name,
+           (SELECT total_score FROM signal_scores_history
+            WHERE company_id = c.company_id AND as_of <= ? ORDER BY as_of DESC, id DESC LIMIT 1) AS before,
+           (SELECT total_score FROM signal_scores_history
+            WHERE company_id = c.company_id ORDER BY as_of DESC, id DESC LIMIT 1) AS after,
+           c.changed_at
+    FROM (SELECT company_id, MAX(as_of) AS changed_at FROM signal_scores_history
+          WHERE as_of > ? GROUP BY company_id) c
+    LEFT JOIN raw_company_data r ON r.id = c.company_id
+    ''', (start, start)).fetchall()
+
+    result = []
+    for company_id, name, before, after, changed_at in rows:
+        if before is None:
+            if not include_new:
+                continue
+            before = 0
+        delta = (after or 0) - before
+        if direction == 'up' and delta < min_delta:
+            continue
+        if direction == 'down' and -delta < min_delta:
+            continue
+        if direction == 'both' and abs(delta) < min_delta:
+            continue
+        result.append({'company_id': company_id, 'company_name': name, 'before': before, 'after': after,
+                       'delta': delta, 'changed_at': changed_at})
+    key = {'up': lambda m: -m['delta'], 'down': lambda m: m['delta'], 'both': lambda m: -abs(m['delta'])}[direction]
+    result.sort(key=lambda m: (key(m), m['company_id']))
+    return result[:limit]
+
+
+def history(company_id, conn=None):
+    """한 회사의 점수 변화 [(as_of, funding, hiring, recency, total)] (오래된 순)"""
+    conn = conn or get_conn()
+    migrate.upgrade(conn)
+    return conn.execute(
+        "SELECT as_of, funding_score, hiring_score, recency_score, total_score FROM signal_scores_history "
+        "WHERE company_id = ? ORDER BY as_of, id", (company_id,)).fetchall()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Score history and biggest movers')
+    parser.add_argument('--days', type=int, default=7, help='Window in days')
+    parser.add_argument('--limit', type=int, default=20, help='Max companies')
+    parser.add_argument('--down', action='store_true', help='Biggest drops instead of jumps')
+    parser.add_argument('--both', action='store_true', help='Largest absolute change')
+    parser.add_argument('--min-delta', type=int, default=1, help='Minimum score change')
+    parser.add_argument('--include-new', action='store_true', help='Count companies first scored inside the window (baseline 0)')
+    parser.add_argument('--company', type=str, help='Show score history of one company')
+    args = parser.parse_args()
+
+    if args.company:
+        conn = get_conn()
+        cid = find_company_id(conn.cursor(), args.company)
+        if cid is None:
+            print(f"회사를 찾을 수 없습니다: {args.company}")
+        else:
+            print(f"\n=== {args.company} (id={cid}) 점수 이력 ===")
+            for as_of, f, h, r, t in history(cid, conn):
+                print(f"  {as_of}  total={t} (funding={f}, hiring={h}, recency={r})")
+    else:
+        direction = 'both' if args.both else ('down' if args.down else 'up')
+        rows = movers(args.days, args.limit, direction, args.min_delta, args.include_new)
+        print(f"\n=== 최근 {args.days}일 점수 변화 ({direction}) : {len(rows)}개 ===")
+        for m in rows:
+            print(f"  {m['company_name']} (id={m['company_id']}) {m['before']} -> {m['after']} ({m['delta']:+d})  {m['changed_at']}")
@@ -0,0 +1,250 @@
+"""단일 스코어링 엔진 (열 단위 NumPy 계산).
+
+scoring_config.json을 한 번 컴파일한 읽기 전용 규칙(ScoringPlan)으로 세 구성요소를 계산합니다.
+plan()은 파일이 바뀌면 자동으로 다시 컴파일하므로 오래 떠 있는 프로세스도 최신 설정을 씁니다.
+  - funding_score: funding_weights[funding_stage]
+  - hiring_score : job_roles 텍스트에 포함된 job_keywords 점수 합
+  - recency_score: funding_day(파싱된 funding_date)가 기준일로부터 recency_days일 이내면 recency_score
+  - total_score  : 세 점수의 합 (high_priority_score 이상이면 sales_mart High)
+
+입력은 쿼리 한 번으로 읽고, 모든 회사를 배열로 한꺼번에 계산한 뒤 executemany로 한 트랜잭션에 씁니다.
+store(저장/갱신)와 process_scoring.py 모두 이 모듈을 사용합니다.
+
+증분 재계산(rescore_pending): raw_company_data/jobs/news 트리거가 score_dirty에 표시한 회사와
+지난 실행 이후 최신성 구간 경계를 지난 회사만 다시 계산합니다. 설정 해시(scoring_state)가 바뀌면 전체 재계산.
+"""
+import json
+import os
+import re
+from datetime import date
+from types import MappingProxyType
+
+import numpy as np
+
+from keyword_match import KeywordMatcher
+from utils import content_hash
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'scoring_config.json')
+DEFAULT_CONFIG = {
+    "funding_weights": {"Series A": 30, "Seed": 10},
+    "job_keywords": {"세일즈": 25, "영업": 25, "마케터": 20, "마케팅": 20},
+    "recency_days": 30,
+    "recency_score": 10,
+    "high_priority_score": 50,
+}
+SCORE_FIELDS = ('funding_score', 'hiring_score', 'recency_score', 'total_score')
+CHUNK = 500  # id 목록 조회 시 IN (...) 한 번에 넣을 개수
+
+_DATE_RE = re.compile(r'^(\d{4})-(\d{2})(?:-(\d{2}))?$')
+
+
+def load_config(path=CONFIG_PATH):
+    config = dict(DEFAULT_CONFIG)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+    return config
+
+
+def config_hash(config):
+    return content_hash(config)
+
+
+class ScoringPlan:
+    """설정을 한 번 컴파일한 읽기 전용 규칙.
+
+    stages/stage_weights: 단계 -> 가중치 조회표, keywords/keyword_points: 키워드 열과 점수 벡터,
+    matcher: 키워드 전체를 컴파일한 KeywordMatcher, digest: 설정 해시(증분 재계산 기준).
+    """
+    __slots__ = ('config', 'digest', 'stage_weights', 'keywords', 'keyword_points', 'matcher',
+                 'recency_days', 'recency_score', 'high_priority_score')
+
+    def __init__(self, config):
+        set_ = super().__setattr__
+        set_('config', MappingProxyType(dict(config)))
+        set_('digest', config_hash(config))
+        set_('stage_weights', MappingProxyType({k: int(v) for k, v in config['funding_weights'].items()}))
+        set_('keywords', tuple(config['job_keywords']))
+        points = np.array([int(config['job_keywords'][k]) for k in self.keywords], dtype=np.int64)
+        points.flags.writeable = False
+        set_('keyword_points', points)
+        set_('matcher', KeywordMatcher({k: [k] for k in self.keywords}))
+        set_('recency_days', int(config['recency_days']))
+        set_('recency_score', int(config['recency_score']))
+        set_('high_priority_score', int(config['high_priority_score']))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('ScoringPlan is read-only')
+
+
+_plan_cache = {}  # path -> ((mtime_ns, size), ScoringPlan)
+
+
+def plan(path=CONFIG_PATH):
+    """설정 파일의 컴파일된 규칙. 파일이 바뀌면(mtime/크기) 다음 호출에서 다시 읽습니다."""
+    try:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        stamp = None
+    cached = _plan_cache.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, ScoringPlan(load_config(path)))
+        _plan_cache[path] = cached
+    return cached[1]
+
+
+def _plan(rules):
+    """plan / 설정 dict / None(설정 파일)을 ScoringPlan으로."""
+    if rules is None:
+        return plan()
+    return rules if isinstance(rules, ScoringPlan) else ScoringPlan(rules)
+
+
+def _parse_day(value):
+    """'YYYY-MM-DD' / 'YYYY-MM'(1일로 간주) -> 'YYYY-MM-DD', 형식이 다르거나 없는 날짜면 None.
+    DB에서는 migrate.funding_day_sql이 같은 규칙으로 funding_day 컬럼을 채웁니다."""
+    m = _DATE_RE.match(value.strip()) if value else None
+    if not m:
+        return None
+    day = f"{m.group(1)}-{m.group(2)}-{m.group(3) or '01'}"
+    try:
+        np.datetime64(day, 'D')
+    except ValueError:
+        return None
+    return day
+
+
+def compute(stages, funding_days, job_texts, rules=None, today=None):
+    """세 입력 열(길이 n)로 점수 배열들을 계산합니다.
+
+    funding_days: 'YYYY-MM-DD' 또는 None (raw_company_data.funding_day). today: 실행 전체에 쓰는 기준일 하나.
+    반환: {SCORE_FIELDS: int64 배열}
+    """
+    rules = _plan(rules)
+    n = len(stages)
+    if n == 0:
+        return {f: np.zeros(0, dtype=np.int64) for f in SCORE_FIELDS}
+
+    # funding: 단계 문자열을 고유값 인덱스로 바꾼 뒤 가중치 배열에서 한 번에 조회
+    uniq, inverse = np.unique(np.array([s or '' for s in stages], dtype=str), return_inverse=True)
+    weights = np.array([rules.stage_weights.get(s, 0) for s in uniq], dtype=np.int64)
+    funding = weights[inverse]
+
+    # hiring: 텍스트마다 키워드를 한 번에 찾아(keyword_match) 키워드 x 회사 행렬을 만든 뒤 점수 벡터와 곱함
+    column = {k: i for i, k in enumerate(rules.keywords)}
+    hits = np.zeros((n, len(rules.keywords)), dtype=np.int64)
+    for row, found in enumerate(rules.matcher.keywords_many(job_texts)):
+        hits[row, [column[k] for k in found]] = 1
+    hiring = hits @ rules.keyword_points
+
+    # recency: 기준일과의 일수 차이 (펀딩일이 없으면 NaT -> 0점)
+    today = np.datetime64(today or date.today(), 'D')
+    age = today - np.array([d or 'NaT' for d in funding_days], dtype='datetime64[D]')
+    recent = ~np.isnat(age) & (age >= np.timedelta64(0, 'D')) & (age <= np.timedelta64(rules.recency_days, 'D'))
+    recency = recent * np.int64(rules.recency_score)
+
+    return {
+        'funding_score': funding,
+        'hiring_score': hiring,
+        'recency_score': recency,
+        'total_score': funding + hiring + recency,
+    }
+
+
+def score_record(record, rules=None, today=None):
+    """레코드 하나(dict)의 점수. job_roles는 문자열, 문자열 리스트, {'title','team'} dict 리스트 모두 가능."""
+    jobs = record.get('job_roles') or ''
+    if isinstance(jobs, (list, tuple)):
+        jobs = ', '.join(f"{j.get('team') or 'Other'}: {j.get('title') or ''}" if isinstance(j, dict) else str(j) for j in jobs)
+    scores = compute([record.get('funding_stage')], [_parse_day(record.get('funding_date'))], [jobs], rules, today)
+    return {f: int(scores[f][0]) for f in SCORE_FIELDS}
+
+
+def rescore(cur, company_ids=None, rules=None, today=None):
+    """raw_company_data에서 입력을 한 번에 읽어 점수를 계산하고 signal_scores에 씁니다.
+    high_priority_score 이상인 회사는 sales_mart에 High로 넣습니다(이미 있으면 유지).
+
+    company_ids=None이면 전체. 계산한 회사의 score_dirty 표시는 지웁니다. 트랜잭션은 호출자가 관리합니다(cur의 연결).
+    반환: {company_id: total_score}
+    """
+    sql = "SELECT id, funding_stage, funding_day, job_roles FROM raw_company_data"
+    if company_ids is None:
+        rows = cur.execute(sql).fetchall()
+    else:
+        company_ids = list(company_ids)
+        rows = []
+        for i in range(0, len(company_ids), CHUNK):
+            chunk = company_ids[i:i + CHUNK]
+            rows += cur.execute(sql + " WHERE id IN ({})".format(','.join('?' * len(chunk))), chunk).fetchall()
+    _clear_dirty(cur, company_ids)
+    if not rows:
+        return {}
+    ids, stages, days, jobs = zip(*rows)
+    scores = compute(stages, days, jobs, rules, today)
+    cols = [scores[f].tolist() for f in SCORE_FIELDS]
+    cur.executemany(
+        "INSERT OR REPLACE INTO signal_scores (company_id, funding_score, hiring_score, recency_score, total_score) VALUES (?, ?, ?, ?, ?)",
+        zip(ids, *cols))
+    # 점수를 쓰는 모든 경로(store 저장 포함)에서 High 대상이 바로 sales_mart에 들어가도록 여기서 처리
+    threshold = _plan(rules).high_priority_score
+    cur.executemany("INSERT OR IGNORE INTO sales_mart (company_id, priority) VALUES (?, 'High')",
+                    [(cid,) for cid, total in zip(ids, cols[-1]) if total >= threshold])
+    return dict(zip(ids, cols[-1]))
+
+
+def _clear_dirty(cur, company_ids=None):
+    if company_ids is None:
+        cur.execute("DELETE FROM score_dirty")
+        return
+    for i in range(0, len(company_ids), CHUNK):
+        chunk = company_ids[i:i + CHUNK]
+        cur.execute("DELETE FROM score_dirty WHERE company_id IN ({})".format(','.join('?' * len(chunk))), chunk)
+
+
+def _recency_edge_ids(cur, last_day, today, rules):
+    """기준일이 last_day에서 today로 바뀌면서 최신성 점수가 달라질 수 있는 회사
+    (funding_day가 [둘 중 이른 날 - recency_days, 늦은 날] 구간) - funding_day 인덱스 범위 조회."""
+    first, last = sorted((last_day, today))
+    since = str(np.datetime64(first, 'D') - np.timedelta64(rules.recency_days, 'D'))
+    return [cid for (cid,) in cur.execute(
+        "SELECT id FROM raw_company_data WHERE funding_day >= ? AND funding_day <= ?", (since, last))]
+
+
+def rescore_pending(conn, rules=None, full=False, today=None):
+    """바뀐 회사만 다시 계산합니다(한 트랜잭션, High 대상은 rescore가 sales_mart에 넣음).
+
+    설정 해시가 지난 실행과 다르거나 full=True면 전체를 다시 계산합니다.
+    반환: {'mode': 'full' | 'incremental', 'scored', 'targets': [(company_id, company_name, total_score)]}
+    """
+    from db import transaction
+    rules = _plan(rules)
+    today = str(np.datetime64(today or date.today(), 'D'))
+    with transaction(conn) as cur:
+        state = dict(cur.execute("SELECT key, value FROM scoring_state").fetchall())
+        if full or state.get('config_hash') != rules.digest or not state.get('scored_on'):
+            mode = 'full'
+            totals = rescore(cur, None, rules, today)
+        else:
+            mode = 'incremental'
+            ids = set(cid for (cid,) in cur.execute("SELECT company_id FROM score_dirty"))
+            if state['scored_on'] != today:
+                ids.update(_recency_edge_ids(cur, state['scored_on'], today, rules))
+            totals = rescore(cur, sorted(ids), rules, today)
+        cur.executemany("INSERT OR REPLACE INTO scoring_state (key, value) VALUES (?, ?)",
+                        [('config_hash', rules.digest), ('scored_on', today)])
+        high = [cid for cid, total in totals.items() if total >= rules.high_priority_score]
+        names = {}
+        for i in range(0, len(high), CHUNK):
+            chunk = high[i:i + CHUNK]
+            names.update(cur.execute("SELECT id, company_name FROM raw_company_data WHERE id IN ({})".format(','.join('?' * len(chunk))), chunk))
+    targets = sorted(((cid, names.get(cid), totals[cid]) for cid in high), key=lambda t: (-t[2], t[0]))
+    return {'mode': mode, 'scored': len(totals), 'targets': targets}
+
+
+def rescore_all(conn, rules=None, today=None):
+    """전체 회사를 다시 계산해 signal_scores와 sales_mart(High)를 한 트랜잭션으로 갱신합니다.
+
+    반환: [(company_id, company_name, total_score)] High 대상 (점수 내림차순)
+    """
+    return rescore_pending(conn, rules, full=True, today=today)['targets']
@@ -0,0 +1,118 @@
+"""뉴스/채용 전문 검색 (FTS5 trigram).
+
+검색어를 news(title, content) / jobs(title, team)에서 찾아 회사 단위로 묶어 순위를 매깁니다.
+  - 3글자 이상 단어: FTS5 MATCH (bm25 순위)
+  - 3글자 미만 단어(trigram으로 색인 불가, 예: '투자', 'B'): 같은 후보에 LIKE 조건으로 추가
+  - 큰따옴표로 묶은 구는 한 단어로 취급 (예: '"시리즈 B"')
+FTS 색인이 없으면(FTS5 미지원 SQLite) 원본 테이블 LIKE 검색으로 대신합니다.
+
+    python search.py 세일즈 --jobs --since 2025-10-01
+    python search.py '"시리즈 B"' --news --limit 10
+"""
+import argparse
+import shlex
+
+import migrate
+from db import get_conn
+
+MIN_MATCH_LEN = 3  # trigram 최소 길이
+
+# kind -> (원본 테이블, fts 테이블, 검색 컬럼, 날짜 컬럼)
+KINDS = {
+    'news': ('news', 'news_fts', ('title', 'content'), 'created_at'),
+    'jobs': ('jobs', 'jobs_fts', ('title', 'team'), 'collected_at'),
+}
+
+
+def parse_query(query):
+    """검색어 -> 단어 리스트. 큰따옴표 구는 하나로 묶고, 짝이 안 맞으면 공백으로만 나눕니다."""
+    try:
+        terms = shlex.split(query)
+    except ValueError:
+        terms = query.split()
+    return [t.strip() for t in terms if t.strip()]
+
+
+def _match_expr(terms):
+    return ' AND '.join('"{}"'.format(t.replace('"', '""')) for t in terms)
+
+
+def has_fts(conn, kind):
+    fts = KINDS[kind][1]
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (fts,)).fetchone() is not None
+
+
+def _search_kind(conn, kind, terms, since=None, limit=1000):
+    """한 종류(news/jobs)에서 일치하는 행들: [(company_id, rowid, title, score)] (score 클수록 관련)"""
+    table, fts, cols, date_col = KINDS[kind]
+    long_terms = [t for t in terms if len(t) >= MIN_MATCH_LEN]
+    short_terms = [t for t in terms if len(t) < MIN_MATCH_LEN]
+    use_fts = has_fts(conn, kind)
+
+    where, params = [], []
+    if use_fts and long_terms:
+        src = f"{fts} JOIN {table} t ON t.id = {fts}.rowid"
+        where.append(f"{fts} MATCH ?")
+        params.append(_match_expr(long_terms))
+        score = f"-bm25({fts})"
+        like_terms = short_terms
+    else:
+        src = f"{table} t"
+        score = "1.0"
+        like_terms = terms
+    for t in like_terms:
+        where.append('(' + ' OR '.join(f"t.{c} LIKE ?" for c in cols) + ')')
+        params.extend([f"%{t}%"] * len(cols))
+    if since:
+        where.append(f"t.{date_col} >= ?")
+        params.append(since)
+    sql = f"""SELECT t.company_id, t.id, t.title, {score} AS score FROM {src}
+              WHERE {' AND '.join(where)} ORDER BY score DESC LIMIT ?"""
+    return conn.execute(sql, (*params, limit)).fetchall()
+
+
+def search(query, kinds=('news', 'jobs'), since=None, limit=20, conn=None):
+    """검색어와 일치하는 회사 순위.
+
+    반환: [{'company_id', 'company_name', 'score', 'news_hits', 'jobs_hits', 'titles'}] (score 내림차순)
+    score = 일치한 행들의 관련도(bm25) 합. since: 'YYYY-MM-DD' (news.created_at / jobs.collected_at 기준)
+    """
+    terms = parse_query(query)
+    if not terms:
+        return []
+    conn = conn or get_conn()
+    migrate.upgrade(conn)
+    hits = {}
+    for kind in kinds:
+        for company_id, _, title, score in _search_kind(conn, kind, terms, since):
+            h = hits.setdefault(company_id, {'company_id': company_id, 'score': 0.0, 'news_hits': 0, 'jobs_hits': 0, 'titles': []})
+            h['score'] += score
+            h[f'{kind}_hits'] += 1
+            if title and len(h['titles']) < 3:
+                h['titles'].append(title)
+    ranked = sorted(hits.values(), key=lambda h: (-h['score'], h['company_id']))[:limit]
+    if ranked:
+        ids = [h['company_id'] for h in ranked]
+        names = dict(conn.execute(
+            "SELECT id, company_name FROM raw_company_data WHERE id IN ({})".format(','.join('?' * len(ids))), ids))
+        for h in ranked:
+            h['company_name'] = names.get(h['company_id'])
+    return ranked
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Full-text search over news and job postings')
+    parser.add_argument('query', help='Search terms (quote phrases, e.g. \'"시리즈 B"\')')
+    parser.add_argument('--news', action='store_true', help='Search news only')
+    parser.add_argument('--jobs', action='store_true', help='Search job postings only')
+    parser.add_argument('--since', type=str, help='Only rows stored on/after this date (YYYY-MM-DD)')
+    parser.add_argument('--limit', type=int, default=20, help='Max companies to show')
+    args = parser.parse_args()
+
+    kinds = [k for k, on in (('news', args.news), ('jobs', args.jobs)) if on] or ['news', 'jobs']
+    results = search(args.query, kinds=kinds, since=args.since, limit=args.limit)
+    print(f"\n=== '{args.query}' 검색 결과: 회사 {len(results)}개 ===\n")
+    for i, h in enumerate(results, 1):
+        print(f"{i:>3}. {h['company_name']} (id={h['company_id']}) score={h['score']:.2f} 뉴스 {h['news_hits']}건, 채용 {h['jobs_hits']}건")
+        for t in h['titles']:
+            print(f"       - {t}")
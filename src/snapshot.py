@@ -0,0 +1,195 @@
+"""분석용 컬럼형 스냅샷 내보내기 (Arrow IPC / Parquet).
+
+회사 + 점수 + 마트 + 채용/뉴스 건수를 조인한 뷰를 한 읽기 트랜잭션 안에서 읽어(시점 일관성,
+WAL이라 수집 중인 writer를 막지 않음) 실행마다 파일 하나로 추가합니다.
+  - 증분(기본): 지난 실행 이후 바뀐/새 회사 행과 삭제된 회사의 tombstone(deleted=True)만 씀
+  - --full: 전체 행(+ 지난 실행 이후 삭제된 회사의 tombstone)을 쓰고 증분 기준을 다시 잡음
+  - 읽기: Arrow 파일은 memory map으로 열어 복사 없이 읽고, 회사별 최신 행만 남김(read_snapshot)
+
+pyarrow가 필요합니다 (pip install pyarrow).
+
+    python snapshot.py                    # 증분 내보내기 (Arrow IPC)
+    python snapshot.py --format parquet --full
+    python snapshot.py --read             # 최신 스냅샷 요약
+"""
+import argparse
+import glob
+import json
+import os
+from datetime import datetime
+
+import db
+from db import BASE_DIR
+from utils import content_hash
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+SNAPSHOT_DIR = os.path.join(BASE_DIR, 'exports', 'snapshots')
+STATE_FILE = '_state.json'
+FORMATS = {'arrow': '.arrow', 'parquet': '.parquet'}
+
+QUERY = '''
+SELECT r.id, r.company_name, r.industry, r.funding_stage, r.funding_round, r.funding_date, r.amount, r.investors,
+       r.founded_date, r.employee_count, r.last_enrich_date,
+       s.funding_score, s.hiring_score, s.recency_score, s.total_score,
+       m.priority, m.is_sent,
+       COALESCE(j.cnt, 0), COALESCE(n.cnt, 0)
+FROM raw_company_data r
+LEFT JOIN signal_scores s ON s.company_id = r.id
+LEFT JOIN sales_mart m ON m.company_id = r.id
+LEFT JOIN (SELECT company_id, COUNT(*) AS cnt FROM jobs GROUP BY company_id) j ON j.company_id = r.id
+LEFT JOIN (SELECT company_id, COUNT(*) AS cnt FROM news GROUP BY company_id) n ON n.company_id = r.id
+ORDER BY r.id
+'''
+# QUERY 컬럼 순서와 동일 (+ snapshot_at, deleted)
+COLUMNS = [
+    ('company_id', 'int64'), ('company_name', 'string'), ('industry', 'string'), ('funding_stage', 'string'),
+    ('funding_round', 'string'), ('funding_date', 'string'), ('amount', 'string'), ('investors', 'string'),
+    ('founded_date', 'string'), ('employee_count', 'string'), ('last_enrich_date', 'string'),
+    ('funding_score', 'int64'), ('hiring_score', 'int64'), ('recency_score', 'int64'), ('total_score', 'int64'),
+    ('priority', 'string'), ('is_sent', 'int64'), ('job_count', 'int64'), ('news_count', 'int64'),
+]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("snapshot export needs pyarrow: pip install pyarrow")
+
+
+def schema():
+    _require_pyarrow()
+    types = {'int64': pa.int64(), 'string': pa.string()}
+    fields = [pa.field(name, types[t]) for name, t in COLUMNS]
+    return pa.schema(fields + [pa.field('snapshot_at', pa.string()), pa.field('deleted', pa.bool_())])
+
+
+def read_view(path=None):
+    """한 읽기 트랜잭션 안에서 뷰 전체를 읽습니다. 반환: (snapshot_at, rows)"""
+    conn = db.connect(path or db.DB_PATH)
+    try:
+        conn.execute("BEGIN")
+        snapshot_at = conn.execute("SELECT strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')").fetchone()[0]
+        rows = conn.execute(QUERY).fetchall()
+        conn.rollback()
+    finally:
+        conn.close()
+    return snapshot_at, rows
+
+
+def _to_table(rows, snapshot_at, deleted_ids=()):
+    cols = {name: [r[i] for r in rows] for i, (name, _) in enumerate(COLUMNS)}
+    for company_id in deleted_ids:
+        for name, _ in COLUMNS:
+            cols[name].append(company_id if name == 'company_id' else None)
+    n = len(rows) + len(deleted_ids)
+    cols['snapshot_at'] = [snapshot_at] * n
+    cols['deleted'] = [False] * len(rows) + [True] * len(deleted_ids)
+    return pa.Table.from_pydict(cols, schema=schema())
+
+
+def _load_state(out_dir):
+    path = os.path.join(out_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_state(out_dir, state):
+    path = os.path.join(out_dir, STATE_FILE)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def export_snapshot(out_dir=SNAPSHOT_DIR, fmt='arrow', full=False):
+    """스냅샷 파일 하나를 추가합니다. 바뀐 행이 없으면 파일을 만들지 않습니다.
+
+    반환: {'path', 'rows', 'deleted', 'total', 'snapshot_at'}
+    """
+    _require_pyarrow()
+    os.makedirs(out_dir, exist_ok=True)
+    snapshot_at, rows = read_view()
+
+    hashes = {str(r[0]): content_hash(list(r)) for r in rows}
+    # full이어도 지난 상태와 비교해 삭제된 회사의 tombstone은 씀 (이전 파일에 남은 행을 가리기 위해)
+    prev = _load_state(out_dir).get('hashes', {})
+    changed = rows if full else [r for r in rows if prev.get(str(r[0])) != hashes[str(r[0])]]
+    deleted = [int(cid) for cid in prev if cid not in hashes]
+
+    path = None
+    if changed or deleted or full:
+        table = _to_table(changed, snapshot_at, deleted)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        path = os.path.join(out_dir, f"snapshot_{stamp}{FORMATS[fmt]}")
+        if fmt == 'parquet':
+            pq.write_table(table, path)
+        else:
+            # 압축 없이 써야 읽을 때 memory map으로 복사 없이 열림
+            with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        _save_state(out_dir, {'snapshot_at': snapshot_at, 'hashes': hashes})
+    return {'path': path, 'rows': len(changed), 'deleted': len(deleted), 'total': len(rows), 'snapshot_at': snapshot_at}
+
+
+def snapshot_files(out_dir=SNAPSHOT_DIR):
+    files = []
+    for ext in FORMATS.values():
+        files += glob.glob(os.path.join(out_dir, f"snapshot_*{ext}"))
+    return sorted(files, key=os.path.basename)
+
+
+def _read_file(path):
+    if path.endswith(FORMATS['parquet']):
+        return pq.read_table(path, memory_map=True)
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+
+def read_snapshot(out_dir=SNAPSHOT_DIR, latest=True):
+    """스냅샷 파일들을 읽어 하나의 pyarrow.Table로 반환합니다.
+
+    latest=True면 회사별 마지막 행만 남기고 삭제된 회사는 제외합니다(현재 시점 뷰).
+    latest=False면 실행별 변경 이력 전체.
+    """
+    _require_pyarrow()
+    files = snapshot_files(out_dir)
+    if not files:
+        return schema().empty_table()
+    table = pa.concat_tables([_read_file(p) for p in files])
+    if not latest:
+        return table
+    # 파일이 시간순이므로 뒤에 나온 행이 최신
+    last = {}
+    for i, cid in enumerate(table.column('company_id').to_pylist()):
+        last[cid] = i
+    deleted = table.column('deleted').to_pylist()
+    keep = sorted(i for i in last.values() if not deleted[i])
+    return table.take(pa.array(keep, type=pa.int64()))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export a point-in-time columnar snapshot of the sales mart')
+    parser.add_argument('--format', choices=sorted(FORMATS), default='arrow', help='Output file format')
+    parser.add_argument('--full', action='store_true', help='Write every row instead of only changes since the last run')
+    parser.add_argument('--dir', type=str, default=SNAPSHOT_DIR, help='Snapshot directory')
+    parser.add_argument('--read', action='store_true', help='Read the latest snapshot and print a summary')
+    args = parser.parse_args()
+
+    if args.read:
+        t = read_snapshot(args.dir)
+        print(f"스냅샷: 회사 {t.num_rows}개, 파일 {len(snapshot_files(args.dir))}개 ({args.dir})")
+        if t.num_rows:
+            top = t.sort_by([('total_score', 'descending')]).slice(0, 10)
+            for name, score in zip(top.column('company_name').to_pylist(), top.column('total_score').to_pylist()):
+                print(f"  {name}: {score}")
+    else:
+        r = export_snapshot(args.dir, args.format, args.full)
+        if r['path']:
+            print(f"✅ 스냅샷 {r['snapshot_at']}: {r['rows']}행 + 삭제 {r['deleted']}건 (전체 {r['total']}개) -> {r['path']}")
+        else:
+            print(f"변경 없음 ({r['snapshot_at']}, 전체 {r['total']}개) - 파일을 만들지 않았습니다.")
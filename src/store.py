@@ -1,8 +1,13 @@
-from db import get_conn
+from db import get_conn, find_company_id, stored_record_hash, transaction
 from pprint import pprint
-from utils import normalize_company_name, score_company_record
+from utils import company_key, record_hash, RECORD_HASH_FIELDS
 from datetime import datetime
 import re
+import time
+from collect import MonthEnd
+import freshness
+import migrate
+import scoring
 
 
 def preview(companies, n=10):
@@ -10,134 +15,449 @@ def preview(companies, n=10):
     pprint(companies[:n])
 
 
-def save_to_db(companies):
-    conn = get_conn()
-    cur = conn.cursor()
-
-    # collect periods that were processed (if present on records)
-    processed_periods = set()
-
-    for c in companies:
-        raw_name = c.get('name')
-        norm = normalize_company_name(raw_name)
-        if not norm or len(norm) < 2:
-            print(f"스킵(이름불가): {raw_name}")
-            continue
-
-        cur.execute("SELECT id FROM raw_company_data WHERE lower(company_name) = ?", (norm,))
-        if cur.fetchone():
-            print(f"이미 존재(중복): {raw_name}")
-            continue
-
-        news_title = c.get('news_list')[0]['title'] if c.get('news_list') else None
-        # job_roles can be list of strings or list of dicts {'title','team','link'}
-        jobs = c.get('job_roles') or []
-        jobs_summary = None
-        required_roles = set()
-        if jobs:
-            if all(isinstance(j, dict) for j in jobs):
-                parts = []
-                for j in jobs:
-                    team = j.get('team') or 'Other'
-                    title = j.get('title') or ''
-                    parts.append(f"{team}: {title}")
-                    if team and team != 'Other':
-                        required_roles.add(team)
-                jobs_summary = ', '.join(parts)
-            else:
-                jobs_summary = ', '.join(jobs)
-        required_roles_str = ', '.join(sorted(required_roles)) if required_roles else None
-
-        # keywords from news
-        keywords = set()
-        for n in c.get('news_list') or []:
-            text = (n.get('title') or '') + ' ' + (n.get('content') or '')
-            # 간단 키워드 추출: 명사 추출 (간단히 단어 분리)
-            words = re.findall(r'\b[가-힣]{2,}\b', text)
-            for w in words:
-                if len(w) > 1 and w not in ['있는', '하는', '된다', '했다']:  # 불용어
-                    keywords.add(w)
-        keywords_str = ', '.join(sorted(list(keywords)[:10])) if keywords else None  # 최대 10개
-
-        cur.execute('''
-        INSERT INTO raw_company_data (company_name, source, funding_stage, funding_round, funding_date, amount, investors, industry, keywords, required_roles, job_roles, news_title, founded_date, employee_count, last_enrich_date)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            raw_name,
-            c.get('source'),
-            c.get('funding_stage'),
-            c.get('funding_round'),
-            c.get('funding_date'),
-            c.get('amount'),
-            c.get('investors'),
-            c.get('industry'),
-            keywords_str,
-            required_roles_str,
-            jobs_summary,
-            news_title,
-            c.get('founded_date'),
-            c.get('employee_count'),
-            datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        ))
-        last_id = cur.lastrowid
-
-        # persist structured news rows
-        for n in c.get('news_list') or []:
-            try:
-                title = n.get('title')
-                url = n.get('link')
-                if title and url:
-                    # 중복 체크: 같은 company_id, title, url
-                    cur.execute("SELECT id FROM news WHERE company_id = ? AND title = ? AND url = ?", (last_id, title, url))
-                    if not cur.fetchone():
-                        cur.execute("INSERT INTO news (company_id, title, content, url, published_at, source_name, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                                    (last_id, title, n.get('content'), url, n.get('published_at'), n.get('source_name'), datetime.now()))
-            except Exception:
-                pass
-
-        # persist structured job rows
-        for j in c.get('job_roles') or []:
-            try:
-                if isinstance(j, dict):
-                    title = j.get('title')
-                    if title:
-                        print(f"Inserting job: {title}")  # Debug print
-                        # 중복 체크: 같은 company_id, title
-                        cur.execute("SELECT id FROM jobs WHERE company_id = ? AND title = ?", (last_id, title))
-                        if not cur.fetchone():
-                            cur.execute("INSERT INTO jobs (company_id, title, team, link, source, collected_at) VALUES (?, ?, ?, ?, ?, ?)",
-                                        (last_id, title, j.get('team'), j.get('link'), j.get('source') or 'wanted', datetime.now()))
-                            print(f"Inserted job: {title}")  # Debug print
-                else:
-                    # string job
-                    cur.execute("INSERT INTO jobs (company_id, title, team, link, source, collected_at) VALUES (?, ?, ?, ?, ?, ?)",
-                                (last_id, j, None, None, 'unknown', datetime.now()))
-            except Exception as e:
-                print(f"Error inserting job: {e}")  # Debug print
-
-        scores = score_company_record(c)
-        cur.execute("INSERT OR REPLACE INTO signal_scores (company_id, funding_score, hiring_score, recency_score, total_score) VALUES (?, ?, ?, ?, ?)",
-                    (last_id, scores['funding_score'], scores['hiring_score'], scores['recency_score'], scores['total_score']))
-        print(f"저장: {raw_name} (id={last_id}) score={scores['total_score']}")
-
-        # collect processed period if funding_date present in YYYY-MM or YYYY-MM-DD
-        fd = c.get('funding_date')
-        if fd:
-            m = None
-            mobj = re.search(r'(\d{4}-\d{2})', fd)
-            if mobj:
-                m = mobj.group(1)
-            elif re.match(r'^\d{4}-\d{2}-\d{2}$', fd):
-                m = fd[:7]
-            if m:
-                processed_periods.add(m)
-
-    # mark processed periods
-    for p in processed_periods:
+def _summarize_jobs(jobs):
+    """job_roles(문자열 리스트 또는 {'title','team','link'} dict 리스트) -> (job_roles 요약, required_roles)"""
+    jobs_summary = None
+    required_roles = set()
+    if jobs:
+        if all(isinstance(j, dict) for j in jobs):
+            parts = []
+            for j in jobs:
+                team = j.get('team') or 'Other'
+                title = j.get('title') or ''
+                parts.append(f"{team}: {title}")
+                if team and team != 'Other':
+                    required_roles.add(team)
+            jobs_summary = ', '.join(parts)
+        else:
+            jobs_summary = ', '.join(jobs)
+    required_roles_str = ', '.join(sorted(required_roles)) if required_roles else None
+    return jobs_summary, required_roles_str
+
+
+def _news_keywords(news_list):
+    """뉴스 제목/본문에서 간단 키워드(최대 10개)를 뽑아 문자열로 반환"""
+    keywords = set()
+    for n in news_list:
+        text = (n.get('title') or '') + ' ' + (n.get('content') or '')
+        # 간단 키워드 추출: 명사 추출 (간단히 단어 분리)
+        words = re.findall(r'\b[가-힣]{2,}\b', text)
+        for w in words:
+            if len(w) > 1 and w not in ['있는', '하는', '된다', '했다']:  # 불용어
+                keywords.add(w)
+    return ', '.join(sorted(list(keywords)[:10])) if keywords else None  # 최대 10개
+
+
+def _insert_news(cur, company_id, news_list):
+    for n in news_list:
         try:
-            cur.execute("INSERT OR IGNORE INTO processed_periods (period) VALUES (?)", (p,))
+            title = n.get('title')
+            url = n.get('link')
+            if title and url:
+                # 중복 체크: 같은 company_id, title, url
+                cur.execute("SELECT id FROM news WHERE company_id = ? AND title = ? AND url = ?", (company_id, title, url))
+                if not cur.fetchone():
+                    cur.execute("INSERT INTO news (company_id, title, content, url, published_at, source_name, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (company_id, title, n.get('content'), url, n.get('published_at'), n.get('source_name'), datetime.now()))
         except Exception:
             pass
 
-    conn.commit()
-    conn.close()
+
+# 레코드(c)에서 그대로 가져오는 스칼라 필드 - upsert 시 값이 있으면 덮어씀
+MERGE_FIELDS = ('source', 'funding_stage', 'funding_round', 'funding_date', 'amount', 'investors', 'industry',
+                'founded_date', 'employee_count')
+
+
+def _job_title(j):
+    return j.get('title') if isinstance(j, dict) else j
+
+
+RAW_COLUMNS = ('company_name, source, funding_stage, funding_round, funding_date, amount, investors, industry, '
+               'keywords, required_roles, job_roles, news_title, founded_date, employee_count, last_enrich_date, normalized_name, content_hash')
+RAW_PLACEHOLDERS = ', '.join('?' * len(RAW_COLUMNS.split(',')))
+
+
+def _raw_row(c):
+    """raw_company_data INSERT 값 (RAW_COLUMNS 순서)"""
+    news_title = c.get('news_list')[0]['title'] if c.get('news_list') else None
+    jobs_summary, required_roles_str = _summarize_jobs(c.get('job_roles') or [])
+    keywords_str = _news_keywords(c.get('news_list') or [])
+    stored = dict({f: c.get(f) for f in MERGE_FIELDS}, job_roles=jobs_summary, news_title=news_title)
+    h = record_hash(stored,
+                    [n.get('link') for n in c.get('news_list') or [] if n.get('title')],
+                    [_job_title(j) for j in c.get('job_roles') or []])
+    return (
+        c.get('name'),
+        c.get('source'),
+        c.get('funding_stage'),
+        c.get('funding_round'),
+        c.get('funding_date'),
+        c.get('amount'),
+        c.get('investors'),
+        c.get('industry'),
+        keywords_str,
+        required_roles_str,
+        jobs_summary,
+        news_title,
+        c.get('founded_date'),
+        c.get('employee_count'),
+        datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        company_key(c.get('name')),
+        h
+    )
+
+
+def _split_month_ends(batch):
+    """배치에서 collect.MonthEnd 표시를 떼어 냅니다. 반환: (회사 리스트, 끝난 월 리스트)"""
+    companies, periods = [], []
+    for c in batch:
+        if isinstance(c, MonthEnd):
+            periods.append(c.period)
+        else:
+            companies.append(c)
+    return companies, periods
+
+
+def _mark_periods(cur, periods):
+    """끝난 월을 processed_periods에 기록합니다. 그 달의 회사와 같은 트랜잭션(또는 이후)에서만 호출합니다."""
+    cur.executemany("INSERT OR IGNORE INTO processed_periods (period) VALUES (?)", [(p,) for p in periods])
+
+
+def _insert_company(cur, c):
+    """새 회사 한 건(raw + news/jobs + 신선도)을 저장하고 id를 반환합니다. 점수는 호출자가 scoring.rescore로 일괄 계산."""
+    cur.execute(f"INSERT INTO raw_company_data ({RAW_COLUMNS}) VALUES ({RAW_PLACEHOLDERS})", _raw_row(c))
+    last_id = cur.lastrowid
+
+    # persist structured news rows
+    _insert_news(cur, last_id, c.get('news_list') or [])
+
+    # persist structured job rows
+    for j in c.get('job_roles') or []:
+        try:
+            if isinstance(j, dict):
+                title = j.get('title')
+                if title:
+                    # 중복 체크: 같은 company_id, title
+                    cur.execute("SELECT id FROM jobs WHERE company_id = ? AND title = ?", (last_id, title))
+                    if not cur.fetchone():
+                        cur.execute("INSERT INTO jobs (company_id, title, team, link, source, collected_at) VALUES (?, ?, ?, ?, ?, ?)",
+                                    (last_id, title, j.get('team'), j.get('link'), j.get('source') or 'wanted', datetime.now()))
+            else:
+                # string job
+                cur.execute("INSERT INTO jobs (company_id, title, team, link, source, collected_at) VALUES (?, ?, ?, ?, ?, ?)",
+                            (last_id, j, None, None, 'unknown', datetime.now()))
+        except Exception as e:
+            print(f"Error inserting job: {e}")
+
+    if c.get('enriched_sources'):
+        freshness.mark(cur, last_id, c['enriched_sources'])
+    return last_id
+
+
+def save_to_db(companies, bulk=False, upsert=False):
+    if upsert:
+        return upsert_companies(companies)
+    if bulk:
+        return save_to_db_bulk(companies)
+    conn = get_conn()
+    migrate.upgrade(conn)
+    companies, periods = _split_month_ends(companies)
+    saved = []
+    with transaction(conn) as cur:
+        for c in companies:
+            raw_name = c.get('name')
+            if company_key(raw_name) is None:
+                print(f"스킵(이름불가): {raw_name}")
+                continue
+
+            if find_company_id(cur, raw_name) is not None:
+                print(f"이미 존재(중복): {raw_name}")
+                continue
+
+            saved.append((raw_name, _insert_company(cur, c)))
+
+        totals = scoring.rescore(cur, [cid for _, cid in saved])
+        for raw_name, cid in saved:
+            print(f"저장: {raw_name} (id={cid}) score={totals.get(cid)}")
+
+        # 이 배치로 한 달 치가 모두 저장된 경우에만 그 달을 처리 완료로 기록
+        _mark_periods(cur, periods)
+
+
+def _next_company_id(cur):
+    # AUTOINCREMENT 규칙과 같게: 지금까지 쓰인 최대 id(sqlite_sequence) 다음 값
+    seq = cur.execute("SELECT seq FROM sqlite_sequence WHERE name = 'raw_company_data'").fetchone()
+    max_id = cur.execute("SELECT COALESCE(MAX(id), 0) FROM raw_company_data").fetchone()[0]
+    return max(seq[0] if seq else 0, max_id) + 1
+
+
+def save_to_db_bulk(companies):
+    """save_to_db의 일괄 저장 모드.
+
+    기존 normalized_name을 한 번만 읽어 집합으로 만들고, 모든 행을 메모리에 모은 뒤
+    executemany + INSERT OR IGNORE(migrate.py의 유니크 인덱스)로 한 트랜잭션에 기록합니다.
+    회사 id는 트랜잭션 안에서 미리 배정해 자식 행(news/jobs/signal_scores)도 한 번에 넣습니다.
+    반환: {'companies', 'news', 'jobs', 'skipped', 'seconds', 'rows_per_sec'}
+    """
+    t0 = time.perf_counter()
+    conn = get_conn()
+    migrate.upgrade(conn)
+    companies, periods = _split_month_ends(companies)
+    with transaction(conn) as cur:
+        existing = set(k for (k,) in cur.execute("SELECT normalized_name FROM raw_company_data WHERE normalized_name IS NOT NULL"))
+        next_id = _next_company_id(cur)
+        now = datetime.now()
+        now_str = now.strftime('%Y-%m-%d %H:%M:%S')
+
+        raw_rows, news_rows, job_rows, fresh_rows = [], [], [], []
+        skipped = 0
+        for c in companies:
+            key = company_key(c.get('name'))
+            if key is None or key in existing:
+                skipped += 1
+                continue
+            existing.add(key)
+            cid = next_id
+            next_id += 1
+
+            raw_rows.append((cid,) + _raw_row(c))
+            for n in c.get('news_list') or []:
+                if n.get('title') and n.get('link'):
+                    news_rows.append((cid, n.get('title'), n.get('content'), n.get('link'), n.get('published_at'), n.get('source_name'), now))
+            for j in c.get('job_roles') or []:
+                if isinstance(j, dict):
+                    if j.get('title'):
+                        job_rows.append((cid, j.get('title'), j.get('team'), j.get('link'), j.get('source') or 'wanted', now))
+                elif j:
+                    job_rows.append((cid, j, None, None, 'unknown', now))
+            for src in c.get('enriched_sources') or []:
+                fresh_rows.append((cid, src, now_str))
+
+        cur.executemany(f"INSERT INTO raw_company_data (id, {RAW_COLUMNS}) VALUES (?, {RAW_PLACEHOLDERS})", raw_rows)
+        # rowcount는 트리거(FTS/score_dirty/이력)가 쓴 행을 세지 않음 (total_changes와 달리)
+        cur.executemany("INSERT OR IGNORE INTO news (company_id, title, content, url, published_at, source_name, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)", news_rows)
+        n_news = max(cur.rowcount, 0)
+        cur.executemany("INSERT OR IGNORE INTO jobs (company_id, title, team, link, source, collected_at) VALUES (?, ?, ?, ?, ?, ?)", job_rows)
+        n_jobs = max(cur.rowcount, 0)
+        n_scores = len(scoring.rescore(cur, [r[0] for r in raw_rows]))
+        freshness.ensure_table(cur)
+        cur.executemany("INSERT OR REPLACE INTO enrich_freshness (company_id, source, fetched_at) VALUES (?, ?, ?)", fresh_rows)
+        _mark_periods(cur, periods)
+
+    elapsed = time.perf_counter() - t0
+    rows = len(raw_rows) + n_news + n_jobs + n_scores
+    rate = rows / elapsed if elapsed else 0.0
+    print(f"일괄 저장: 회사 {len(raw_rows)}개, 뉴스 {n_news}행, 채용 {n_jobs}행 (스킵 {skipped}) - {elapsed:.3f}s, {rate:.0f} rows/s")
+    return {'companies': len(raw_rows), 'news': n_news, 'jobs': n_jobs, 'skipped': skipped,
+            'seconds': elapsed, 'rows_per_sec': rate}
+
+
+def _update_company(cur, cid, c, now):
+    """기존 회사(cid)를 c와 비교해 바뀐 부분만 씁니다. 반환: 'updated' | 'unchanged'
+
+    - 스칼라 필드: c에 값이 있으면 c, 없으면 저장된 값 유지
+    - 뉴스/채용: c에 결과가 있으면 그 목록이 기준(추가/삭제/팀·링크 변경), 없으면 저장된 행 유지
+    저장된 해시와 같으면 raw/news/jobs는 건드리지 않고 신선도만 기록합니다. 점수는 호출자가 다시 계산합니다.
+    """
+    row = cur.execute(f"SELECT {', '.join(RECORD_HASH_FIELDS)}, content_hash FROM raw_company_data WHERE id = ?", (cid,)).fetchone()
+    stored = dict(zip(RECORD_HASH_FIELDS, row[:-1]))
+    merged = {f: c.get(f) if c.get(f) not in (None, '') else stored[f] for f in MERGE_FIELDS}
+
+    stored_news = dict(cur.execute("SELECT url, title FROM news WHERE company_id = ?", (cid,)).fetchall())
+    stored_jobs = {t: (team, link) for t, team, link in
+                   cur.execute("SELECT title, team, link FROM jobs WHERE company_id = ?", (cid,))}
+    news = [n for n in c.get('news_list') or [] if n.get('title') and n.get('link')]
+    jobs = [j if isinstance(j, dict) else {'title': j, 'source': 'unknown'} for j in c.get('job_roles') or [] if _job_title(j)]
+
+    # 이번에 쓰게 될 raw 값으로 해시 (다른 저장 경로와 같은 utils.record_hash)
+    new_row = dict(stored, **merged)
+    if news:
+        new_row['news_title'] = news[0]['title']
+    if jobs:
+        new_row['job_roles'], required_roles = _summarize_jobs(jobs)
+    # 저장된 해시는 예전 방식일 수 있으므로 저장된 상태로 다시 계산해 비교
+    old_hash = record_hash(stored, stored_news, stored_jobs)
+    new_hash = record_hash(new_row,
+                           [n['link'] for n in news] if news else stored_news,
+                           [j['title'] for j in jobs] if jobs else stored_jobs)
+    if c.get('enriched_sources'):
+        freshness.mark(cur, cid, c['enriched_sources'], now.strftime(freshness.TS_FORMAT))
+    if new_hash == old_hash:
+        if row[-1] != old_hash:
+            cur.execute("UPDATE raw_company_data SET content_hash = ? WHERE id = ?", (old_hash, cid))
+        return 'unchanged'
+
+    sets = dict(merged)
+    if news:
+        urls = set(n['link'] for n in news)
+        gone = [u for u in stored_news if u not in urls]
+        if gone:
+            cur.executemany("DELETE FROM news WHERE company_id = ? AND url = ?", [(cid, u) for u in gone])
+        _insert_news(cur, cid, [n for n in news if n['link'] not in stored_news])
+        sets['news_title'] = news[0]['title']
+        sets['keywords'] = _news_keywords(news)
+    if jobs:
+        titles = set(j['title'] for j in jobs)
+        gone = [t for t in stored_jobs if t not in titles]
+        if gone:
+            cur.executemany("DELETE FROM jobs WHERE company_id = ? AND title = ?", [(cid, t) for t in gone])
+        for j in jobs:
+            old = stored_jobs.get(j['title'])
+            if old is None:
+                cur.execute("INSERT OR IGNORE INTO jobs (company_id, title, team, link, source, collected_at) VALUES (?, ?, ?, ?, ?, ?)",
+                            (cid, j['title'], j.get('team'), j.get('link'), j.get('source') or 'wanted', now))
+            elif old != (j.get('team'), j.get('link')):
+                cur.execute("UPDATE jobs SET team = ?, link = ? WHERE company_id = ? AND title = ?",
+                            (j.get('team'), j.get('link'), cid, j['title']))
+        sets['job_roles'], sets['required_roles'] = new_row['job_roles'], required_roles
+    sets['content_hash'] = new_hash
+    sets['last_enrich_date'] = now.strftime(freshness.TS_FORMAT)
+    cur.execute(f"UPDATE raw_company_data SET {', '.join(k + ' = ?' for k in sets)} WHERE id = ?", (*sets.values(), cid))
+
+    return 'updated'
+
+
+def upsert_companies(companies):
+    """이미 있는 회사도 버리지 않는 저장 경로(--only-enrich 등 재엔리치용).
+
+    새 회사는 save_to_db와 같이 넣고, 기존 회사는 content_hash(펀딩 필드 + 뉴스 URL + 채용 제목)를
+    비교해 달라진 회사의 바뀐 행만 갱신합니다. 반환: {'inserted', 'updated', 'unchanged', 'skipped'}
+    """
+    conn = get_conn()
+    migrate.upgrade(conn)
+    stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+    now = datetime.now()
+    companies, periods = _split_month_ends(companies)
+    with transaction(conn) as cur:
+        inserted, updated = [], []
+        for c in companies:
+            raw_name = c.get('name')
+            if company_key(raw_name) is None:
+                stats['skipped'] += 1
+                continue
+            cid = find_company_id(cur, raw_name)
+            if cid is None:
+                inserted.append((raw_name, _insert_company(cur, c)))
+                stats['inserted'] += 1
+            else:
+                result = _update_company(cur, cid, c, now)
+                stats[result] += 1
+                if result == 'updated':
+                    updated.append(cid)
+                    print(f"갱신: {raw_name} (id={cid})")
+        totals = scoring.rescore(cur, [cid for _, cid in inserted] + updated)
+        for raw_name, cid in inserted:
+            print(f"저장: {raw_name} (id={cid}) score={totals.get(cid)}")
+        _mark_periods(cur, periods)
+    print(f"upsert: 신규 {stats['inserted']}, 변경 {stats['updated']}, 동일 {stats['unchanged']}, 스킵 {stats['skipped']}")
+    return stats
+
+
+# 요약 문자열만 주는 크롤러(원티드/혁신의숲)가 채우는 raw 컬럼
+SUMMARY_FIELDS = ('source', 'funding_stage', 'funding_date', 'job_roles', 'news_title')
+
+
+def upsert_source_summaries(companies):
+    """ingest_wanted / ingest_innoforest의 저장 경로 (job_roles/news_title이 문자열 한 줄인 레코드).
+
+    이름을 정규화할 수 없으면 스킵합니다. 이미 있는 회사는 같은 소스가 넣은 행이고 content_hash가
+    달라졌을 때만 SUMMARY_FIELDS를 갱신하며(다른 소스의 행은 건드리지 않음), 새/바뀐 회사는 점수를 다시 계산합니다.
+    반환: {'inserted', 'updated', 'unchanged', 'skipped'}
+    """
+    conn = get_conn()
+    migrate.upgrade(conn)
+    stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+    changed = []
+    with transaction(conn) as cur:
+        for c in companies:
+            raw_name = c.get('name')
+            key = company_key(raw_name)
+            if key is None:
+                print(f"스킵(이름불가): {raw_name}")
+                stats['skipped'] += 1
+                continue
+            values = {f: c.get(f) for f in SUMMARY_FIELDS}
+            cid = find_company_id(cur, raw_name)
+            if cid is None:
+                cur.execute(f"INSERT INTO raw_company_data (company_name, {', '.join(SUMMARY_FIELDS)}, normalized_name, content_hash) "
+                            f"VALUES ({', '.join('?' * (len(SUMMARY_FIELDS) + 3))})",
+                            (raw_name, *values.values(), key, record_hash(values)))
+                changed.append(cur.lastrowid)
+                stats['inserted'] += 1
+                print(f"✅ {raw_name} ({c.get('job_roles')}) 저장!")
+                continue
+            source = cur.execute("SELECT source FROM raw_company_data WHERE id = ?", (cid,)).fetchone()[0]
+            if source != c.get('source'):
+                stats['skipped'] += 1
+                continue
+            h = stored_record_hash(cur, cid, values)
+            if h == stored_record_hash(cur, cid):
+                stats['unchanged'] += 1
+                continue
+            cur.execute(f"UPDATE raw_company_data SET {', '.join(f + ' = ?' for f in SUMMARY_FIELDS)}, content_hash = ? WHERE id = ?",
+                        (*values.values(), h, cid))
+            changed.append(cid)
+            stats['updated'] += 1
+            print(f"🔄 {raw_name} 갱신!")
+        scoring.rescore(cur, changed)
+    return stats
+
+
+def refresh_company_sources(refreshed):
+    """만료된 소스만 다시 조회한 결과를 기존 행에 그대로 반영합니다(--refresh-stale).
+
+    refreshed: [(target, {소스: 결과})], target = freshness.stale_targets()의 항목.
+    - news: 새 결과가 있으면 회사의 뉴스 행을 교체, news_title/keywords 갱신
+    - 채용 소스: 해당 source 값의 jobs 행만 교체하고 job_roles/required_roles 재계산
+    - company_info: founded_date/employee_count 갱신
+    결과가 비어 있으면(조회 실패 포함) 기존 행은 유지하고 신선도만 갱신합니다.
+    """
+    from enrich import JOB_SOURCES, JOB_SOURCE_LABELS
+
+    conn = get_conn()
+    migrate.upgrade(conn)
+    now = datetime.now()
+    with transaction(conn) as cur:
+        for target, r in refreshed:
+            cid = target['id']
+            news = r.get('news') or []
+            if news:
+                cur.execute("DELETE FROM news WHERE company_id = ?", (cid,))
+                _insert_news(cur, cid, news)
+                cur.execute("UPDATE raw_company_data SET news_title = ?, keywords = ? WHERE id = ?",
+                            (news[0]['title'], _news_keywords(news), cid))
+
+            jobs_changed = False
+            for key in JOB_SOURCES:
+                jobs = [j for j in r.get(key) or [] if j.get('title')]
+                if not jobs:
+                    continue
+                jobs_changed = True
+                cur.execute("DELETE FROM jobs WHERE company_id = ? AND source = ?", (cid, JOB_SOURCE_LABELS[key]))
+                existing = set(t for (t,) in cur.execute("SELECT title FROM jobs WHERE company_id = ?", (cid,)))
+                for j in jobs:
+                    if j['title'] in existing:
+                        continue
+                    existing.add(j['title'])
+                    cur.execute("INSERT INTO jobs (company_id, title, team, link, source, collected_at) VALUES (?, ?, ?, ?, ?, ?)",
+                                (cid, j['title'], j.get('team'), j.get('link'), j.get('source'), now))
+            # 엔리치 결과와 같은 기준(최대 5개, 최신 순)으로 요약
+            job_rows = [{'title': t, 'team': team} for t, team in
+                        cur.execute("SELECT title, team FROM jobs WHERE company_id = ? ORDER BY id DESC LIMIT 5", (cid,))]
+            if jobs_changed:
+                jobs_summary, required_roles_str = _summarize_jobs(job_rows)
+                cur.execute("UPDATE raw_company_data SET job_roles = ?, required_roles = ? WHERE id = ?",
+                            (jobs_summary, required_roles_str, cid))
+
+            info = r.get('company_info') or {}
+            if info.get('founded_date') or info.get('employee_count'):
+                cur.execute("UPDATE raw_company_data SET founded_date = COALESCE(?, founded_date), employee_count = COALESCE(?, employee_count) WHERE id = ?",
+                            (info.get('founded_date'), info.get('employee_count'), cid))
+
+            freshness.mark(cur, cid, r.keys(), now.strftime(freshness.TS_FORMAT))
+            cur.execute("UPDATE raw_company_data SET last_enrich_date = ?, content_hash = ? WHERE id = ?",
+                        (now.strftime(freshness.TS_FORMAT), stored_record_hash(cur, cid), cid))
+
+            print(f"갱신: {target['name']} (id={cid}) 소스={','.join(r)}")
+
+        scoring.rescore(cur, [target['id'] for target, _ in refreshed])
@@ -1,7 +1,17 @@
+import hashlib
+import json
 import re
-from datetime import datetime
+from functools import lru_cache
 
 
+_PAREN_RE = re.compile(r"\([^)]*\)")
+_BRACKET_RE = re.compile(r"\[[^]]*\]")
+_CORP_RE = re.compile(r"\b(주식회사|주식회사\.|㈜|\(주\)|주)\b")
+_SPECIAL_RE = re.compile(r"[^\w\s\-\.&]")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=65536)
 def normalize_company_name(name: str) -> str:
     """간단한 회사명 정규화
 
@@ -9,88 +19,59 @@ def normalize_company_name(name: str) -> str:
     - 앞뒤 공백 제거, 다중 공백 축소
     - 영문/특수문자 정리(대문자->소문자)
     - 일부 접미사/접두사 제거(예: 주식회사, (주))
+    같은 이름이 반복해서 들어오므로 결과를 메모이즈합니다.
     """
     if not name:
         return name
     s = name
     # 제거: 괄호 안 내용
-    s = re.sub(r"\([^)]*\)", "", s)
-    s = re.sub(r"\[[^]]*\]", "", s)
+    s = _PAREN_RE.sub("", s)
+    s = _BRACKET_RE.sub("", s)
     # 회사 형태 표기 제거
-    s = re.sub(r"\b(주식회사|주식회사\.|㈜|\(주\)|주)\b", "", s)
+    s = _CORP_RE.sub("", s)
     # 특수문자 제거 (단, & . -는 유지)
-    s = re.sub(r"[^\w\s\-\.&]", " ", s)
+    s = _SPECIAL_RE.sub(" ", s)
     # 공백 정리
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _SPACE_RE.sub(" ", s).strip()
     # 소문자 변환(영문일 경우)
     s = s.lower()
     return s
 
 
+def company_key(name):
+    """raw_company_data.normalized_name에 저장하는 조회 키. 키로 쓸 수 없는 이름(2자 미만)은 None."""
+    norm = normalize_company_name(name)
+    if not norm or len(norm) < 2:
+        return None
+    return norm
+
+
+def content_hash(payload) -> str:
+    """dict/list payload의 안정적인 해시 (키 순서 무관). 변경 감지용."""
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+# raw_company_data.content_hash 입력 (모든 저장 경로 공용): 저장되는 raw 컬럼 값 + 뉴스 URL + 채용 제목
+RECORD_HASH_FIELDS = ('source', 'funding_stage', 'funding_round', 'funding_date', 'amount', 'investors', 'industry',
+                      'founded_date', 'employee_count', 'job_roles', 'news_title')
+
+
+def record_hash(row, news_urls=(), job_titles=()) -> str:
+    """회사 한 건의 content_hash. row: raw_company_data에 저장되는 값(컬럼명 키 dict),
+    news_urls/job_titles: 그 회사의 news.url / jobs.title (순서/중복 무관)."""
+    payload = {f: row.get(f) for f in RECORD_HASH_FIELDS}
+    payload['news'] = sorted(set(u for u in news_urls if u))
+    payload['jobs'] = sorted(set(t for t in job_titles if t))
+    return content_hash(payload)
+
+
 def score_company_record(record: dict) -> dict:
-    """간단 스코어 계산기
+    """레코드 한 건의 점수 (scoring.score_record와 동일한 단일 엔진).
 
     반환 dict: {'funding_score', 'hiring_score', 'recency_score', 'total_score'}
-    규칙(예시):
-      - funding_score: inferred_event 기반 (growing:3, unknown:1, declining:0)
-      - hiring_score: 채용건수 기반 (0:0, 1-2:1, >=3:2)
-      - recency_score: funding_date 기준(월 단위)
+    규칙은 scoring_config.json(투자 단계 가중치, 채용 키워드, 최신성)을 따릅니다.
+    여러 건은 scoring.compute / scoring.rescore로 한 번에 계산하세요.
     """
-    funding_score = 0
-    hiring_score = 0
-    recency_score = 0
-
-    ie = (record.get('inferred_event') or '').lower()
-    if 'grow' in ie or 'growing' in ie or '투자' in ie:
-        funding_score = 3
-    elif 'declin' in ie or '감소' in ie:
-        funding_score = 0
-    else:
-        funding_score = 1
-
-    jobs = record.get('job_roles') or []
-    if isinstance(jobs, (list, tuple)):
-        jcount = len(jobs)
-    elif isinstance(jobs, str):
-        jcount = 1 if jobs.strip() else 0
-    else:
-        jcount = 0
-    if jcount == 0:
-        hiring_score = 0
-    elif jcount <= 2:
-        hiring_score = 1
-    else:
-        hiring_score = 2
-
-    fd = record.get('funding_date')
-    # funding_date expected 'YYYY-MM' or 'YYYY-MM-DD'
-    if fd:
-        try:
-            if re.match(r'^\d{4}-\d{2}-\d{2}$', fd):
-                dt = datetime.strptime(fd, '%Y-%m-%d')
-            elif re.match(r'^\d{4}-\d{2}$', fd):
-                dt = datetime.strptime(fd, '%Y-%m')
-            else:
-                dt = None
-            if dt:
-                delta_months = (datetime.now().year - dt.year) * 12 + (datetime.now().month - dt.month)
-                if delta_months <= 1:
-                    recency_score = 3
-                elif delta_months <= 3:
-                    recency_score = 2
-                elif delta_months <= 6:
-                    recency_score = 1
-                else:
-                    recency_score = 0
-        except Exception:
-            recency_score = 0
-    else:
-        recency_score = 0
-
-    total = funding_score + hiring_score + recency_score
-    return {
-        'funding_score': funding_score,
-        'hiring_score': hiring_score,
-        'recency_score': recency_score,
-        'total_score': total
-    }
+    from scoring import score_record
+    return score_record(record)
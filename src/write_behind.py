@@ -0,0 +1,135 @@
+"""쓰기 지연(write-behind) 저장 큐.
+
+엔리치 쪽은 끝난 회사 레코드를 put()으로 넣기만 하고, 전용 writer 스레드 하나가 큐를 비우며
+batch_size개씩 save_fn(batch)를 호출해 배치 트랜잭션으로 저장합니다. max_wait(초)를 주면 배치가 덜 찼어도
+그 시간이 지나면 저장합니다(기본은 batch_size가 찰 때까지 또는 종료 시).
+SQLite 쓰기는 항상 이 스레드 하나에서만 일어나므로 워커끼리 DB 잠금을 다투지 않고,
+네트워크 작업과 디스크 쓰기가 겹쳐서 진행됩니다.
+
+  - 큐 크기 제한(maxsize): 저장이 밀리면 put()이 막혀 엔리치 속도를 늦춤(backpressure)
+  - close()/with 블록 종료/인터프리터 종료(atexit) 시 남은 레코드를 모두 저장한 뒤 종료
+  - 저장 중 예외는 다음 put() 또는 close()에서 다시 발생하고, 그 뒤의 레코드는 저장하지 않고 버림(stats['dropped'])
+
+    with WriteBehindQueue(lambda b: save_to_db(b, upsert=True), batch_size=50) as q:
+        for c in iter_enrich_companies(companies, workers=8):
+            q.put(c)
+"""
+import atexit
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+
+    def __init__(self, save_fn, batch_size=50, maxsize=None, max_wait=None, name='write-behind'):
+        self.save_fn = save_fn
+        self.batch_size = max(batch_size, 1)
+        self.max_wait = max_wait
+        self._queue = queue.Queue(maxsize if maxsize is not None else self.batch_size * 4)
+        self._error = None
+        self._closed = False
+        self.stats = {'queued': 0, 'written': 0, 'dropped': 0, 'batches': 0, 'blocked_sec': 0.0, 'write_sec': 0.0}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # -- producer 쪽 -------------------------------------------------------
+
+    def put(self, record):
+        """레코드를 넣습니다. 큐가 가득 차면 writer가 비울 때까지 기다립니다."""
+        self._raise_if_failed()
+        if self._closed:
+            raise RuntimeError('write-behind queue is closed')
+        t0 = time.perf_counter()
+        while True:
+            try:
+                self._queue.put(record, timeout=0.5)
+                break
+            except queue.Full:
+                self._raise_if_failed()
+        self.stats['blocked_sec'] += time.perf_counter() - t0
+        self.stats['queued'] += 1
+
+    def close(self):
+        """남은 레코드를 모두 저장하고 writer 스레드를 끝냅니다. 여러 번 호출해도 됩니다."""
+        if not self._closed:
+            self._closed = True
+            if self._thread.is_alive():
+                self._queue.put(_STOP)
+                self._thread.join()
+            atexit.unregister(self.close)
+        self._raise_if_failed()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # 원래 예외를 가리지 않도록 flush 중 오류는 출력만 함
+            try:
+                self.close()
+            except Exception as e:
+                print(f"write-behind flush 실패: {e}")
+        return False
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+    # -- writer 스레드 ------------------------------------------------------
+
+    def _next_batch(self):
+        """첫 레코드가 올 때까지 기다린 뒤, batch_size개가 차거나 (max_wait를 줬으면) 그 시간이 지날 때까지 더 모읍니다.
+        반환: (batch, stop)"""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = None if self.max_wait is None else time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            if deadline is None:
+                item = self._queue.get()
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        failed = False
+        while not stop:
+            batch, stop = self._next_batch()
+            if not batch:
+                continue
+            if failed:
+                # 앞 배치가 실패했으면 이후 배치는 저장하지 않음: 뒤 배치의 collect.MonthEnd가
+                # 저장되지 못한 회사가 있는 달을 처리 완료로 기록하면 안 되므로 (큐는 계속 비워 producer가 막히지 않게 함)
+                self.stats['dropped'] += len(batch)
+                continue
+            t0 = time.perf_counter()
+            try:
+                self.save_fn(batch)
+            except BaseException as e:
+                failed = True
+                if self._error is None:
+                    self._error = e
+                self.stats['dropped'] += len(batch)
+                print(f"write-behind 저장 실패 ({len(batch)}개), 이후 레코드는 저장하지 않습니다: {e}")
+                continue
+            self.stats['write_sec'] += time.perf_counter() - t0
+            self.stats['batches'] += 1
+            self.stats['written'] += len(batch)